@@ -90,8 +90,16 @@ def main(click_ctx, **kwargs):
 @click.option("--exclude", default="", help="Sheets to exclude.")
 @click.option("--nodes", default="R11_AFR,R11_CPA", help="Nodes to include.")
 @click.option("--techs", default="coal_ppl", help="Technologies to include.")
+@click.option(
+    "--format",
+    "fmt",
+    type=click.Choice(["xlsx", "parquet"]),
+    default="xlsx",
+    show_default=True,
+    help="Output format.",
+)
 @click.pass_obj
-def export_test_data_cmd(ctx, exclude, nodes, techs):
+def export_test_data_cmd(ctx, exclude, nodes, techs, fmt):
     """Prepare data for testing.
 
     Option values for --exclude, --nodes, and --techs must be comma-separated lists.
@@ -102,6 +110,7 @@ def export_test_data_cmd(ctx, exclude, nodes, techs):
     ctx.export_exclude = list(filter(None, exclude.split(",")))  # Exclude empty string
     ctx.export_nodes = nodes.split(",")
     ctx.export_techs = techs.split(",")
+    ctx.export_format = fmt
 
     mark_time()
 
@@ -166,6 +175,7 @@ submodules = [
     "message_ix_models.report.cli",
     "message_ix_models.model.material.cli",
     "message_ix_models.testing.cli",
+    "message_ix_models.tools.wb",
     "message_ix_models.util.pooch",
 ]
 
@@ -1,6 +1,7 @@
 import logging
 from copy import copy
-from functools import partial
+from functools import lru_cache, partial
+from typing import Dict, List
 from urllib.parse import urlunsplit
 
 import message_ix
@@ -98,12 +99,32 @@ def get_spec(context) -> Spec:
     These **may** be used for testing purposes, but **should not** be used in production
     models.
 
+    The spec is constructed once for each combination of :attr:`.Config.regions`,
+    :attr:`~.Config.relations`, :attr:`~.Config.years`, and
+    :attr:`~.Config.res_with_dummies`; later calls return a copy, which may be modified
+    without affecting other callers.
+
     Returns
     -------
     :class:`dict` of :class:`.ScenarioInfo` objects
     """
     context.setdefault("model", Config())
+    cfg = context.model
+
+    spec = _get_spec(cfg.regions, cfg.relations, cfg.years, cfg.res_with_dummies)
 
+    # Copy the lists of set elements and the parameter data
+    add = ScenarioInfo()
+    add.set.update({k: list(v) for k, v in spec.add.set.items()})
+    add.par.update({k: v.copy() for k, v in spec.add.par.items()})
+    add.y0 = spec.add.y0
+
+    return Spec(add=add)
+
+
+@lru_cache()
+def _get_spec(regions: str, relations: str, years: str, res_with_dummies: bool) -> Spec:
+    """Construct the spec for :func:`get_spec`."""
     add = ScenarioInfo()
 
     # Add technologies
@@ -112,7 +133,7 @@ def get_spec(context) -> Spec:
     # Add regions
 
     # Load configuration for the specified region mapping
-    nodes = get_codes(f"node/{context.model.regions}")
+    nodes = get_codes(f"node/{regions}")
 
     # Top-level "World" node
     world = nodes[nodes.index("World")]
@@ -121,10 +142,10 @@ def get_spec(context) -> Spec:
     add.set["node"] = [world] + world.child
 
     # Add relations
-    add.set["relation"] = get_codes(f"relation/{context.model.relations}")
+    add.set["relation"] = get_codes(f"relation/{relations}")
 
     # Initialize time periods
-    add.year_from_codes(get_codes(f"year/{context.model.years}"))
+    add.year_from_codes(get_codes(f"year/{years}"))
 
     # Add levels
     add.set["level"] = get_codes("level")
@@ -140,7 +161,7 @@ def get_spec(context) -> Spec:
     # but reduces duplicate log entries
     add.set["unit"] = sorted(filter(None, units))
 
-    if context.model.res_with_dummies:
+    if res_with_dummies:
         # Add dummy technologies
         add.set["technology"].extend([Code(id="dummy"), Code(id="dummy source")])
         # Add a dummy commodity
@@ -150,6 +171,53 @@ def get_spec(context) -> Spec:
     return Spec(add=add)
 
 
+def get_elements(context) -> Dict[str, List]:
+    """Return the set elements of the bare RES for `context`, as plain IDs.
+
+    The result contains only :class:`str`, :class:`int`, and :class:`list`, so it can be
+    serialized (for instance, to JSON) and compared using :func:`diff_elements`.
+
+    Returns
+    -------
+    dict
+        Mapping from set names to lists of elements. Elements of indexed sets, such as
+        "cat_year", are lists of key values.
+    """
+    return {
+        name: [
+            list(e) if isinstance(e, tuple) else (e.id if isinstance(e, Code) else e)
+            for e in elements
+        ]
+        for name, elements in get_spec(context).add.set.items()
+        if len(elements)
+    }
+
+
+def diff_elements(a: Dict[str, List], b: Dict[str, List]) -> Dict[str, Dict]:
+    """Compare two results from :func:`get_elements`.
+
+    Returns
+    -------
+    dict
+        Mapping from set names to :class:`dict` with keys "add" and "remove", giving the
+        elements in `b` but not `a`, and vice versa. Sets with identical elements are
+        omitted.
+    """
+
+    def _key(e):
+        return tuple(e) if isinstance(e, list) else e
+
+    result = {}
+    for name in sorted(set(a) | set(b)):
+        ea, eb = a.get(name, []), b.get(name, [])
+        ka, kb = set(map(_key, ea)), set(map(_key, eb))
+        add = [e for e in eb if _key(e) not in ka]
+        remove = [e for e in ea if _key(e) not in kb]
+        if add or remove:
+            result[name] = dict(add=add, remove=remove)
+    return result
+
+
 def name(context):
     """Generate a candidate name for a model given `context`.
 
@@ -87,7 +87,7 @@ def apply_spec(  # noqa: C901
     # Existing 'region' codes stored on the Platform associated with `scenario`
     platform_regions = set(scenario.platform.regions()["region"])
 
-    for _, set_name in sets:
+    for ndim, set_name in sets:
         # Check whether this set is mentioned at all in the spec
         if 0 == sum(map(lambda info: len(info.set[set_name]), spec.values())):
             # Not mentioned; don't do anything
@@ -95,27 +95,28 @@ def apply_spec(  # noqa: C901
 
         log.info(f"Set {repr(set_name)}")
 
-        # Base contents of the set
-        base_set = scenario.set(set_name)
-        # Unpack a multi-dimensional/indexed set to a list of tuples
-        base = (
-            list(base_set.itertuples(index=False))
-            if isinstance(base_set, pd.DataFrame)
-            else base_set.tolist()
-        )
-
-        log.info(f"  {len(base)} elements")
-        # log.debug(', '.join(map(repr, base)))  # All elements; verbose
-
         # Check for required elements
         require = spec["require"].set[set_name]
-        log.info(f"  Check {len(require)} required elements")
+        if len(require):
+            # Base contents of the set
+            base_set = scenario.set(set_name)
+            # Unpack a multi-dimensional/indexed set to a list of tuples
+            base = (
+                list(base_set.itertuples(index=False))
+                if isinstance(base_set, pd.DataFrame)
+                else base_set.tolist()
+            )
 
-        # Raise an exception about the first missing element
-        missing = list(filter(lambda e: e not in base, require))
-        if missing:
-            log.error(f"  {len(missing)} elements not found: {missing!r}")
-            raise ValueError
+            log.info(f"  {len(base)} elements")
+            # log.debug(', '.join(map(repr, base)))  # All elements; verbose
+
+            log.info(f"  Check {len(require)} required elements")
+
+            # Raise an exception about the first missing element
+            missing = list(filter(lambda e: e not in base, require))
+            if missing:
+                log.error(f"  {len(missing)} elements not found: {missing!r}")
+                raise ValueError
 
         # Remove elements and associated parameter values
         for element in spec["remove"].set[set_name]:
@@ -127,18 +128,24 @@ def apply_spec(  # noqa: C901
                 dump=None if fast else dump,
             )
 
-        # Add elements
+        # Add elements, all in one call
         add = [] if dry_run else spec["add"].set[set_name]
-        for element in add:
-            name = element.id if isinstance(element, Code) else element
-            scenario.add_set(set_name, name)
-            if set_name == "node" and name not in platform_regions:
-                scenario.platform.add_region(name, "region")
-
-        if len(add):
+        names = [e.id if isinstance(e, Code) else e for e in add]
+        if len(names):
+            scenario.add_set(
+                set_name,
+                # Indexed sets: list of lists of key values
+                [list(n) if isinstance(n, (list, tuple)) else [n] for n in names]
+                if ndim
+                else names,
+            )
             log.info(f"  Add {len(add)} element(s)")
             log.debug("  " + ellipsize(add))
 
+        if set_name == "node":
+            for name in filter(lambda n: n not in platform_regions, names):
+                scenario.platform.add_region(name, "region")
+
         log.info("  ---")
 
     if not fast:
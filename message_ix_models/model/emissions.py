@@ -1,7 +1,9 @@
 import logging
 import re
-from typing import Optional, Tuple
+from functools import lru_cache
+from typing import List, Optional, Sequence, Tuple
 
+import numpy as np
 import pandas as pd
 from genno import Quantity
 from genno import operator as g
@@ -44,6 +46,13 @@ def get_emission_factors(units: Optional[str] = None) -> Quantity:
     Quantity
         with 1 dimension (:math:`c`).
     """
+    # Copy, so that callers may modify the result without affecting the cache
+    return _emission_factors(units).copy()
+
+
+@lru_cache()
+def _ipcc_1996() -> Quantity:
+    """Load carbon emission factors from file, with :math:`c` labels."""
     # Prepare information about commodities
     commodities = get_codes("commodity")
     relabel = {}  # Mapping from IPCC names/IDs to message_ix_models commodity ID
@@ -65,11 +74,16 @@ def get_emission_factors(units: Optional[str] = None) -> Quantity:
     )
 
     # Manually insert a value for methanol
-    result = g.concat(
+    return g.concat(
         result,
         Quantity(pd.Series(17.4, pd.Index(["methanol"], name="c")), units=result.units),
     )
 
+
+@lru_cache()
+def _emission_factors(units: Optional[str]) -> Quantity:
+    """Compute the result of :func:`get_emission_factors`."""
+    result = _ipcc_1996().copy()
     result.attrs["species"] = "C"
 
     if units is not None:
@@ -112,12 +126,75 @@ def add_tax_emission(
         :mod:`iam_units`.
     drate_parameter : str; one of "drate" or "interestrate"
         Name of the parameter to use for the growth rate of the carbon price.
+
+    See also
+    --------
+    add_tax_emission_batch
+    """
+    data = get_tax_emission_data(scen, [price], conversion_factor, drate_parameter)
+    _add_tax_emission(scen, data[0])
+
+
+def add_tax_emission_batch(
+    scenarios: Sequence[Scenario],
+    prices: Sequence[float],
+    conversion_factor: Optional[float] = None,
+    drate_parameter="drate",
+) -> None:
+    """Add a global CO₂ price to each of `scenarios`.
+
+    This has the same effect as calling :func:`add_tax_emission` for each pair of
+    scenario and price, except the data for all `prices` are computed at once using
+    the model periods and discount rate of the first scenario. Use it when all of
+    `scenarios` have the same structure, for instance clones of one baseline.
+
+    Parameters
+    ----------
+    scenarios : list of :class:`message_ix.Scenario`
+    prices : list of float
+        Price in the first model year for each of `scenarios`, in USD / tonne CO₂.
+    conversion_factor, drate_parameter
+        Passed to :func:`get_tax_emission_data`.
+    """
+    if len(scenarios) != len(prices):
+        raise ValueError(
+            f"{len(scenarios)} scenarios, but {len(prices)} prices; must be equal"
+        )
+    elif not len(scenarios):
+        return
+
+    data = get_tax_emission_data(
+        scenarios[0], prices, conversion_factor, drate_parameter
+    )
+
+    # Write to each scenario in turn; the ixmp backends do not support concurrent
+    # writes through one Platform
+    for scen, df in zip(scenarios, data):
+        _add_tax_emission(scen, df)
+
+
+def get_tax_emission_data(
+    scen: Scenario,
+    prices: Sequence[float],
+    conversion_factor: Optional[float] = None,
+    drate_parameter="drate",
+) -> List[pd.DataFrame]:
+    """Return data for the parameter ``tax_emission`` for each of `prices`.
+
+    The values are as described for :func:`add_tax_emission`, using the model periods
+    and discount rate of `scen`. The growth of the price is computed once, and the
+    values for all `prices` in a single array operation.
+
+    Returns
+    -------
+    list of pandas.DataFrame
+        One data frame for each of `prices`, in the same order.
     """
     years = ScenarioInfo(scen).Y
     filters = dict(year=years)
     # Default: since the mass of the species is in the denominator, take the inverse
-    conversion_factor = conversion_factor or 1.0 / convert_gwp(
-        "AR5GWP100", "1 t", "CO2", "C"
+    conversion_factor = (
+        conversion_factor or 1.0 / convert_gwp("AR5GWP100", "1 t", "CO2", "C").magnitude
     )
 
     # Duration of periods
@@ -137,20 +214,30 @@ def add_tax_emission(
     # Compute cumulative growth versus the first period
     r_cumulative = (r + 1).pow(dp.shift(-1)).cumprod().shift(1, fill_value=1.0)
 
-    # Assemble the parameter data
-    name = "tax_emission"
-    data = make_df(
-        name,
-        value=(price * conversion_factor * r_cumulative),
-        type_year=r_cumulative.index,
-        node="World",
-        type_emission="TCE",
-        type_tec="all",
-        unit="USD/tC",
+    # Values for all prices (rows) and periods (columns)
+    values = np.outer(
+        np.asarray(prices, dtype=float) * conversion_factor,
+        r_cumulative.to_numpy(),
     )
 
+    # Assemble the parameter data
+    return [
+        make_df(
+            "tax_emission",
+            value=v,
+            type_year=r_cumulative.index,
+            node="World",
+            type_emission="TCE",
+            type_tec="all",
+            unit="USD/tC",
+        )
+        for v in values
+    ]
+
+
+def _add_tax_emission(scen: Scenario, data: pd.DataFrame) -> None:
     with scen.transact("Added carbon price"):
-        scen.add_par(name, data)
+        scen.add_par("tax_emission", data)
 
 
 def split_species(unit_expr: str) -> Tuple[str, Optional[str]]:
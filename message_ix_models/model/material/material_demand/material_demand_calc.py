@@ -1,12 +1,15 @@
+from typing import Any, Dict, Iterable, Tuple
+
 import numpy as np
 import pandas as pd
 import yaml
+from genno.caching import hash_contents
 from message_ix import make_df
 from scipy.optimize import curve_fit
 
 import message_ix_models.util
 from message_ix_models import ScenarioInfo
-from message_ix_models.util import package_data_path
+from message_ix_models.util import cached, package_data_path
 
 file_gdp = "/iamc_db ENGAGE baseline GDP PPP.xlsx"
 giga = 10**9
@@ -59,7 +62,7 @@ def cement_function(x, a, b):
     return a * np.exp(b / gdp_pcap)
 
 
-fitting_dict = {
+fitting_dict: Dict[str, Dict[str, Any]] = {
     "steel": {
         "function": steel_function,
         "initial_guess": [600, -10000, 0],
@@ -122,32 +125,21 @@ def read_timer_gdp(datapath, material):
 
 
 def project_demand(df, phi, mu):
-    df_demand = df.groupby("region", group_keys=False).apply(
-        lambda group: group.assign(
-            demand_pcap_base=group["demand.tot.base"].iloc[0]
-            * giga
-            / group["pop.mil"].iloc[0]
-            / mega
-        )
-    )
-    df_demand = df_demand.groupby("region", group_keys=False).apply(
-        lambda group: group.assign(
-            gap_base=group["demand_pcap_base"].iloc[0] - group["demand_pcap0"].iloc[0]
-        )
-    )
-    df_demand = df_demand.groupby("region", group_keys=False).apply(
-        lambda group: group.assign(
-            demand_pcap=group["demand_pcap0"]
-            + group["gap_base"] * gompertz(phi, mu, y=group["year"])
-        )
-    )
+    # Values in the first row of each region, broadcast to all rows of the region
+    df = df.sort_values("region", kind="stable")
+    first = df.groupby("region")[["demand.tot.base", "pop.mil", "demand_pcap0"]]
+    first = first.transform("first")
+
     df_demand = (
-        df_demand.groupby("region", group_keys=False)
-        .apply(
-            lambda group: group.assign(
-                demand_tot=group["demand_pcap"] * group["pop.mil"] * mega / giga
-            )
+        df.assign(
+            demand_pcap_base=first["demand.tot.base"] * giga / first["pop.mil"] / mega
         )
+        .assign(gap_base=lambda x: x["demand_pcap_base"] - first["demand_pcap0"])
+        .assign(
+            demand_pcap=lambda x: x["demand_pcap0"]
+            + x["gap_base"] * gompertz(phi, mu, y=x["year"])
+        )
+        .assign(demand_tot=lambda x: x["demand_pcap"] * x["pop.mil"] * mega / giga)
         .reset_index(drop=True)
     )
     return df_demand[["region", "year", "demand_tot"]]
@@ -300,7 +292,45 @@ def read_gdp_ppp_from_scen(scen):
     return gdp
 
 
-def derive_demand(material, scen, old_gdp=False, ssp="SSP2"):
+def hist_mat_demand_hash(material):
+    """Return a hash of the contents of the files read by :func:`read_hist_mat_demand`.
+
+    This is used to identify cached results of :func:`fit_demand_regression`.
+    """
+    datapath = package_data_path("material")
+    if material == "aluminum":
+        files = {material_data[material]["file"]}
+    else:
+        # Population and GDP are also read from the cement file; see read_timer_pop()
+        files = {material_data[material]["file"], material_data["cement"]["file"]}
+    return "".join(
+        hash_contents(f'{datapath}/{material_data[material]["dir"]}{f}')
+        for f in sorted(files)
+    )
+
+
+@cached
+def fit_demand_regression(material, file_hash):
+    """Fit the regression parameters for `material` to historical data.
+
+    `file_hash` is not used directly; it should be the output of
+    :func:`hist_mat_demand_hash`, so that the parameters are fitted again whenever the
+    input files change.
+    """
+    # get historical data (material consumption, pop, gdp)
+    df_cons = read_hist_mat_demand(material)
+    x_data = tuple(pd.Series(df_cons[col]) for col in fitting_dict[material]["x_data"])
+
+    # run regression on historical data
+    return curve_fit(
+        fitting_dict[material]["function"],
+        xdata=x_data,
+        ydata=df_cons["cons_pcap"],
+        p0=fitting_dict[material]["initial_guess"],
+    )[0]
+
+
+def read_pop_gdp(scen, old_gdp=False):
     datapath = message_ix_models.util.package_data_path("material")
 
     # read pop projection from scenario
@@ -320,23 +350,48 @@ def derive_demand(material, scen, old_gdp=False, ssp="SSP2"):
                 region=lambda x: "R12_" + x["Region"],
             )
         )
+    return df_pop, df_gdp
+
+
+def derive_demand(material, scen, old_gdp=False, ssp="SSP2"):
+    df_pop, df_gdp = read_pop_gdp(scen, old_gdp)
+    return _derive_demand(material, ssp, df_pop, df_gdp)
+
+
+def derive_demand_multi(
+    scen,
+    materials: Iterable[str] = ("steel", "cement", "aluminum"),
+    ssps: Iterable[str] = ("SSP1", "SSP2", "SSP3", "SSP4", "SSP5", "LED"),
+    old_gdp=False,
+) -> Dict[Tuple[str, str], pd.DataFrame]:
+    """Derive demand for all combinations of `materials` and `ssps`.
+
+    This is equivalent to calling :func:`derive_demand` for each combination, but reads
+    population and GDP from `scen` only once.
+
+    Returns
+    -------
+    dict
+        Keys are tuples of (material, ssp); values are "demand" parameter data.
+    """
+    df_pop, df_gdp = read_pop_gdp(scen, old_gdp)
+    return {
+        (material, ssp): _derive_demand(material, ssp, df_pop, df_gdp)
+        for material in materials
+        for ssp in ssps
+    }
+
+
+def _derive_demand(material, ssp, df_pop, df_gdp):
+    datapath = message_ix_models.util.package_data_path("material")
 
     # get base year demand of material
     df_base_demand = read_base_demand(
         f'{datapath}/{material_data[material]["dir"]}/demand_{material}.yaml'
     )
 
-    # get historical data (material consumption, pop, gdp)
-    df_cons = read_hist_mat_demand(material)
-    x_data = tuple(pd.Series(df_cons[col]) for col in fitting_dict[material]["x_data"])
-
-    # run regression on historical data
-    params_opt = curve_fit(
-        fitting_dict[material]["function"],
-        xdata=x_data,
-        ydata=df_cons["cons_pcap"],
-        p0=fitting_dict[material]["initial_guess"],
-    )[0]
+    # get regression parameters fitted to historical data
+    params_opt = fit_demand_regression(material, hist_mat_demand_hash(material)).copy()
     mode = ssp_mode_map[ssp]
     print(f"adjust regression parameters according to mode: {mode}")
     print(f"before adjustment: {params_opt}")
@@ -349,11 +404,8 @@ def derive_demand(material, scen, old_gdp=False, ssp="SSP2"):
     df_all = pd.merge(df_all, df_gdp[["region", "year", "gdp_ppp"]], how="inner")
     df_all["del_t"] = df_all["year"] - 2010
     df_all["gdp_pcap"] = df_all["gdp_ppp"] * giga / df_all["pop.mil"] / mega
-    df_all["demand_pcap0"] = df_all.apply(
-        lambda row: fitting_dict[material]["function"](
-            tuple(row[i] for i in fitting_dict[material]["x_data"]), *params_opt
-        ),
-        axis=1,
+    df_all["demand_pcap0"] = fitting_dict[material]["function"](
+        tuple(df_all[i] for i in fitting_dict[material]["x_data"]), *params_opt
     )
     df_all = df_all.rename({"value": "demand.tot.base"}, axis=1)
 
@@ -1,8 +1,9 @@
 """Prepare base models from snapshot data."""
 
 import logging
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional
 
 import pandas as pd
 from message_ix import Scenario
@@ -19,17 +20,47 @@ from .structure import get_codes
 log = logging.getLogger(__name__)
 
 
-def unpack(path: Path) -> Path:
+#: Suffixes of files containing unpacked item data, in order of preference.
+SUFFIXES = (".parquet", ".csv.gz")
+
+
+#: :class:`pandas.ExcelFile` opened once in each worker process by :func:`_open`.
+_EXCEL_FILE: Optional[pd.ExcelFile] = None
+
+
+def _open(path: Path) -> None:
+    """Open the Excel file at `path` for use by :func:`_unpack_item`."""
+    global _EXCEL_FILE
+    _EXCEL_FILE = pd.ExcelFile(path, engine="openpyxl")
+
+
+def _unpack_item(sheet_names: List[str], item_path: Path) -> None:
+    """Read data for one item from `sheet_names`; write to `item_path`.
+
+    Data are read from the file opened by :func:`_open`, so that the workbook is
+    loaded once per worker process, rather than once per item. Object (string)
+    columns, i.e. the dimensions and "unit", are stored as categoricals.
+    """
+    assert _EXCEL_FILE is not None
+    df = pd.concat(map(_EXCEL_FILE.parse, sheet_names), axis=0, ignore_index=True)
+
+    cols = df.select_dtypes(include=["object", "string"]).columns
+    df.astype({c: "category" for c in cols}).to_parquet(item_path, index=False)
+
+
+def unpack(path: Path, max_workers: Optional[int] = None) -> Path:
     """Unpack :ref:`ixmp-format Excel file <ixmp:excel-data-format>` at `path`.
 
     The file is unpacked into a directory with the same name stem as the file (that is,
     without the :file:`.xlsx` suffix). In this directory are created:
 
-    - One :file:`.csv.gz` file for each MESSAGE and/or MACRO parameter.
+    - One :file:`.parquet` file for each MESSAGE and/or MACRO parameter, variable, or
+      equation.
     - One file :file:`sets.xlsx` with only the :mod:`ixmp` sets, and no parameter data.
 
-    If the files exist, they are not updated.
-    To force re-unpacking, delete the files.
+    Sheets for parameters, variables, and equations are parsed in parallel by up to
+    `max_workers` processes. If the files exist—either as :file:`.parquet` or
+    :file:`.csv.gz`—they are not updated. To force re-unpacking, delete the files.
 
     Returns
     -------
@@ -44,35 +75,38 @@ def unpack(path: Path) -> Path:
     xf = pd.ExcelFile(path, engine="openpyxl")
     name_type = xf.parse("ix_type_mapping")
 
-    # Copied exactly from ixmp.backend.io
-    def parse_item_sheets(name):
-        """Read data for item *name*, possibly across multiple sheets."""
-        dfs = [xf.parse(name)]
-
-        # Collect data from repeated sheets due to max_row limit
-        for x in filter(lambda n: n.startswith(name + "("), xf.sheet_names):
-            dfs.append(xf.parse(x))  # pragma: no cover
+    def item_sheets(name) -> List[str]:
+        """Sheet(s) containing data for item `name`.
 
-        # Concatenate once and return
-        return pd.concat(dfs, axis=0, ignore_index=True)
+        Data may be across multiple sheets due to the max_row limit; see
+        :mod:`ixmp.backend.io`.
+        """
+        return [name] + list(filter(lambda n: n.startswith(name + "("), xf.sheet_names))
 
     sets_path = base.joinpath("sets.xlsx")
     sets_path.unlink(missing_ok=True)
 
     with pd.ExcelWriter(sets_path, engine="openpyxl") as ew:
-        for _, (name, ix_type) in tqdm(name_type.iterrows()):
-            item_path = base.joinpath(f"{name}.csv.gz")
-            if item_path.exists():
-                continue
+        # Sets: parse and write to `sets_path` in the current process
+        for name in name_type.query("ix_type == 'set'")["item"]:
+            df = pd.concat(map(xf.parse, item_sheets(name)), ignore_index=True)
+            df.to_excel(ew, sheet_name=name, index=False)
 
-            df = parse_item_sheets(name)
+        name_type.query("ix_type == 'set'").to_excel(ew, sheet_name="ix_type_mapping")
 
-            if ix_type == "set":
-                df.to_excel(ew, sheet_name=name, index=False)
-            else:  # pragma: no cover
-                df.to_csv(item_path, index=False)
+    # Other items: parse and write in worker processes
+    with ProcessPoolExecutor(
+        max_workers=max_workers, initializer=_open, initargs=(path,)
+    ) as executor:
+        futures = []
+        for name in name_type.query("ix_type != 'set'")["item"]:
+            if any(base.joinpath(f"{name}{s}").exists() for s in SUFFIXES):
+                continue
+            item_path = base.joinpath(f"{name}.parquet")
+            futures.append(executor.submit(_unpack_item, item_sheets(name), item_path))
 
-        name_type.query("ix_type == 'set'").to_excel(ew, sheet_name="ix_type_mapping")
+        for f in tqdm(as_completed(futures), total=len(futures)):
+            f.result()
 
     return base
 
@@ -86,17 +120,22 @@ def read_excel(scenario: Scenario, path: Path) -> None:
     parameters = set(scenario.par_list())
 
     with scenario.transact(f"Read snapshot data from {path}"):
-        for p in base.glob("*.csv.gz"):
-            name = p.name.split(".")[0]
-
-            if name not in parameters:
-                continue  # Variable or equation data: don't read
+        for name in sorted(parameters):
+            # Variable or equation data are not read. Prefer .parquet over .csv.gz
+            try:
+                p = next(
+                    filter(Path.exists, (base.joinpath(name + s) for s in SUFFIXES))
+                )
+            except StopIteration:
+                continue
 
-            data = pd.read_csv(p)
+            data = pd.read_parquet(p) if p.suffix == ".parquet" else pd.read_csv(p)
+            # Convert categoricals written by unpack()
+            data = data.astype({c: str for c in data.select_dtypes("category").columns})
 
             # Correct units
             if name == "inv_cost":
-                data.replace({"unit": {"USD_2005/t ": "USD_2005/t"}}, inplace=True)
+                data["unit"] = data["unit"].replace({"USD_2005/t ": "USD_2005/t"})
 
             scenario.add_par(name, data)
 
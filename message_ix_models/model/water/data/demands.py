@@ -10,55 +10,43 @@ from message_ix import make_df
 from message_ix_models.util import broadcast, package_data_path
 
 
-def get_basin_sizes(basin, node):
-    """Returns the sizes of developing and developed basins for a given node"""
-    temp = basin[basin["BCU_name"] == node]
-    sizes = temp.pivot_table(index=["STATUS"], aggfunc="size")
-    return sizes["DEV"], sizes["IND"]
-
-
-def set_target_rate(df, node, year, target):
-    """Sets the target value for a given node and year"""
-    indices = df[df["node"] == node][df[df["node"] == node]["year"] == year].index
-    for index in indices:
-        if (
-            df[df["node"] == node][df[df["node"] == node]["year"] == year].at[
-                index, "value"
-            ]
-            < target
-        ):
-            df.at[index, "value"] = target
-
-
-def set_target_rate_developed(df, node, target):
-    """Sets target rate for a developed basin"""
-    set_target_rate(df, node, 2030, target)
-
+def _basin_sizes(df, basin):
+    """Returns the numbers of developing and developed countries for each row of df
 
-def set_target_rate_developing(df, node, target):
-    """Sets target rate for a developing basin"""
-    for i in df.index:
-        if df.at[i, "node"] == node and df.at[i, "year"] == 2030:
-            value_2030 = df.at[i, "value"]
-            break
-
-    set_target_rate(
-        df,
-        node,
-        2035,
-        (value_2030 + target) / 2,
+    Returns
+    -------
+    pandas.DataFrame
+        with the same index as `df` and columns "DEV" and "IND".
+    """
+    sizes = (
+        basin.groupby(["BCU_name", "STATUS"])
+        .size()
+        .unstack(fill_value=0)
+        .reindex(columns=["DEV", "IND"], fill_value=0)
     )
-    set_target_rate(df, node, 2040, target)
+    return sizes.reindex(df["node"], fill_value=0).set_axis(df.index)
 
 
 def set_target_rates(df, basin, val):
     """Sets target rates for all nodes in a given basin"""
-    for node in df.node.unique():
-        dev_size, ind_size = get_basin_sizes(basin, node)
-        if dev_size >= ind_size:
-            set_target_rate_developed(df, node, val)
-        else:
-            set_target_rate_developing(df, node, val)
+    sizes = _basin_sizes(df, basin)
+    developed = sizes["DEV"] >= sizes["IND"]
+
+    # Original 2030 rate of each node
+    value_2030 = (
+        df[df["year"] == 2030].drop_duplicates("node").set_index("node")["value"]
+    )
+
+    target = np.select(
+        [
+            developed & (df["year"] == 2030),
+            ~developed & (df["year"] == 2035),
+            ~developed & (df["year"] == 2040),
+        ],
+        [val, (df["node"].map(value_2030) + val) / 2, val],
+        np.nan,
+    )
+    df["value"] = df["value"].mask(df["value"] < target, target)
 
 
 def target_rate(df, basin, val):
@@ -90,52 +78,14 @@ def target_rate_trt(df, basin):
     -------
     data : dict of (str -> pandas.DataFrame)
     """
+    sizes = _basin_sizes(df, basin)
+    # First year of the target for developing and developed basins
+    year = np.where(sizes["DEV"] >= sizes["IND"], 2040, 2030)
 
-    value = []
-    for i in df.node.unique():
-        temp = basin[basin["BCU_name"] == i]
-
-        sizes = temp.pivot_table(index=["STATUS"], aggfunc="size")
-
-        if len(sizes) > 1:
-            if sizes["DEV"] > sizes["IND"] or sizes["DEV"] == sizes["IND"]:
-                for j in df[df["node"] == i][df[df["node"] == i]["year"] >= 2040].index:
-                    temp = df[df["node"] == i][df[df["node"] == i]["year"] >= 2040].at[
-                        j, "value"
-                    ]
-                    temp = temp + (1 - temp) / 2
-                    value.append([j, np.float64(temp)])
-            else:
-                for j in df[df["node"] == i][df[df["node"] == i]["year"] >= 2030].index:
-                    temp = df[df["node"] == i][df[df["node"] == i]["year"] >= 2030].at[
-                        j, "value"
-                    ]
-                    temp = temp + (1 - temp) / 2
-                    value.append([j, np.float64(temp)])
-        else:
-            if sizes.index[0] == "DEV":
-                for j in df[df["node"] == i][df[df["node"] == i]["year"] >= 2040].index:
-                    temp = df[df["node"] == i][df[df["node"] == i]["year"] >= 2040].at[
-                        j, "value"
-                    ]
-                    temp = temp + (1 - temp) / 2
-                    value.append([j, np.float64(temp)])
-            else:
-                for j in df[df["node"] == i][df[df["node"] == i]["year"] >= 2030].index:
-                    temp = df[df["node"] == i][df[df["node"] == i]["year"] >= 2030].at[
-                        j, "value"
-                    ]
-                    temp = temp + (1 - temp) / 2
-                    value.append([j, np.float64(temp)])
-
-    valuetest = pd.DataFrame(data=value, columns=["Index", "Value"])
-
-    for i in range(len(valuetest["Index"])):
-        df.at[valuetest["Index"][i], "Value"] = valuetest["Value"][i]
-
-    real_value = df["Value"].combine_first(df["value"])
-
-    df.drop(["value", "Value"], axis=1, inplace=True)
+    value = df["value"]
+    real_value = value.mask(df["year"] >= year, value + (1 - value) / 2)
+
+    df.drop(["value"], axis=1, inplace=True)
 
     df["value"] = real_value
     return df
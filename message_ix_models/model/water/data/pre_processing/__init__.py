@@ -0,0 +1,136 @@
+"""Pre-processing of source data for MESSAGEix-Nexus.
+
+The Python steps of the hydrological data workflow can be run from the command line
+with::
+
+    python -m message_ix_models.model.water.data.pre_processing --help
+
+Each step processes many combinations of, for instance, (climate model, scenario,
+variable). These are handled by :func:`run`:
+
+- Combinations whose output files are all newer than their input files are skipped.
+- Other combinations are processed in parallel, by up to `max_workers` processes.
+- The number of combinations and the volume of input data processed per second are
+  logged.
+- Each output file is written under a temporary name and then renamed, using
+  :func:`replace_output`, so that an interrupted step does not leave partial files that
+  :meth:`Task.is_current` would take as complete.
+"""
+
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from time import perf_counter
+from typing import Callable, Iterable, Iterator, Optional, Sequence, Tuple
+
+log = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class Task:
+    """One combination of input data to be processed into output files."""
+
+    #: Identifiers of the combination, for instance (model, scenario, variable).
+    key: Tuple[str, ...]
+    #: Input files.
+    inputs: Tuple[Path, ...]
+    #: Output files.
+    outputs: Tuple[Path, ...]
+
+    def __str__(self) -> str:
+        return "/".join(self.key)
+
+    @property
+    def size(self) -> int:
+        """Total size of :attr:`inputs`, in bytes."""
+        return sum(p.stat().st_size for p in self.inputs)
+
+    def is_current(self, depends: Iterable[Path] = ()) -> bool:
+        """Return :any:`True` if all outputs are newer than the inputs and `depends`."""
+        try:
+            oldest = min(p.stat().st_mtime for p in self.outputs)
+        except (FileNotFoundError, ValueError):
+            return False
+        return all(p.stat().st_mtime <= oldest for p in (*self.inputs, *depends))
+
+
+@contextmanager
+def replace_output(path: Path) -> Iterator[Path]:
+    """Context manager for writing an output file at `path`.
+
+    Yields a temporary path next to `path`. If the block completes, the temporary file
+    is renamed to `path`; otherwise it is removed.
+    """
+    tmp = path.with_name(f"{path.name}.{os.getpid()}")
+    try:
+        yield tmp
+        os.replace(tmp, path)
+    finally:
+        tmp.unlink(missing_ok=True)
+
+
+def _timed(func: Callable[[Task], None], task: Task) -> float:
+    """Apply `func` to `task`; return the elapsed time in seconds."""
+    start = perf_counter()
+    func(task)
+    return perf_counter() - start
+
+
+def run(
+    func: Callable[[Task], None],
+    tasks: Sequence[Task],
+    *,
+    max_workers: Optional[int] = 1,
+    force: bool = False,
+    depends: Iterable[Path] = (),
+) -> None:
+    """Apply `func` to each of `tasks`.
+
+    Parameters
+    ----------
+    func :
+        Function that processes one :class:`Task`. If `max_workers` is not 1, this
+        must be picklable, for instance a module-level function or a
+        :func:`functools.partial` of one.
+    max_workers :
+        Number of worker processes. If 1, tasks are processed in the current process.
+        If :any:`None`, the default of :class:`.ProcessPoolExecutor`.
+    force :
+        Process all `tasks`, even those for which :meth:`.Task.is_current`.
+    depends :
+        Other files that all outputs depend on, for instance a shared mask or area
+        file.
+    """
+    depends = list(depends)
+    todo = [t for t in tasks if t.inputs and (force or not t.is_current(depends))]
+    for t in tasks:
+        if not t.inputs:
+            log.warning(f"No input files for {t}")
+    log.info(f"Process {len(todo)} of {len(tasks)} combinations")
+
+    start = perf_counter()
+    total = 0
+
+    def _done(task: Task, elapsed: float) -> None:
+        nonlocal total
+        size = task.size
+        total += size
+        log.info(f"{task}: {size / 1e6:.1f} MB in {elapsed:.1f} s")
+
+    if max_workers == 1:
+        for task in todo:
+            _done(task, _timed(func, task))
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = {executor.submit(_timed, func, task): task for task in todo}
+            for f in as_completed(futures):
+                _done(futures[f], f.result())
+
+    elapsed = max(perf_counter() - start, 1e-9)
+    log.info(
+        f"{len(todo)} combinations, {total / 1e6:.1f} MB in {elapsed:.1f} s: "
+        f"{len(todo) / elapsed:.3f} combinations/s, {total / 1e6 / elapsed:.1f} MB/s"
+    )
@@ -0,0 +1,110 @@
+"""Aggregate hydrological data for MESSAGEix-Nexus.
+
+Usage::
+
+    python -m message_ix_models.model.water.data.pre_processing [raster|basin] --help
+"""
+
+from pathlib import Path
+
+import click
+
+from message_ix_models.util._logging import setup as setup_logging
+
+from . import hydro_agg_basin, hydro_agg_raster
+
+_PATH = click.Path(file_okay=False, path_type=Path)
+
+
+@click.group("hydro-agg")
+def cli():
+    """Aggregate hydrological data."""
+    # Log progress and throughput
+    setup_logging(level="INFO")
+
+
+def _common(func):
+    for decorator in reversed(
+        [
+            click.argument("input_dir", type=_PATH),
+            click.argument("output_dir", type=_PATH),
+            click.option(
+                "-j",
+                "--max-workers",
+                type=int,
+                default=1,
+                show_default=True,
+                help="Number of parallel processes; 0 for one per CPU.",
+            ),
+            click.option(
+                "--force", is_flag=True, help="Process combinations even if current."
+            ),
+            click.option(
+                "--model", "models", multiple=True, help="Climate model(s) to process."
+            ),
+            click.option(
+                "--var", "variables", multiple=True, help="Variable(s) to process."
+            ),
+        ]
+    ):
+        func = decorator(func)
+    return func
+
+
+def _kwargs(models, variables, max_workers, **kwargs):
+    if models:
+        kwargs.update(models=models)
+    if variables:
+        kwargs.update(variables=variables)
+    return dict(max_workers=max_workers or None, **kwargs)
+
+
+@cli.command("raster")
+@_common
+@click.option(
+    "--area", type=click.Path(dir_okay=False, path_type=Path), help="Area file."
+)
+@click.option("--isimip", type=click.Choice(["2b", "3b"]), default="3b")
+@click.option("--data", type=click.Choice(["future", "historical"]), default="future")
+@click.option("--scenario", "scenarios", multiple=True, help="Scenario(s).")
+@click.option(
+    "--annual",
+    is_flag=True,
+    help="5-year means of 20-year rolling annual means, instead of monthly data.",
+)
+def raster_cmd(
+    input_dir,
+    output_dir,
+    area,
+    annual,
+    scenarios,
+    models,
+    variables,
+    max_workers,
+    **kwargs,
+):
+    """Convert gridded data in INPUT_DIR to km³/year in OUTPUT_DIR."""
+    if scenarios:
+        kwargs.update(scenarios=scenarios)
+    hydro_agg_raster.main(
+        input_dir,
+        output_dir,
+        area,
+        monthly=not annual,
+        **_kwargs(models, variables, max_workers, **kwargs),
+    )
+
+
+@cli.command("basin")
+@_common
+@click.option("--iso3", required=True, help="Label of the basin mapping, e.g. R12.")
+@click.option("--eflow-var", "eflow_variable", default="qtot", show_default=True)
+def basin_cmd(input_dir, output_dir, iso3, models, variables, max_workers, **kwargs):
+    """Bias correct and aggregate basin data in INPUT_DIR to OUTPUT_DIR."""
+    hydro_agg_basin.main(
+        input_dir, output_dir, iso3, **_kwargs(models, variables, max_workers, **kwargs)
+    )
+
+
+if __name__ == "__main__":
+    cli()
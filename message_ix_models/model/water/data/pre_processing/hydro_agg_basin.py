@@ -2,335 +2,287 @@
 This script aggregates the global gridded data to any scale. The following
 script specifically aggregates global gridded hydrological data onto the basin
  mapping used in the nexus module.
+
+Input files are monthly data aggregated onto basins by :file:`hydro_agg_spatial.R`,
+with one row per basin. Use :func:`tasks` and :func:`.pre_processing.run` to process
+all combinations of climate model and variable, or the command
+``python -m message_ix_models.model.water.data.pre_processing basin``.
 """
 
-import os
+from functools import partial
+from itertools import product
+from pathlib import Path
+from typing import List, Optional, Sequence
 
 import numpy as np
 import pandas as pd
 
+from . import Task, replace_output, run
+
 # variable, for detailed symbols, refer to ISIMIP2b documentation
-variables = ["qtot", "dis", "qr"]  # total runoff  # discharge  # groundwater run
-
-var = "qr"
-
-
-GCMs = ["mmean", "dry"]
-GCM = "mmean"  # 'dry'choose driest GCM else 'mmean' for multi model mean
-# else mmmean
-iso3 = "ZMB"
-isimip = "3b"
-
-# climate model
-if isimip == "2b":
-    climmodels = ["gfdl-esm2m", "hadgem2-es", "ipsl-cm5a-lr", "miroc5"]
-    climmodel = "gfdl-esm2m"
-    # climate forcing
-    scenarios = ["rcp26", "rcp60"]
-    scen = "rcp26"
-    # This is an internal IIASA directory path
-    wd1 = os.path.join("p:", "ene.model", "NEST", "hydrological_data_agg") + os.sep
-    wd = os.path.join("p:", "watxene", "ISIMIP", "ISIMIP2b", "output", "LPJmL") + os.sep
-    wd2 = os.path.join("p:", "ene.model", "NEST", "hydrology", "processed_nc4") + os.sep
-else:
-    climmodels = [
-        "gfdl-esm4",
-        "ipsl-cm6a-lr",
-        "mpi-esm1-2-hr",
-        "mri-esm2-0",
-        "ukesm1-0-ll",
-    ]
-    cl = "gfdl-esm4"
-    scenarios = ["ssp126", "ssp370", "ssp585"]
-    scen = "ssp126"
-    wd1 = os.path.join("p:", "ene.model", "NEST", "hydrological_data_agg") + os.sep
-    wd11 = (
-        os.path.join("p:", "ene.model", "NEST", iso3, "hydrology", "isimip3B_CWatM")
-        + os.sep
-    )
+VARIABLES = ["qtot", "dis", "qr"]  # total runoff  # discharge  # groundwater run
+
+#: Climate forcing scenarios, and their labels in output file names.
+SCENARIOS = {"ssp126": "2p6", "ssp370": "7p0"}
+
+#: Columns of the input files that do not contain data.
+META = [
+    "Unnamed: 0",
+    "NAME",
+    "BASIN",
+    "BASIN_ID",
+    "area",
+    "area_km2",
+    "X",
+    "REGION",
+    "BCU_name",
+]
+
+#: Quantiles of 20-year rolling monthly values for each reliability level.
+QUANTILES = {"low": 0.5, "med": 0.3, "high": 0.1}
+
+#: Years of the 5-year time steps.
+YEARS = np.arange(2015, 2105, 5)
+
+
+def _months(year, periods: int = 12) -> pd.DatetimeIndex:
+    """Month ends of `periods` months starting in January of `year`."""
+    return pd.date_range(f"{year}-01-01", periods=periods, freq="ME")
+
 
+def _by_month(df: pd.DataFrame) -> pd.DataFrame:
+    """Mean of `df` for each month of the year, with columns 1 to 12."""
+    return df.T.groupby(df.columns.month).mean().T
 
-qtot_7p0_gfdl = pd.read_csv(wd11 + f"{var}_monthly_gfdl-esm4_ssp370_future.csv").drop(
-    [
-        "Unnamed: 0",
-        "NAME",
-        "BASIN",
-        "BASIN_ID",
-        "area",
-        "area_km2",
-        "X",
-        "REGION",
-        "BCU_name",
-    ],
-    axis=1,
-)
-
-new_cols = pd.date_range("2015-01-01", periods=1032, freq="M")
-qtot_7p0_gfdl.columns = new_cols
-
-
-qtot_2p6_gfdl = pd.read_csv(wd11 + f"{var}_monthly_gfdl-esm4_ssp126_future.csv").drop(
-    [
-        "Unnamed: 0",
-        "NAME",
-        "BASIN",
-        "BASIN_ID",
-        "area",
-        "area_km2",
-        "X",
-        "REGION",
-        "BCU_name",
-    ],
-    axis=1,
-)
-
-new_cols = pd.date_range("2015-01-01", periods=1032, freq="M")
-qtot_2p6_gfdl.columns = new_cols
-
-
-qtot_2p6_gfdl_avg = qtot_2p6_gfdl[pd.date_range("2015-01-01", periods=192, freq="M")]
-qtot_7p0_gfdl_avg = qtot_7p0_gfdl[pd.date_range("2015-01-01", periods=192, freq="M")]
-
-val_2020 = (
-    qtot_7p0_gfdl_avg.groupby(qtot_7p0_gfdl_avg.columns.month, axis=1).mean()
-    + qtot_2p6_gfdl_avg.groupby(qtot_2p6_gfdl_avg.columns.month, axis=1).mean()
-) / 2
-val_2020_annual = val_2020.mean(axis=1)
-
-delta60 = (
-    qtot_7p0_gfdl_avg.groupby(qtot_7p0_gfdl_avg.columns.month, axis=1).mean() - val_2020
-)
-delta26 = (
-    qtot_2p6_gfdl_avg.groupby(qtot_2p6_gfdl_avg.columns.month, axis=1).mean() - val_2020
-)
-
-
-def bias_correction(df):
-    """ias corrects the data such that 2020 value is same
-    for both scenario and then apply
-    Input
+
+def _resample_5y(df: pd.DataFrame) -> pd.DataFrame:
+    """Average of `df` for each 5-year block."""
+    return df.T.resample("5YE").mean().T
+
+
+def _5y_m(df: pd.DataFrame) -> pd.DataFrame:
+    """Monthly data of `df` in :data:`YEARS`."""
+    return df[df.columns[df.columns.year.isin(YEARS)]]
+
+
+def read_monthly(path: Path) -> pd.DataFrame:
+    """Read monthly basin data starting in January 2015 from `path`."""
+    df = pd.read_csv(path).drop(META, axis=1)
+    df.columns = _months(2015, len(df.columns))
+    return df
+
+
+def bias_correction(
+    df: pd.DataFrame, val_2020: pd.DataFrame, delta: pd.DataFrame
+) -> tuple:
+    """Bias correct the data such that 2020 value is same for both scenarios.
+
+    Parameters
     ----------
     df : raw input monthly data
+    val_2020 : mean of both scenarios for each month, 2015–2030
+    delta : difference of `df` from `val_2020` for each month, 2015–2030
+
     Returns
     -------
     df : bias corrected monthly data with also replacing 5 year timestep average
-    df_monthly: monthly bias corrected data
     df_5y_m: bias corrected 5 y monthly
-    df_5y: bias corrected 5 y average
+    quantiles: dict of bias corrected 5 y average, for each of :data:`QUANTILES`
     """
-    # Starting value of delat is 1
+    df = df.copy()
+
+    # for 2020 all scenario data frame will be same
+    df[_months(2020)] = val_2020.to_numpy()
+
+    # Starting value of delta is 1
     # it will reduce to zero with each 5 year timestep
     # till 2045 with a difference of 0.2.
     # This means the bias correction will fade away till 2045
-    delta_multiply = 1
-
-    for year in np.arange(2020, 2105, 5):
-        # for 2020 delta all scenario data frame will be same
-        if year == 2020:
-            df[pd.date_range("2020-01-01", periods=12, freq="M")] = val_2020
-
-        else:
-            # for delta years after 2020
-            if delta_multiply > 0.1:
-                for i in np.arange(4, -1, -1):
-                    if i == 4:
-                        delta60.columns = pd.date_range(
-                            str(year - i) + "-01-01", periods=12, freq="M"
-                        )
-                        final_temp = df[
-                            pd.date_range(
-                                str(year - i) + "-01-01", periods=12, freq="M"
-                            )
-                        ] - (delta_multiply * delta60)
-
-                    else:
-                        delta60.columns = pd.date_range(
-                            str(year - i) + "-01-01", periods=12, freq="M"
-                        )
-                        temp = df[
-                            pd.date_range(
-                                str(year - i) + "-01-01", periods=12, freq="M"
-                            )
-                        ] - (delta_multiply * delta60)
-
-                        final_temp = pd.concat((final_temp, temp), axis=1)
-
-                df_monthly = final_temp
-                df[pd.date_range(str(year) + "-01-01", periods=12, freq="M")] = (
-                    final_temp.groupby(final_temp.columns.month, axis=1).mean()
-                )
-                # 5 year monthly data
-                df_5y_m = df[df.columns[df.columns.year.isin(years)]]
-                # 5 year annual
-                # 50th quantile - q50
-                df_q50 = (
-                    df_monthly.rolling(240, min_periods=1, axis=1)
-                    .quantile(0.5, interpolation="linear")
-                    .resample("5Y", axis=1)
-                    .mean()
-                )
-                df_q50["2020-12-31"] = val_2020_annual
-                # 70th quantile - q70
-                df_q70 = (
-                    df_monthly.rolling(240, min_periods=1, axis=1)
-                    .quantile(0.3, interpolation="linear")
-                    .resample("5Y", axis=1)
-                    .mean()
-                )
-                df_q70["2020-12-31"] = val_2020_annual
-                # 90th quantile - q90
-                df_q90 = (
-                    df_monthly.rolling(240, min_periods=1, axis=1)
-                    .quantile(0.1, interpolation="linear")
-                    .resample("5Y", axis=1)
-                    .mean()
-                )
-
-                df_q90["2020-12-31"] = val_2020_annual
-
-                delta_multiply -= 0.2
-
-            else:
-                # after detlta years
-                temp_daterange = pd.date_range(
-                    str(year - 4) + "-01-01", periods=60, freq="M"
-                )
-                # Monthly Bias corrected data
-                df_monthly = df
-
-                df[pd.date_range(str(year) + "-01-01", periods=12, freq="M")] = (
-                    df[temp_daterange]
-                    .groupby(df[temp_daterange].columns.month, axis=1)
-                    .mean()
-                )
-                # 5 year monthly
-                df_5y_m = df[df.columns[df.columns.year.isin(years)]]
-                # 5 year annual
-                # 50th quantile - q50
-                df_q50 = (
-                    df_monthly.rolling(240, min_periods=1, axis=1)
-                    .quantile(0.5, interpolation="linear")
-                    .resample("5Y", axis=1)
-                    .mean()
-                )
-                df_q50["2020-12-31"] = val_2020_annual
-                # 70th quantile - q70
-                df_q70 = (
-                    df_monthly.rolling(240, min_periods=1, axis=1)
-                    .quantile(0.3, interpolation="linear")
-                    .resample("5Y", axis=1)
-                    .mean()
-                )
-                df_q70["2020-12-31"] = val_2020_annual
-                # 90th quantile - q90
-                df_q90 = (
-                    df_monthly.rolling(240, min_periods=1, axis=1)
-                    .quantile(0.1, interpolation="linear")
-                    .resample("5Y", axis=1)
-                    .mean()
-                )
-
-                df_q90["2020-12-31"] = val_2020_annual
-
-    return df, df_monthly, df_5y_m, df_q50, df_q70, df_q90
-
-
-years = np.arange(2015, 2105, 5)
-
-df_26, df_monthly_26, df_5y_m_26, df_q50_26, df_q70_26, df_q90_26 = bias_correction(
-    qtot_2p6_gfdl
-)
-
-df_70, df_monthly_70, df_5y_m_70, df_q50_70, df_q70_70, df_q90_70 = bias_correction(
-    qtot_7p0_gfdl
-)
-
-
-df_monthly_26.to_csv(wd11 + f"/{var}_monthly_2p6_{iso3}.csv")
-df_5y_m_26.to_csv(wd11 + f"/{var}_5y_m_2p6_low_{iso3}.csv")
-df_q50_26.to_csv(wd11 + f"/{var}_5y_2p6_low_{iso3}.csv")
-df_q70_26.to_csv(wd11 + f"/{var}_5y_2p6_med_{iso3}.csv")
-df_q90_26.to_csv(wd11 + f"/{var}_5y_2p6_high_{iso3}.csv")
-
-df_monthly_70.to_csv(wd11 + f"/{var}_monthly_7p0_{iso3}.csv")
-df_5y_m_70.to_csv(wd11 + f"/{var}_5y_m_7p0_low_{iso3}.csv")
-df_q50_70.to_csv(wd11 + f"/{var}_5y_7p0_low_{iso3}.csv")
-df_q70_70.to_csv(wd11 + f"/{var}_5y_7p0_med_{iso3}.csv")
-df_q90_70.to_csv(wd11 + f"/{var}_5y_7p0_high_{iso3}.csv")
-
-# No climate scenarios
-df_q50_70.apply(lambda x: val_2020_annual)
-for y in years:
-    df_5y_m_70[pd.date_range(f"{y}-01-01", periods=12, freq="M")] = val_2020
-df_5y_m_70.to_csv(wd11 + f"/{var}_5y_m_no_climate_low_{iso3}.csv")
-df_q50_70.apply(lambda x: val_2020_annual).to_csv(
-    wd11 + f"/{var}_5y_no_climate_low_{iso3}.csv"
-)
-df_q70_70.apply(lambda x: val_2020_annual).to_csv(
-    wd11 + f"/{var}_5y_no_climate_med_{iso3}.csv"
-)
-df_q90_70.apply(lambda x: val_2020_annual).to_csv(
-    wd11 + f"/{var}_5y_no_climate_high_{iso3}.csv"
-)
-# Environmental Flow
-df_env = df_monthly_70
-col_end = None
-# df = data.iloc[:,5:]
-for z in range(len(df_env.columns) // 12):
-    col_start = 0 if z == 0 else col_end  # start col number
-    col_end = (z + 1) * 12  # ending col number
-    temp = df_env.iloc[:, col_start:col_end]  # assigning relevant data
-
-    col_names = temp.columns  # getting column names
-    MAF = temp.mean(axis=1)  # take mean acorss
-
-    for j in range(len(temp.columns)):
-        temp.iloc[:, j] = np.where(
-            temp.iloc[:, j] > 0.8 * MAF,
-            temp.iloc[:, j] * 0.2,
-            np.where(
-                (temp.iloc[:, j] > 0.4 * MAF) & (temp.iloc[:, j] <= 0.8 * MAF),
-                temp.iloc[:, j] * 0.45,
-                temp.iloc[:, j] * 0.6,
-            ),
+    delta_multiply = 1.0
+
+    for year in np.arange(2025, 2105, 5):
+        temp = df[_months(year - 4, 60)]
+        # for delta years after 2020
+        if delta_multiply > 0.1:
+            temp = temp - delta_multiply * np.tile(delta.to_numpy(), 5)
+            delta_multiply -= 0.2
+        # Replace the values of each 5th year with the mean of the preceding 5 years
+        df[_months(year)] = _by_month(temp).to_numpy()
+
+    val_2020_annual = val_2020.mean(axis=1)
+    quantiles = {}
+    for rel, q in QUANTILES.items():
+        quantiles[rel] = _resample_5y(
+            df.T.rolling(240, min_periods=1).quantile(q, interpolation="linear").T
         )
+        quantiles[rel][pd.Timestamp("2020-12-31")] = val_2020_annual
 
-    if z == 0:
-        eflow = temp
-    else:
-        eflow = pd.concat((eflow, temp), axis=1)
+    return df, _5y_m(df), quantiles
 
-    eflow = eflow.abs()
 
-# Convert to 5 year annual values
-eflow_5y = eflow.resample("5Y", axis=1).mean()
-eflow_5y.to_csv(wd11 + f"e-flow_7p0_{iso3}.csv")
+def environmental_flow(df: pd.DataFrame) -> pd.DataFrame:
+    """Environmental flow based on the Variable Monthly Flow (VMF) method.
 
-for year in np.arange(2020, 2105, 5):
-    for i in np.arange(4, -1, -1):
-        if i == 4:
-            final_temp = eflow[
-                pd.date_range(str(year - i) + "-01-01", periods=12, freq="M")
+    The environmental flow is 20%, 45% or 60% of the monthly flow, if this is high
+    (> 80%), intermediate (> 40%) or low compared to the mean annual flow (MAF).
+    """
+    maf = df.T.groupby(df.columns.year).transform("mean").T
+    factor = np.where(df > 0.8 * maf, 0.2, np.where(df > 0.4 * maf, 0.45, 0.6))
+    return (df * factor).abs()
+
+
+def output_names(variable: str, iso3: str, eflow: bool) -> List[str]:
+    """Names of the output files for one variable."""
+    result = []
+    for s in SCENARIOS.values():
+        result.extend(
+            [
+                f"{variable}_monthly_{s}_{iso3}.csv",
+                f"{variable}_5y_m_{s}_low_{iso3}.csv",
             ]
+            + [f"{variable}_5y_{s}_{rel}_{iso3}.csv" for rel in QUANTILES]
+        )
+    result.append(f"{variable}_5y_m_no_climate_low_{iso3}.csv")
+    result.extend(f"{variable}_5y_no_climate_{rel}_{iso3}.csv" for rel in QUANTILES)
+    if eflow:
+        result.extend(
+            f"e-flow_{name}_{iso3}.csv"
+            for name in ("7p0", "5y_m_7p0", "no_climate", "5y_m_no_climate")
+        )
+    return result
+
+
+def tasks(
+    input_dir: Path,
+    output_dir: Path,
+    iso3: str,
+    *,
+    models: Sequence[str] = ("gfdl-esm4",),
+    variables: Sequence[str] = VARIABLES,
+    eflow_variable: str = "qtot",
+) -> List[Task]:
+    """Return one :class:`.Task` per (climate model, variable).
+
+    Input files are named like :file:`{variable}_monthly_{model}_{scenario}_future.csv`
+    for each of :data:`SCENARIOS`. Environmental flows are computed from
+    `eflow_variable`.
+
+    Output file names, from :func:`output_names`, do not contain the climate model; they
+    are the names read by :mod:`.water.data`. Thus `models` must contain exactly one
+    climate model.
+
+    Raises
+    ------
+    ValueError
+        if `models` does not have exactly one element.
+    """
+    if len(models) != 1:
+        raise ValueError(
+            f"{len(models)} climate models {models!r}; output file names do not "
+            "include the model, so give exactly 1"
+        )
 
-        else:
-            final_temp = eflow[
-                pd.date_range(str(year - i) + "-01-01", periods=12, freq="M")
-            ]
+    result = []
+    for cl, var in product(models, variables):
+        inputs = [
+            input_dir.joinpath(f"{var}_monthly_{cl}_{scen}_future.csv")
+            for scen in SCENARIOS
+        ]
+        names = output_names(var, iso3, var == eflow_variable)
+        result.append(
+            Task(
+                key=(cl, var),
+                # Data for all scenarios are required
+                inputs=tuple(inputs) if all(p.exists() for p in inputs) else (),
+                outputs=tuple(output_dir.joinpath(name) for name in names),
+            )
+        )
+    return result
+
+
+def process(task: Task, iso3: str, eflow_variable: str = "qtot") -> None:
+    """Bias correct and aggregate monthly basin data for one `task`."""
+    var = task.key[-1]
+    out = {p.name: p for p in task.outputs}
+
+    def _write(df: pd.DataFrame, name: str) -> None:
+        with replace_output(out[name]) as path:
+            df.to_csv(path)
+
+    data = dict(zip(SCENARIOS.values(), map(read_monthly, task.inputs)))
+
+    # Mean for each month over 2015–2030
+    by_month = {s: _by_month(df[_months(2015, 192)]) for s, df in data.items()}
+    val_2020 = (by_month["7p0"] + by_month["2p6"]) / 2
+    val_2020_annual = val_2020.mean(axis=1)
+    delta = by_month["7p0"] - val_2020
+
+    result = {}
+    for s, df in data.items():
+        result[s] = df, df_5y_m, quantiles = bias_correction(df, val_2020, delta)
+
+        _write(df, f"{var}_monthly_{s}_{iso3}.csv")
+        _write(df_5y_m, f"{var}_5y_m_{s}_low_{iso3}.csv")
+        for rel, df_q in quantiles.items():
+            _write(df_q, f"{var}_5y_{s}_{rel}_{iso3}.csv")
+
+    # No climate scenarios
+    df, df_5y_m, quantiles = result["7p0"]
+    for y in YEARS:
+        df_5y_m[_months(y)] = val_2020.to_numpy()
+    _write(df_5y_m, f"{var}_5y_m_no_climate_low_{iso3}.csv")
+    for rel, df_q in quantiles.items():
+        _write(
+            df_q.apply(lambda x: val_2020_annual),
+            f"{var}_5y_no_climate_{rel}_{iso3}.csv",
+        )
 
-    df_monthly = final_temp
-    eflow[pd.date_range(str(year) + "-01-01", periods=12, freq="M")] = (
-        final_temp.groupby(final_temp.columns.month, axis=1).mean()
-    )
+    if var != eflow_variable:
+        return
+
+    # Environmental Flow
+    eflow = environmental_flow(df)
+
+    # Convert to 5 year annual values
+    eflow_5y = _resample_5y(eflow)
+    _write(eflow_5y, f"e-flow_7p0_{iso3}.csv")
+
+    eflow_5y_m = _5y_m(eflow)
+    _write(eflow_5y_m, f"e-flow_5y_m_7p0_{iso3}.csv")
+
+    val_2020_eflow = eflow_5y_m[_months(2020)].to_numpy()
+    val_2020_eflowy = eflow_5y[pd.Timestamp("2020-12-31")]
+    _write(eflow_5y.apply(lambda x: val_2020_eflowy), f"e-flow_no_climate_{iso3}.csv")
 
-    eflow_5y_m = eflow[eflow.columns[eflow.columns.year.isin(years)]]
-    eflow_5y_m.to_csv(wd11 + f"e-flow_5y_m_7p0_{iso3}.csv")
+    for y in YEARS:
+        eflow_5y_m[_months(y)] = val_2020_eflow
+    _write(eflow_5y_m, f"e-flow_5y_m_no_climate_{iso3}.csv")
 
-val_2020_eflow = eflow_5y_m[pd.date_range("2020-01-01", periods=12, freq="M")].values()
-val_2020_eflowy = eflow_5y["2020-12-31"]
-eflow_5y.apply(lambda x: val_2020_eflowy).to_csv(wd11 + f"e-flow_no_climate_{iso3}.csv")
 
-for y in years:
-    eflow_5y_m[pd.date_range(f"{y}-01-01", periods=12, freq="M")] = val_2020_eflow
+def main(
+    input_dir: Path,
+    output_dir: Path,
+    iso3: str,
+    *,
+    max_workers: Optional[int] = 1,
+    force: bool = False,
+    eflow_variable: str = "qtot",
+    **kwargs,
+) -> None:
+    """Process all combinations of climate model and variable.
 
-eflow_5y_m.to_csv(wd11 + f"e-flow_5y_m_no_climate_{iso3}.csv")
+    Parameters
+    ----------
+    iso3 :
+        Label for the basin mapping in output file names, for instance "ZMB" or "R12".
+    kwargs :
+        Passed to :func:`tasks`.
+    """
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    run(
+        partial(process, iso3=iso3, eflow_variable=eflow_variable),
+        tasks(input_dir, output_dir, iso3, eflow_variable=eflow_variable, **kwargs),
+        max_workers=max_workers,
+        force=force,
+    )
@@ -4,288 +4,223 @@ scale and also adjust unit conversions. The following
 script specifically aggregates global gridded hydrological
 data onto the basin
  mapping used in the nexus module.
-"""
 
-import glob
+The hydrological data can be accessed in watxene p drive. For accessing
+particular drive, seek permission from Edward Byers (byers@iiasa.ac.at)
+The files should be copied on to local drive.
+
+Use :func:`tasks` and :func:`.pre_processing.run` to process all combinations of
+climate model, scenario and variable found in an input directory, or the command
+``python -m message_ix_models.model.water.data.pre_processing raster``.
+"""
 
-#  Import packages
-import os
-from datetime import datetime as dt
+from functools import partial
+from itertools import product
+from pathlib import Path
+from typing import List, Optional, Sequence
 
-import dask
-import numpy as np
-import xarray as xr
+from . import Task, replace_output, run
 
-start = dt.now()
+#: Climate models, for each ISIMIP round.
+CLIMATE_MODELS = {
+    "2b": ["gfdl-esm2m", "hadgem2-es", "ipsl-cm5a-lr", "miroc5"],
+    "3b": ["gfdl-esm4", "ipsl-cm6a-lr", "mpi-esm1-2-hr", "mri-esm2-0", "ukesm1-0-ll"],
+}
 
+#: Climate forcing scenarios, for each ISIMIP round.
+SCENARIOS = {
+    "2b": ["rcp26", "rcp60"],
+    "3b": ["ssp126", "ssp370", "ssp585"],
+}
 
 # variable, for detailed symbols, refer to ISIMIP2b documentation
-variables = [
+VARIABLES = [
     "qtot",  # total runoff
     "dis",  # discharge
-    "qg",  # groundwater runoff
-    "qr",
-]  # groudnwater recharge
-var = "qr"
-
-isimip = "3b"
-
-data = "future"  # else future
-climmodels = ["gfdl-esm2m", "hadgem2-es", "ipsl-cm5a-lr", "miroc5"]
-
-for cl in climmodels:
-    # climate model
-    if isimip == "2b":
-        climmodels = ["gfdl-esm2m", "hadgem2-es", "ipsl-cm5a-lr", "miroc5"]
-        climmodel = "gfdl-esm2m"
-        # climate forcing
-        scenarios = ["rcp26", "rcp60"]
-        scen = "rcp26"
-        wd1 = os.path.join("p:", "ene.model", "NEST", "hydrological_data_agg") + os.sep
-        wd = (
-            os.path.join("p:", "watxene", "ISIMIP", "ISIMIP2b", "output", "LPJmL")
-            + os.sep
-        )
-        wd2 = (
-            os.path.join("p:", "ene.model", "NEST", "hydrology", "processed_nc4")
-            + os.sep
-        )
-    else:
-        climmodels = [
-            "gfdl-esm4",
-            "ipsl-cm6a-lr",
-            "mpi-esm1-2-hr",
-            "mri-esm2-0",
-            "ukesm1-0-ll",
+    "qr",  # groundwater recharge
+]
+
+# deinfe lat and long chunk for reducing computational load
+LAT_CHUNK = 120
+LON_CHUNK = 640
+
+#: Name of the raster area file. The file landareamaskmap0.nc can be found under
+#: P:\ene.model\NEST\delineation\data\delineated_basins_new
+AREA_FILE = "landareamaskmap0.nc"
+
+
+def output_names(
+    variable: str, model: str, scenario: str, data: str, monthly: bool
+) -> List[str]:
+    """Names of the output files for one combination."""
+    if monthly:
+        if variable == "dis":
+            return [f"{variable}_monthly__{model}_{scenario}.nc"]
+        return [f"{variable}_monthly_{model}_{scenario}_{data}.nc"]
+    elif variable == "dis":
+        return [
+            f"{variable}_90Y_avg_5y__{model}_{scenario}_temp_agg.nc",
+            f"{variable}_5y__{model}_{scenario}_temp_agg.nc",
         ]
-        scenarios = ["ssp126", "ssp370", "ssp585"]
-        scen = "ssp126"
-        wd1 = os.path.join("p:", "ene.model", "NEST", "hydrological_data_agg")
-        wd = (
-            os.path.join(
-                "p:",
-                "watxene",
-                "ISIMIP",
-                "ISIMIP3b",
-                "CWatM_results",
-                f"{cl}",
-                f"{data}",
+    elif variable == "qtot":
+        return [f"{variable}_monthly__{model}_{scenario}_temp_agg.nc"]
+    else:
+        return [f"{variable}_5y__{model}_{scenario}.nc"]
+
+
+def tasks(
+    input_dir: Path,
+    output_dir: Path,
+    *,
+    isimip: str = "3b",
+    data: str = "future",
+    models: Optional[Sequence[str]] = None,
+    scenarios: Optional[Sequence[str]] = None,
+    variables: Sequence[str] = VARIABLES,
+    monthly: bool = True,
+) -> List[Task]:
+    """Return one :class:`.Task` per (climate model, scenario, variable).
+
+    Input files are NetCDF files with names like
+    :file:`*{model}*{scenario}*{variable}*monthly*.nc` (:file:`*{model}*{variable}*
+    monthly*.nc` if `data` is "historical") anywhere under `input_dir`; for instance
+    :file:`{input_dir}/{model}/{data}/`.
+    """
+    models = models or CLIMATE_MODELS[isimip]
+    scenarios = scenarios or SCENARIOS[isimip]
+
+    result = []
+    for cl, scen, var in product(models, scenarios, variables):
+        if data == "historical":
+            pattern = f"*{cl}*{var}*monthly*.nc"
+        else:
+            pattern = f"*{cl}*{scen}*{var}*monthly*.nc"
+        result.append(
+            Task(
+                key=(cl, scen, var),
+                inputs=tuple(sorted(input_dir.rglob(pattern))),
+                outputs=tuple(
+                    output_dir.joinpath(name)
+                    for name in output_names(var, cl, scen, data, monthly)
+                ),
             )
-            + os.sep
-        )
-        wd2 = (
-            os.path.join("p:", "ene.model", "NEST", "hydrology", "processed_nc4")
-            + os.sep
         )
+    return result
 
-    # Define if monthly aggregation is required
-    monthlyscale = True
-    # define qauantile for statistical aggregation
-    quant = 0.1
-    # define if multi climate models mean
-    multimodelensemble = True
-    # deinfe lat and long chunk for reducing computational load
-    latchunk = 120
-    lonchunk = 640
-    # Define if use all touched raster
-    all_touched = True
-
-    if var == "dis":
-        # define a spatial method to aggregate
-        spatialmethod = "meansd"
-    else:
-        # define a spatial method to aggregate
-        spatialmethod = "sum"
 
-    """
-    The hydrological data can be accessed in watxene p drive. For accessing
-    particular drive, seek permission from Edward Byers (byers@iiasa.ac.at)
-    The files should be copied on to local drive
-    """
+def _to_netcdf(ds, path: Path) -> None:
+    """Write `ds` to `path`; see :func:`.replace_output`."""
+    with replace_output(path) as tmp:
+        ds.to_netcdf(tmp)
 
-    # Open raster area file
-    # The file landareamaskmap0.nc can be found under
-    # P:\ene.model\NEST\delineation\data\delineated_basins_new
-    area = xr.open_dataarray(wd1 + "landareamaskmap0.nc")
 
-    # TO AVOID ERROR WHEN OPENING AND SLICING INPUT DATA - CHECK!
-    dask.config.set({"array.slicing.split-large-chunks": False})
+def _shift_years(ds, years: int):
+    """Offset the labels on the "time" dimension of `ds` by `years` year ends."""
+    import pandas as pd
 
-    if data == "historical":
-        hydro_data = wd + f"*{cl}*{var}*monthly*.nc"
-    elif data == "future":
-        hydro_data = wd + f"*{cl}*{scen}*{var}*monthly*.nc"
+    return ds.assign_coords(time=ds.get_index("time") + pd.offsets.YearEnd(years))
 
-    files = glob.glob(hydro_data)
-    if var != "qr":
-        # Open hydrological data as a combined dataset
-        da = xr.open_mfdataset(files)
-    else:
-        # Open hydrological data as a combined dataset
-        da = xr.open_mfdataset(files)
 
-        # da.to_netcdf(wd+f'\{var}_memean_{scen}.nc')
+def process(
+    task: Task, area_path: Path, monthly: bool = True, synchronous: bool = False
+) -> None:
+    """Aggregate and convert units of hydrological data for one `task`.
 
-    if monthlyscale:
-        years = np.arange(2010, 2105, 5)
-    else:
-        years = np.arange(2010, 2105, 5)
+    Parameters
+    ----------
+    area_path :
+        Path to the raster area file.
+    monthly :
+        If :any:`True`, convert the monthly data to km³/year. Otherwise, compute 5-year
+        means of 20-year rolling averages of annual means.
+    synchronous :
+        Use the synchronous dask scheduler, for instance when several tasks are
+        processed in parallel processes.
+    """
+    import dask
+    import xarray as xr
 
-    # ds = xr.open_dataset(wd+f'{var}_memean_{scen}.nc')
-    # Resample daily data to monthly by summing daily values
+    var = task.key[-1]
 
-    # if var != "qr"\:
-    #     da = da.resample(time="M").mean()
-    #     # Calculate roolling average of 3 months to make the data consistent
-    #     da = da.rolling(time=3, min_periods=1).mean()
+    # deinfe lat and long chunk for reducing computational load
+    chunks = {"lat": LAT_CHUNK, "lon": LON_CHUNK, "time": -1}
 
-    # da = da.fillna(0)
+    # TO AVOID ERROR WHEN OPENING AND SLICING INPUT DATA - CHECK!
+    with dask.config.set(
+        {
+            "array.slicing.split-large-chunks": False,
+            "scheduler": "synchronous" if synchronous else "threads",
+        }
+    ):
+        area = xr.open_dataarray(area_path)
+        # Open hydrological data as a combined dataset
+        da = xr.open_mfdataset(task.inputs, chunks=chunks)
 
-    # %%
-    if monthlyscale:
         if var == "dis":
-            # # Converts the discharge  into km3/year
-            da = da * 0.031556952
-            da["dis"] = da.dis.chunk(
-                {"lat": latchunk, "lon": lonchunk, "time": len(da.dis.time)}
-            )
-            # slice is required to reduce the dataset.
-            # da = da.sel(time=slice("2010-01-01", "2050-12-31"))
+            # Converts the discharge into km3/year
+            def convert(ds):
+                return ds * 0.031556952
 
-            da.dis.attrs["unit"] = "km3/year"
-            # chunking reduces computational burden
-            da["dis"] = da.dis.chunk(
-                {"lat": latchunk, "lon": lonchunk, "time": len(da.dis.time)}
-            )
-            # saving the file here and reloading reduces disk space
-            da.to_netcdf(wd2 + f"{var}_monthly__{cl}_{scen}.nc")
-        elif var == "qtot":
-            # da["qtot"] = da.qtot.chunk(
-            #     {"lat": latchunk, "lon": lonchunk, "time": len(da.qtot.time)}
-            # )
-            # Filter 5 year interval monthly time step
-            # da = da.sel(time=da.time.dt.year.isin(years))
+        else:
             # 1kg/m2/sec = 86400 mm/day
             # 86400 mm/day X  Area (mm2) = 86400 mm3/day
             # 86400 mm3/day = 86400 X  1000000 3.65 e-16 km3/year
-            da = da * 86400 * area * 3.65e-16 * 1000000
-
-            # Resample daily data to monthly (by summing daily values)
-            # da = da.resample(time="M").mean()
-
-            # da.rolling(time=12, center=True).construct(
-            #     'tmp').quantile(.1, dim='tmp', skipna=False).dropna(
-            #         'time')
-
-            # da = da.rolling(time=20, min_periods=1).mean()
-            # da["qtot"] = da.qtot.chunk(
-            #     {"lat": latchunk, "lon": lonchunk, "time": len(da.qtot.time)}
-            # )
+            def convert(ds):
+                return ds * 86400 * area * 3.65e-16 * 1000000
+
+        if monthly:
+            da = convert(da)
+            da[var].attrs["unit"] = "km3/year"
+            _to_netcdf(da, task.outputs[0])
+            return
+
+        # Resample monthly data to annual (by averaging monthly values); chunking
+        # reduces computational burden
+        da = da.resample(time="YE").mean().chunk(chunks)
+        # Take 20 year rolling average to make the time scale consistent
+        da = da.rolling(time=20, min_periods=None if var == "dis" else 1).mean()
+        da = convert(da)
+        da[var].attrs["unit"] = "km3/year"
 
-            da.to_netcdf(wd2 + f"{var}_monthly_{cl}_{scen}_{data}.nc")
-        elif var == "qr":
-            # Filter 5 year interval monthly time step
-            # da = da.sel(time=da.time.dt.year.isin(years))
-            # 1kg/m2/sec = 86400 mm/day
-            # 86400 mm/day X  Area (mm2) = 86400 mm3/day
-            # 86400 mm3/day = 86400 X  1000000 3.65 e-16 km3/year
-            da = da * 86400 * area * 3.65e-16 * 1000000
-            da.qr.attrs["unit"] = "km3/year"
-            # da["qr"] = da.qr.chunk(
-            #     {"lat": latchunk, "lon": lonchunk, "time": len(da.qr.time)}
-            # )
-
-            da.to_netcdf(wd2 + f"{var}_monthly_{cl}_{scen}_{data}.nc")
-
-    else:
         if var == "dis":
-            da["dis"] = da.dis.chunk(
-                {"lat": latchunk, "lon": lonchunk, "time": len(da.dis.time)}
-            )
-            # Resample daily data to monthly (by summing daily values)
-            da = da.resample(time="Y").mean()
-
-            da["dis"] = da.dis.chunk(
-                {"lat": latchunk, "lon": lonchunk, "time": len(da.dis.time)}
-            )
-            # Take 20 year rolling average to make the time scale cosnistent
-            da = da.rolling(time=20).mean()
-
-            # Converts the discharge  into km3/year
-            da = da * 0.031556952
-            da.dis.attrs["unit"] = "km3/year"
-            # Long term Mean annual  discharge
-            davg = da.resample(time="30Y", loffset="4Y").mean()
-            davg["dis"] = davg.dis.chunk(
-                {"lat": latchunk, "lon": lonchunk, "time": len(davg.dis.time)}
-            )
-            davg.to_netcdf(wd2 + f"{var}_90Y_avg_5y__{climmodel}_{scen}_temp_agg.nc")
-
-            # Now resample to an average value for each 5-year block, and
-            # offset by 2 years so that the value is centred to start 2101
-            da = da.resample(time="5Y", loffset="4Y").mean()
-
-            da.to_netcdf(wd2 + f"{var}_5y__{climmodel}_{scen}_temp_agg.nc")
-            # read in saved data again to further process
-            da = xr.open_dataset(wd2 + f"{var}_5y__{climmodel}_{scen}_temp_agg.nc")
-
-        elif var == "qtot":
-            da["qtot"] = da.qtot.chunk(
-                {"lat": latchunk, "lon": lonchunk, "time": len(da.qtot.time)}
-            )
-            # Resample daily data to monthly (by summing daily values)
-            da = da.resample(time="Y").mean()
-            da["qtot"] = da.qtot.chunk(
-                {"lat": latchunk, "lon": lonchunk, "time": len(da.qtot.time)}
-            )
-            da = da.rolling(time=20, min_periods=1).mean()
-            da["qtot"] = da.qtot.chunk(
-                {"lat": latchunk, "lon": lonchunk, "time": len(da.qtot.time)}
-            )
-            # Converts to total runoff per gs into km3/year
-            da = da * 86400 * area * 3.65e-16 * 1000000
-            da.qtot.attrs["unit"] = "km3/year"
-            da["qtot"] = da.qtot.chunk(
-                {"lat": latchunk, "lon": lonchunk, "time": len(da.qtot.time)}
+            # Long term Mean annual discharge
+            _to_netcdf(
+                _shift_years(da.resample(time="30YE").mean(), 4), task.outputs[0]
             )
 
-            # Calculate roolling average of 20 years to make the data consistent
-            # da = da.rolling(time = 20).mean()
-            # Now resample to an average value for each 5-year block
-            da = da.resample(time="5Y", loffset="4Y").mean()
-            da.to_netcdf(wd2 + f"{var}_monthly__{climmodel}_{scen}_temp_agg.nc")
-            # read in saved data again to further process
-            # da = xr.\
-            #    open_dataset( wd2+f'\output\{var}_5y__{climmodel}_{scen}_temp_agg.nc')
-            # da['qtot'] = da.qtot.chunk({'lat': latchunk, 'lon': lonchunk,\
-            #                                    'time': len(da.qtot.time)})
-
-        elif var == "qr":
-            da["qr"] = da.qr.chunk(
-                {"lat": latchunk, "lon": lonchunk, "time": len(da.qr.time)}
-            )
-            # Resample daily data to monthly (by summing daily values)
-            da = da.resample(time="Y").mean()
-            da["qr"] = da.qr.chunk(
-                {"lat": latchunk, "lon": lonchunk, "time": len(da.qr.time)}
-            )
-            da = da.rolling(time=20, min_periods=1).mean()
-            da["qr"] = da.qr.chunk(
-                {"lat": latchunk, "lon": lonchunk, "time": len(da.qr.time)}
-            )
-            # TODO check unit
-            # 1kg/m2/sec = 86400 mm/day
-            # 86400 mm/day X  Area (mm2) = 86400 mm3/day
-            # 86400 mm3/day = 86400 X  1000000 3.65 e-16 km3/year
-            da = da * 86400 * area * 3.65e-16 * 1000000
-            da.qr.attrs["unit"] = "km3/year"
-            da["qr"] = da.qr.chunk(
-                {"lat": latchunk, "lon": lonchunk, "time": len(da.qr.time)}
-            )
-
-            # Calculate roolling average of 20 years to make the data consistent
-            # da = da.rolling(time = 3).mean()
-            # Now resample to an average value for each 5-year block
-            da = da.resample(time="5Y", loffset="4Y").mean()
-
-            da.to_netcdf(wd2 + f"{var}_5y__{climmodel}_{scen}.nc")
+        # Now resample to an average value for each 5-year block, and
+        # offset by 4 years
+        _to_netcdf(_shift_years(da.resample(time="5YE").mean(), 4), task.outputs[-1])
+
+
+def main(
+    input_dir: Path,
+    output_dir: Path,
+    area_path: Optional[Path] = None,
+    *,
+    monthly: bool = True,
+    max_workers: Optional[int] = 1,
+    force: bool = False,
+    **kwargs,
+) -> None:
+    """Process all combinations of climate model, scenario and variable.
+
+    Parameters
+    ----------
+    area_path :
+        Path to the raster area file. Default: :data:`AREA_FILE` in `input_dir`.
+    kwargs :
+        Passed to :func:`tasks`.
+    """
+    area_path = area_path or input_dir.joinpath(AREA_FILE)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    run(
+        partial(
+            process, area_path=area_path, monthly=monthly, synchronous=max_workers != 1
+        ),
+        tasks(input_dir, output_dir, monthly=monthly, **kwargs),
+        max_workers=max_workers,
+        force=force,
+        depends=[area_path],
+    )
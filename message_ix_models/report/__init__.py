@@ -1,16 +1,21 @@
+import hashlib
 import logging
+from concurrent.futures import ProcessPoolExecutor
 from contextlib import nullcontext
 from copy import deepcopy
 from functools import partial
 from importlib import import_module
 from operator import itemgetter
 from pathlib import Path
-from typing import Callable, List, Optional, Tuple, Union
+from time import perf_counter
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Union
 from warnings import warn
 
 import genno.config
+import pandas as pd
 import yaml
 from genno import Key, KeyExistsError
+from genno.caching import hash_args
 from genno.compat.pyam import iamc as handle_iamc
 from message_ix import Reporter, Scenario
 
@@ -25,6 +30,7 @@ __all__ = [
     "prepare_reporter",
     "register",
     "report",
+    "report_batch",
 ]
 
 
@@ -45,6 +51,15 @@ except AttributeError:
 #: List of callbacks for preparing the Reporter.
 CALLBACKS: List[Callable] = []
 
+#: Reporters prepared by :func:`prepare_reporter`, and their keys, for reuse when
+#: :attr:`.report.Config.use_template` is set. Keys are from :func:`_template_key`.
+#: The stored Reporters do not refer to any :class:`.Scenario`.
+_TEMPLATES: Dict[str, Tuple[Reporter, Key]] = {}
+
+#: Maximum number of entries in :data:`_TEMPLATES`. When this is exceeded, the
+#: earliest-stored entry is discarded.
+_TEMPLATES_MAX = 8
+
 
 @genno.config.handles("iamc")
 def iamc(c: Reporter, info):
@@ -267,6 +282,99 @@ def report(context: Context, *args, **kwargs):
     )
 
 
+def report_batch(
+    contexts: Sequence[Context], max_workers: Optional[int] = None
+) -> pd.DataFrame:
+    """Report multiple scenarios, in parallel.
+
+    Each of `contexts` is passed to :func:`report` in a separate worker process, which
+    opens its own connection to the :class:`ixmp.Platform`. Read-only data used for
+    every scenario, such as code lists, are loaded once in the current process and
+    once per worker, rather than once per scenario. The :data:`CALLBACKS` registered
+    in the current process are also registered in each worker.
+
+    An exception raised while reporting one scenario is logged, and does not stop the
+    reporting of others.
+
+    Parameters
+    ----------
+    contexts :
+        Sequence of :class:`.Context`, each identifying one scenario through its
+        :attr:`~.Config.scenario_info` and :attr:`~.Config.platform_info`.
+    max_workers : int, optional
+        Maximum number of worker processes. If 1, all work is done in the current
+        process. If not given, the default of :class:`.ProcessPoolExecutor`.
+
+    Returns
+    -------
+    pandas.DataFrame
+        One row for each of `contexts`, in the same order, with columns:
+
+        - url: the scenario URL.
+        - status: "ok", or the :func:`repr` of the exception raised.
+        - time: time taken to report the scenario, in seconds.
+    """
+    columns = ["url", "status", "time"]
+
+    # Load shared data once, before any workers are started. With the "fork" start
+    # method, workers inherit these; otherwise, each loads them in _init_worker()
+    _load_shared()
+
+    if max_workers == 1:
+        return pd.DataFrame(map(_report_one, contexts), columns=columns)
+
+    with ProcessPoolExecutor(
+        max_workers=max_workers, initializer=_init_worker, initargs=(CALLBACKS,)
+    ) as executor:
+        return pd.DataFrame(executor.map(_report_one, contexts), columns=columns)
+
+
+def _load_shared() -> None:
+    """Load read-only data used when reporting any scenario."""
+    from message_ix_models.model.emissions import get_emission_factors
+    from message_ix_models.model.structure import get_codes
+
+    for name in "commodity", "technology":
+        get_codes(name)
+    get_emission_factors()
+
+
+def _init_worker(callbacks: List[Callable]) -> None:
+    """Prepare a worker process for :func:`report_batch`."""
+    for callback in callbacks:
+        if callback not in CALLBACKS:
+            CALLBACKS.append(callback)
+
+    # Root Context for Context.get_instance() in this process
+    Context()
+
+    _load_shared()
+
+
+def _report_one(context: Context) -> Tuple[str, str, float]:
+    """Report the scenario identified by `context`; return URL, status, and time."""
+    # Copy, so that changes made while reporting do not affect the caller's `context`
+    context = deepcopy(context)
+    info = context.scenario_info
+    url = "ixmp://{}/{}/{}".format(
+        context.platform_info.get("name", ""), info.get("model"), info.get("scenario")
+    ) + (f"#{info['version']}" if info.get("version") else "")
+
+    start = perf_counter()
+    try:
+        report(context)
+    except Exception as e:
+        log.exception(f"Reporting {url}")
+        status = repr(e)
+    else:
+        status = "ok"
+    finally:
+        context.close_db()
+        context.delete()
+
+    return url, status, round(perf_counter() - start, 3)
+
+
 def _invoke_legacy_reporting(context):
     from .legacy import iamc_report_hackathon
 
@@ -313,6 +421,13 @@ def prepare_reporter(
         Existing reporter to extend with computations. If not given, it is created
         using :meth:`message_ix.Reporter.from_scenario`.
 
+        If :attr:`.report.Config.use_template` is :obj:`True` and a Reporter was
+        already prepared for another scenario with the same structure (lists of items,
+        contents of all sets, and presence of a solution) and the same configuration,
+        then a copy of that Reporter is returned, with its "scenario" key referring
+        to `scenario`. This avoids constructing the same graph again when reporting
+        many similar scenarios.
+
     Returns
     -------
     .Reporter
@@ -327,6 +442,7 @@ def prepare_reporter(
     """
     log.info("Prepare reporter")
 
+    template_key = None
     if reporter:
         # Existing `Reporter` provided
         rep = reporter
@@ -337,6 +453,12 @@ def prepare_reporter(
     else:
         # Retrieve the scenario
         scenario = scenario or context.get_scenario()
+
+        if context.report.use_template:
+            template_key = _template_key(context, scenario)
+            if template_key in _TEMPLATES:
+                return _from_template(context, scenario, template_key)
+
         # Create a new Reporter
         rep = Reporter.from_scenario(scenario)
         has_solution = scenario.has_solution()
@@ -351,11 +473,7 @@ def prepare_reporter(
     # TODO Remove, once message_data.reporting is removed.
     genno.config.handles("iamc")(iamc)
 
-    if context.report.use_scenario_path:
-        # Construct ScenarioInfo
-        si = ScenarioInfo(scenario, empty=True)
-        # Use the scenario URL to extend the path
-        context.report.set_output_dir(context.report.output_dir.joinpath(si.path))
+    _set_output_dir(context, scenario)
 
     # Pass values to genno's configuration; deepcopy to protect from destructive
     # operations
@@ -390,6 +508,117 @@ def prepare_reporter(
     # Create the output directory
     context.report.mkdir()
 
+    if template_key:
+        # Store a copy for reuse with other scenarios of the same structure
+        _store_template(template_key, rep, key)
+
+    _persist(context, rep)
+
+    log.info("…done")
+
+    return rep, key
+
+
+def _persist(context: Context, rep: Reporter) -> None:
+    """Apply :func:`.report.util.persist` for :attr:`.report.Config.persist`."""
+    from .util import persist
+
+    if context.report.persist:
+        persist(rep, context.report.persist, context.get_cache_path("report"))
+
+
+def _set_output_dir(context: Context, scenario: Scenario) -> None:
+    if context.report.use_scenario_path:
+        # Construct ScenarioInfo
+        si = ScenarioInfo(scenario, empty=True)
+        # Use the scenario URL to extend the path
+        context.report.set_output_dir(context.report.output_dir.joinpath(si.path))
+
+
+def _template_key(context: Context, scenario: Scenario) -> str:
+    """Return a key identifying the :class:`.Reporter` for `scenario` and `context`.
+
+    Two scenarios have the same key if they have the same lists of items, the same
+    contents of every set, and the same solution status. The key also reflects
+    :attr:`.report.Config.genno_config` (except the output directory), the model
+    configuration, the registered :data:`CALLBACKS`, and the key to be reported.
+    """
+    h = hashlib.blake2b(digest_size=20)
+
+    # Structure of the scenario. The contents of sets are stored in the graph by
+    # Reporter.from_scenario().
+    h.update(
+        repr(
+            (
+                scenario.has_solution(),
+                sorted(scenario.par_list()),
+                sorted(scenario.equ_list()),
+                sorted(scenario.var_list()),
+            )
+        ).encode()
+    )
+    for name in sorted(scenario.set_list()):
+        h.update(name.encode())
+        h.update(pd.util.hash_pandas_object(scenario.set(name), index=False).values)
+
+    # Configuration
+    genno_config = context.report.genno_config.copy()
+    genno_config.pop("output_dir", None)
+    h.update(
+        hash_args(
+            genno_config,
+            context.model,
+            [f"{cb.__module__}.{cb.__qualname__}" for cb in CALLBACKS],
+            context.report.key,
+            context.report.cli_output,
+        ).encode()
+    )
+
+    return h.hexdigest()
+
+
+def _copy_reporter(rep: Reporter) -> Reporter:
+    """Return a copy of `rep` that can be modified without affecting `rep`."""
+    result = Reporter()
+    result.graph.update(rep.graph)
+    result.graph["config"] = rep.graph["config"].copy()
+    result.modules = list(rep.modules)
+    return result
+
+
+def _store_template(template_key: str, rep: Reporter, key: Key) -> None:
+    """Store a copy of `rep` and `key` in :data:`_TEMPLATES`.
+
+    The copy does not refer to the scenario reported by `rep`, so that storing it does
+    not keep the scenario or its :class:`ixmp.Platform` alive. Only the URL is kept.
+    """
+    template = _copy_reporter(rep)
+    template.graph["scenario"] = rep.graph["scenario"].url
+
+    _TEMPLATES.pop(template_key, None)
+    _TEMPLATES[template_key] = (template, key)
+    while len(_TEMPLATES) > _TEMPLATES_MAX:
+        _TEMPLATES.pop(next(iter(_TEMPLATES)))
+
+
+def _from_template(
+    context: Context, scenario: Scenario, template_key: str
+) -> Tuple[Reporter, Key]:
+    """Return a copy of a stored Reporter and key, bound to `scenario`."""
+    template, key = _TEMPLATES[template_key]
+    log.info(f"Reuse reporter prepared for {template.graph['scenario']}")
+
+    rep = _copy_reporter(template)
+    rep.graph["scenario"] = scenario
+
+    # Update the output directory for `scenario`
+    _set_output_dir(context, scenario)
+    if "output_dir" in context.report.genno_config:
+        rep.graph["config"]["output_dir"] = context.report.genno_config["output_dir"]
+    context.report.mkdir()
+
+    _persist(context, rep)
+
     log.info("…done")
 
     return rep, key
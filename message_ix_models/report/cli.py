@@ -44,9 +44,24 @@ def _modules_arg(context, param, value):
     type=click.Path(writable=True, resolve_path=True, path_type=Path),
     help="Write output to PATH instead of console or default locations.",
 )
+@click.option(
+    "--persist",
+    metavar="KEYS",
+    default="",
+    help="Store and reuse the comma-separated quantities KEYS across runs.",
+)
+@click.option(
+    "--jobs",
+    "-j",
+    "max_workers",
+    type=int,
+    default=1,
+    show_default=True,
+    help="With --urls-from-file, report up to N scenarios in parallel.",
+)
 @click.argument("key", default="message::default")
 @click.pass_obj
-def cli(context, config_file, legacy, cli_output, key, **kwargs):
+def cli(context, config_file, legacy, cli_output, persist, max_workers, key, **kwargs):
     """Postprocess results.
 
     KEY defaults to the comprehensive report 'message::default', but may also be the
@@ -56,18 +71,24 @@ def cli(context, config_file, legacy, cli_output, key, **kwargs):
     the stem (i.e. name without .yaml extension) of a file in data/report.
 
     With --urls-from-file, read multiple Scenario identifiers from FILE, and report each
-    one. In this usage, --output-path may only be a directory.
+    one. In this usage, --output-path may only be a directory. --jobs sets the number of
+    scenarios reported at once, each in a separate process. The time taken and status
+    for each scenario are written to report-summary.csv in the output directory.
     """
     from copy import deepcopy
 
     from message_ix_models.util._logging import mark_time
 
-    from . import report
+    from . import report, report_batch
     from .config import Config
 
     # Update the reporting configuration from command-line parameters
     context.report = Config(
-        from_file=config_file, key=key, cli_output=cli_output, _legacy=legacy
+        from_file=config_file,
+        key=key,
+        cli_output=cli_output,
+        _legacy=legacy,
+        persist=list(filter(None, persist.split(","))),
     )
 
     # Prepare a list of Context objects, each referring to one Scenario.
@@ -89,8 +110,21 @@ def cli(context, config_file, legacy, cli_output, key, **kwargs):
         ctx.scenario_info = dict(si)
         contexts.append(ctx)
 
-    for ctx in contexts:
+    if len(contexts) == 1:
+        mark_time()
+        report(contexts[0])
         mark_time()
-        report(ctx)
+        return
 
+    summary = report_batch(contexts, max_workers=max_workers)
     mark_time()
+
+    # Write the summary
+    context.report.mkdir()
+    path = context.report.output_dir.joinpath("report-summary.csv")
+    summary.to_csv(path, index=False)
+    log.info(f"Summary written to {path}:\n{summary.to_string()}")
+
+    failed = (summary["status"] != "ok").sum()
+    if failed:
+        raise click.ClickException(f"Reporting failed for {failed} of {len(summary)}")
@@ -1,10 +1,13 @@
 """Compatibility code that emulates legacy reporting."""
 
+import ast
 import logging
-from functools import partial
+import operator
+from functools import lru_cache, partial, reduce
 from itertools import chain, count
-from typing import TYPE_CHECKING, Any, Dict, List, Mapping, Optional
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
 
+import pandas as pd
 from genno import Key, Quantity, quote
 from genno.core.key import iter_keys, single_key
 
@@ -213,39 +216,200 @@ def prepare_techs(c: "Computer", technologies: List["Code"]) -> None:
     - If the expression evaluates to :obj:`True`, add it to a list in `c` at "t::{key}".
 
     These lists of technologies can be used directly or retrieve with :func:`get_techs`.
+
+    Each `expr` is applied to all `technologies` at once, using :func:`_filter_table`.
+    The lists are cached for each distinct combination of `technologies` (IDs and
+    annotations) and :data:`TECH_FILTERS`.
     """
-    result: Mapping[str, List[str]] = {k: list() for k in TECH_FILTERS}
+    # Assemble information about each technology from its annotations
+    rows = []
+    for t in technologies:
+        try:
+            input_ = str(t.get_annotation(id="input").text)
+        except KeyError:
+            input_ = None
+        rows.append((t.id, str(t.get_annotation(id="sector").text), input_))
 
-    warned = set()  # Filters that raise some kind of Exception
+    result = _filter_techs(tuple(rows), tuple(TECH_FILTERS.items()))
 
-    # Iterate over technologies
-    for t in technologies:
-        # Assemble information about `t` from its annotations
-        info: Dict[str, Any] = dict(id=t.id)
-        # Sector
-        info["sector"] = str(t.get_annotation(id="sector").text)
+    # Add keys like "t::trp gas" corresponding to TECH_FILTERS["trp gas"]
+    for k, v in result.items():
+        c.add(f"t::{k}", quote(list(v)))
+
+
+@lru_cache()
+def _filter_techs(
+    rows: Tuple[Tuple[str, str, Optional[str]], ...],
+    filters: Tuple[Tuple[str, str], ...],
+) -> Dict[str, Tuple[str, ...]]:
+    """Apply `filters` to technology information in `rows`.
+
+    Returns a sorted tuple of technology IDs for each key in `filters`.
+    """
+
+    def _input(value: Optional[str]) -> Tuple[Optional[str], Optional[str]]:
+        # Same as Code.eval_annotation("input"), followed by unpacking
         try:
-            # Input commodity and level
-            info["c_in"], info["l_in"] = t.eval_annotation("input")
-        except (TypeError, ValueError):
-            info["c_in"] = info["l_in"] = None
+            c_in, l_in = eval(value, {})  # type: ignore [arg-type]
+        except Exception:
+            return None, None
+        return c_in, l_in
+
+    # Table with one row per technology and one column per variable in the filters
+    df = pd.DataFrame(
+        [(id_, sector, *_input(input_)) for id_, sector, input_ in rows],
+        columns=["id", "sector", "c_in", "l_in"],
+        dtype=object,
+    )
 
-        # Iterate over keys and respective filters
-        for key, expr in TECH_FILTERS.items():
+    result = {}
+    for key, expr in filters:
+        try:
+            mask = _filter_table(df, expr)
+        except Exception as e:
+            log.warning(f"{e!r} when evaluating {expr!r}")
+            mask = pd.Series(False, index=df.index)
+        result[key] = tuple(sorted(df["id"][mask]))
+
+    return result
+
+
+def _filter_table(df: pd.DataFrame, expr: str) -> pd.Series:
+    """Evaluate the filter `expr` for all rows of `df` at once.
+
+    `expr` is parsed, and each supported Python construct is replaced with the
+    equivalent operation on columns of `df`:
+
+    - Names: columns of `df`.
+    - Constants, such as strings or :obj:`False`, and lists of constants.
+    - Comparisons with ``==``, ``!=``, ``in``, and ``not in``. ``in`` has the Python
+      meaning: `x in 'secondary final'` is true if the value of `x` is a substring.
+    - ``and``, ``or``, ``not``, applied to booleans, such as the results of
+      comparisons.
+
+    Expressions with other constructs—or where the vectorized operation could differ
+    from Python, for instance ``not`` applied to a column of strings, or ``==`` with
+    :obj:`None` or a list—are :func:`eval`'d for each row of `df` in turn, as in
+    previous versions of :func:`prepare_techs`. Rows for which this raises an exception
+    are :obj:`False`; the first such exception is logged as a warning.
+
+    Returns
+    -------
+    pandas.Series of bool
+        :obj:`True` where `expr` evaluates to :obj:`True`.
+    """
+    tree = ast.parse(expr.strip(), mode="eval")
+
+    try:
+        result = _eval_node(tree.body, df)
+    except NotImplementedError:
+        # Unsupported construct → evaluate row by row
+        code = compile(tree, "<filter>", "eval")
+        values, error = [], None
+        for info in df.to_dict(orient="records"):
             try:
-                # Apply the filter to the `info` about `t`
-                if eval(expr, None, info) is True:
-                    # Filter evaluates to True → add `t` to the list of labels for `key`
-                    result[key].append(t.id)
+                values.append(eval(code, None, info) is True)
             except Exception as e:
-                # Warn about this filter, only once
-                if expr not in warned:
-                    log.warning(f"{e!r} when evaluating {expr!r}")
-                    warned.add(expr)
+                values.append(False)
+                error = error or e  # Keep only the first exception
+        if error is not None:
+            # Warn about this filter, only once
+            log.warning(f"{error!r} when evaluating {expr!r}")
+        return pd.Series(values, index=df.index, dtype=bool)
 
-    # Add keys like "t::trp gas" corresponding to TECH_FILTERS["trp gas"]
-    for k, v in result.items():
-        c.add(f"t::{k}", quote(sorted(v)))
+    return _as_bool(result, df)
+
+
+def _eval_node(node: ast.AST, df: pd.DataFrame):
+    """Evaluate `node` of a filter expression on `df`; see :func:`_filter_table`."""
+    if isinstance(node, ast.Name):
+        try:
+            return df[node.id]
+        except KeyError:
+            raise NameError(f"name {node.id!r} is not defined") from None
+    elif isinstance(node, ast.Constant):
+        return node.value
+    elif isinstance(node, (ast.List, ast.Tuple)) and all(
+        isinstance(e, ast.Constant) for e in node.elts
+    ):
+        return [e.value for e in node.elts]  # type: ignore [attr-defined]
+    elif isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.Not):
+        return _not(_bool(_eval_node(node.operand, df)))
+    elif isinstance(node, ast.BoolOp):
+        values = [_bool(_eval_node(v, df)) for v in node.values]
+        op = operator.and_ if isinstance(node.op, ast.And) else operator.or_
+        return reduce(op, values)
+    elif (
+        isinstance(node, ast.Compare)
+        and len(node.ops) == 1
+        and type(node.ops[0]) in _COMPARE
+    ):
+        a, b = _eval_node(node.left, df), _eval_node(node.comparators[0], df)
+        if isinstance(node.ops[0], (ast.Eq, ast.NotEq)) and any(
+            v is None or isinstance(v, list) for v in (a, b)
+        ):
+            # pandas compares element-wise with a list, and never equal to None
+            raise NotImplementedError(ast.dump(node))
+        return _COMPARE[type(node.ops[0])](a, b)
+
+    raise NotImplementedError(ast.dump(node))
+
+
+#: Vectorized equivalents of comparison operators, for :func:`_eval_node`.
+_COMPARE = {
+    ast.Eq: operator.eq,
+    ast.NotEq: operator.ne,
+    ast.In: lambda a, b: _contains(b, a),
+    ast.NotIn: lambda a, b: _not(_contains(b, a)),
+}
+
+
+def _as_bool(value, df: pd.DataFrame):
+    """Broadcast a scalar `value`, or mark non-:class:`bool` elements as False."""
+    if isinstance(value, pd.Series):
+        return value.map(lambda v: v is True) if value.dtype != bool else value
+    return pd.Series(value is True, index=df.index)
+
+
+def _bool(value):
+    """Return `value` if it is a :class:`bool` or a boolean :class:`pandas.Series`.
+
+    Otherwise, raise :class:`NotImplementedError`: Python's ``and``, ``or``, and
+    ``not`` use the truth value of other objects, which the vectorized operations do
+    not.
+    """
+    if isinstance(value, bool) or (
+        isinstance(value, pd.Series) and value.dtype == bool
+    ):
+        return value
+    raise NotImplementedError(f"non-boolean operand {value!r}")
+
+
+def _not(value):
+    return ~value if isinstance(value, pd.Series) else not value
+
+
+def _contains(container, item):
+    """Vectorized equivalent of :py:`item in container`.
+
+    Elements for which the Python operation would raise an exception, for instance
+    :py:`None in "foo"`, give :obj:`False`.
+    """
+    if isinstance(item, pd.Series) and isinstance(container, pd.Series):
+        raise NotImplementedError
+    elif isinstance(item, pd.Series):
+        return item.map(lambda v: _safe_contains(container, v)).astype(bool)
+    elif isinstance(container, pd.Series):
+        return container.map(lambda v: _safe_contains(v, item)).astype(bool)
+    else:
+        return item in container
+
+
+def _safe_contains(container, item) -> bool:
+    try:
+        return item in container
+    except TypeError:
+        return False
 
 
 def assert_dims(c: "Computer", *keys: Key):
@@ -1,7 +1,7 @@
 import logging
 from dataclasses import InitVar, dataclass, field
 from pathlib import Path
-from typing import TYPE_CHECKING, Dict, Optional, Union
+from typing import TYPE_CHECKING, Dict, List, Optional, Union
 
 from message_ix_models.util import local_data_path, package_data_path
 from message_ix_models.util.config import ConfigHelper
@@ -44,6 +44,20 @@ class Config(ConfigHelper):
     #: name.
     use_scenario_path: bool = True
 
+    #: Number of worker processes to generate plots for the key "plot all"; :any:`None`
+    #: to use the number of CPUs. The default, 1, generates the plots in the current
+    #: process. See :func:`.plot.callback`.
+    plot_max_workers: Optional[int] = 1
+
+    #: Names or keys of quantities to store after they are computed, and load when
+    #: reporting the same scenario again with :func:`.prepare_reporter`, for instance
+    #: :py:`["ACT", "CAP", "in", "out"]`. See :func:`.report.util.persist`.
+    persist: List["KeyLike"] = field(default_factory=list)
+
+    #: :data:`True` to reuse, in :func:`.prepare_reporter`, a :class:`.Reporter`
+    #: already prepared for a scenario with the same structure and configuration.
+    use_template: bool = False
+
     #: Keyword arguments for :func:`.report.legacy.iamc_report_hackathon.report`, plus
     #: the key "use", which should be :any:`True` if legacy reporting is to be used.
     legacy: Dict = field(default_factory=lambda: dict(use=False, merge_hist=True))
@@ -35,6 +35,7 @@ def report(
     kyoto_hist=None,
     lu_hist=None,
     verbose=False,
+    out_format="parquet",
     *,
     context: Optional[Context] = None,
 ):
@@ -43,8 +44,9 @@ def report(
     This function will run reporting for specific "tables" as specified in the
     configuration file `run_config`.
 
-    Outputs will be stored as an xlsx file in IAMC format for upload to a scenario
-    database/explorer instance.
+    Outputs will be stored in IAMC format, in a file with the format given by
+    `out_format`. Use :py:`out_format="xlsx"` for an xlsx file for upload to a
+    scenario database/explorer instance.
 
     IMPORTANT!! If extending the variable template, please ensure
     NOT to overwrite the existing file as this is used for global model
@@ -91,6 +93,10 @@ def report(
         Historic land-use GHG emissions for regions.
     verbose : str (default: False)
         Option whther to print onscreen messages.
+    out_format : str (default: "parquet")
+        Output file format; see :class:`.pp_utils.IAMCWriter`. Except for "xlsx", the
+        results of each table are written as soon as they are computed, unless
+        `merge_hist` is used.
     context : .Context
         Only the ``dry_run`` setting is respected. If :data:`True`, configuration is
         read, but nothing is done.
@@ -215,29 +221,7 @@ def report(
     with open(unit_yaml) as f:
         data = yaml.load(f, Loader=SafeLoader)
     global mu
-    mu = data["model_units"]
-    for i in mu:
-        try:
-            mu[i] = eval(mu[i])
-        except Exception:
-            continue
-
-    data_cf = data["conversion_factors"]
-    for u in data_cf:
-        for i in list(data_cf[u].keys()):
-            trgt = i
-            fnd = 0
-            try:
-                trgt = eval(trgt)
-                fnd = 1
-            except Exception:
-                trgt = trgt
-            if type(data_cf[u][i]) == str:
-                data_cf[u][trgt] = eval(data_cf[u][i])
-            if fnd == 1:
-                data_cf[u].pop(i)
-
-    pp_utils.unit_conversion = data_cf
+    mu = pp_utils.compile_units(data)
 
     # ------------------------
     # Compile reporting tables
@@ -275,28 +259,9 @@ def report(
                 func_dict.pop(f)
             func_dict[f] = tmp_func_dict[f]
 
-    # --------------------
-    # Run reporting tables
-    # --------------------
-
-    dfs = {}
-    for i in run_tables:
-        if run_tables[i]["active"] is True:
-            print("processing Table:", run_tables[i]["root"])
-            if (
-                "condition" in run_tables[i]
-                and eval(run_tables[i]["condition"]) is True
-            ):
-                continue
-            dfs[i] = (
-                func_dict[run_tables[i]["function"]]()
-                if "args" not in run_tables[i]
-                else func_dict[run_tables[i]["function"]](**run_tables[i]["args"])
-            )
-
-    # ---------------------------------
-    # Convert dataframes to IAMC-format
-    # ---------------------------------
+    # ---------------------------------------------------
+    # Run reporting tables and convert to IAMC-format
+    # ---------------------------------------------------
 
     mapping = pd.read_csv(aggr_def)
     allowed_var = pd.read_csv(var_def)["Variable"].unique().tolist()
@@ -327,43 +292,73 @@ def report(
             index=iamc_index, columns="year", values="value"
         ).reset_index()
 
-    for i in dfs:
-        if merge_ts:
-            # Filter out timeseries entries which exist for a certain variable
-            var = config["run_tables"][i]["root"]
-            tmp = ts[ts.Variable.str.find(var) >= 0]
-            tmp.Variable = tmp.Variable.str.replace(f"{var}|".replace("|", "\|"), "")
-            if not tmp.empty:
-                dfs[i] = (
-                    tmp.set_index(iamc_index)
-                    .combine_first(dfs[i].set_index(iamc_index))
-                    .reset_index()
-                )
+    if not out_dir:
+        out_dir = package_data_path("report", "legacy", "reporting_output")
+    else:
+        out_dir = Path(out_dir)
+    if not out_dir.exists():
+        out_dir.mkdir()
 
-            # Remove newly added timeseries from ts dataframe, to avoid double counting
-            ts = ts[ts.Variable.str.find(var) < 0]
+    with pp_utils.IAMCWriter(out_dir / f"{model_nm}_{scen_nm}", out_format) as writer:
+        for i in run_tables:
+            if run_tables[i]["active"] is not True:
+                continue
+            print("processing Table:", run_tables[i]["root"])
+            if (
+                "condition" in run_tables[i]
+                and eval(run_tables[i]["condition"]) is True
+            ):
+                continue
+            tmp_df = (
+                func_dict[run_tables[i]["function"]]()
+                if "args" not in run_tables[i]
+                else func_dict[run_tables[i]["function"]](**run_tables[i]["args"])
+            )
 
-        if run_tables[i]["root"] == "Emissions|HFC":
-            df.append(
-                pp_utils.iamc_it(dfs[i], run_tables[i]["root"], mapping, rm_totals=True)
+            if merge_ts:
+                # Filter out timeseries entries which exist for a certain variable
+                var = config["run_tables"][i]["root"]
+                tmp = ts[ts.Variable.str.find(var) >= 0]
+                tmp.Variable = tmp.Variable.str.replace(
+                    f"{var}|".replace("|", "\\|"), ""
+                )
+                if not tmp.empty:
+                    tmp_df = (
+                        tmp.set_index(iamc_index)
+                        .combine_first(tmp_df.set_index(iamc_index))
+                        .reset_index()
+                    )
+
+                # Remove newly added timeseries from ts dataframe, to avoid double
+                # counting
+                ts = ts[ts.Variable.str.find(var) < 0]
+
+            tmp_df = pp_utils.iamc_it(
+                tmp_df,
+                run_tables[i]["root"],
+                mapping,
+                rm_totals=run_tables[i]["root"] == "Emissions|HFC",
             )
-        else:
-            df.append(pp_utils.iamc_it(dfs[i], run_tables[i]["root"], mapping))
-    df = pd.concat(df, sort=True)
 
-    # --------------
-    # Process output
-    # --------------
+            # Ensure that only variables included in the template are included
+            # in the final output
+            tmp_df = tmp_df.loc[tmp_df.Variable.isin(allowed_var)]
+
+            if merge_hist:
+                df.append(tmp_df)
+            else:
+                # Write the results of this table
+                writer.write(tmp_df)
 
-    # Ensure that only variables included in the template are included
-    # in the final output
-    df = df.loc[df.Variable.isin(allowed_var)]
+        if not merge_hist:
+            return
 
-    # -------------------------------
-    # Merge with historical TS values
-    # -------------------------------
+        df = pd.concat(df, sort=True)
+
+        # -------------------------------
+        # Merge with historical TS values
+        # -------------------------------
 
-    if merge_hist:
         ix_upload = df.reset_index()
         ix_upload = ix_upload.drop(["index", "Model", "Scenario"], axis=1)
         ix_upload = ix_upload.rename(
@@ -414,10 +409,4 @@ def report(
         if "subannual" in df.columns:
             df = df.drop("subannual", axis=1)
 
-    if not out_dir:
-        out_dir = package_data_path("report", "legacy", "reporting_output")
-    else:
-        out_dir = Path(out_dir)
-    if not out_dir.exists():
-        out_dir.mkdir()
-    pp_utils.write_xlsx(df, out_dir)
+        writer.write(df)
@@ -5,6 +5,7 @@ import itertools
 import os
 import sys
 from functools import cmp_to_key
+from typing import Dict, Tuple
 
 import numpy as np
 import pandas as pd
@@ -26,6 +27,9 @@ globalname = None
 model_nm = None
 scen_nm = None
 unit_conversion = None
+unit_factors = None
+#: Cache of values from fil files; see :func:`load_fil`.
+fil_data: Dict[Tuple, pd.DataFrame] = {}
 
 #  IAMC index
 iamc_idx = ["Model", "Scenario", "Region", "Variable", "Unit"]
@@ -53,46 +57,72 @@ def combineDict(*args):
     return result
 
 
-def fil(df, fil, factor, unit_out=None):
-    """Uses predefined values from a fil file"""
+def _interpolate_years(df, years):
+    """Adds columns for `years` to `df` and interpolates missing values."""
+    cols = sorted(set(df.columns) | set(years))
+    return df.reindex(columns=cols).interpolate(method="index", axis=1)
+
+
+def load_fil(fil):
+    """Loads predefined values from all regional fil files named `fil`.
+
+    The files are read once for each combination of `fil`, :data:`regions` and
+    :data:`all_years`, and cached in :data:`fil_data`.
+
+    Returns
+    -------
+    pandas.DataFrame
+        with index levels "Region" and "Variable", and one column per year. Years of
+        the model horizon are interpolated from those in the fil files.
+    """
+    key = (
+        fil,
+        region_id,
+        tuple(regions.items()),
+        tuple(sorted(set(all_years or []) | set(years or []))),
+    )
+    if key in fil_data:
+        return fil_data[key]
+
     inf = os.path.join(
         package_data_path(), "report", "legacy", "fil_files", "*-{}.fil".format(fil)
     )
-    files = glob.glob(inf)
     dfs = []
-    for f in files:
+    for f in glob.glob(inf):
         reg = os.path.basename(f).split("-")[0]
         # Ensure that fil-files are only read for regions contained in the scenario.
-        if reg in [regions[r] for r in regions.keys()]:
-            dftmp = pd.read_csv(f)
-            dftmp["Region"] = reg
-            dfs.append(dftmp)
+        if reg in regions.values():
+            dfs.append(pd.read_csv(f).assign(Region=reg))
     df_fil = pd.concat(dfs, sort=True)
     df_fil.Region = df_fil.Region.map(
         {item[0].replace(f"{region_id}_", ""): item[1] for item in regions.items()}
     )
-    df_fil = df_fil.set_index(["Region"])
-    df_fil = df_fil[df_fil.Variable == factor].drop("Variable", axis=1)
-    for cols in numcols(df_fil):
-        df_fil = df_fil.rename(columns={cols: int(cols)})
-    # Add missing years to fil file dataframe
-    missyrs = [y for y in df.columns if y not in df_fil.columns]
-    for y in missyrs:
-        df_fil[y] = np.nan
-    df_fil = df_fil[sorted(df_fil.columns)]
-
-    # Interpolate missing years
-    for reg in df_fil.index:
-        df_fil.loc[reg] = df_fil.loc[reg].interpolate(method="index")
+    df_fil = df_fil.set_index(["Region", "Variable"])
+    df_fil.columns = df_fil.columns.astype(int)
+
+    result = _interpolate_years(df_fil, key[-1]).sort_index()
+    # Years for which values are given in the fil files
+    result.attrs["fil_years"] = df_fil.columns.tolist()
+
+    fil_data[key] = result
+    return result
+
+
+def fil(df, fil, factor, unit_out=None):
+    """Uses predefined values from a fil file"""
+    data = load_fil(fil)
+
+    # Same columns as if the fil file values were interpolated onto `df`
+    cols = sorted(set(data.attrs["fil_years"]) | set(df.columns))
+    if set(cols) - set(data.columns):
+        data = _interpolate_years(data, cols)
+    df_fil = data.xs(factor, level="Variable")[cols]
 
     df = df_fil.fillna(0) * df.fillna(0)
-    df["Unit"] = "???"
     if unit_out:
-        for col in numcols(df):
-            df[col] = df.apply(
-                lambda row: row[col] * unit_conversion[row.Unit][unit_out], axis=1
-            )
-    df = df.drop("Unit", axis=1)
+        # All values have the unit "???"
+        cols = numcols(df)
+        df[cols] = df[cols] * unit_conversion["???"][unit_out]
     return df.sort_index()
 
 
@@ -292,6 +322,47 @@ def diff(l1, l2):
     return vals
 
 
+def compile_units(data):
+    """Compiles unit conversion factors.
+
+    Sets :data:`unit_conversion`, a mapping from input unit to output unit to
+    conversion factor, and :data:`unit_factors`, the same factors as a dataframe with
+    one row per input unit and one column per output unit.
+
+    Parameters
+    ----------
+    data : dict
+        contents of a unit YAML file, with keys "model_units" and
+        "conversion_factors". String values are evaluated as Python expressions; those
+        in "conversion_factors" may refer to model units as ``mu["name"]``.
+
+    Returns
+    -------
+    mu : dict
+        model units
+    """
+    global unit_conversion, unit_factors
+
+    def _eval(value, namespace):
+        try:
+            return eval(value, namespace) if isinstance(value, str) else value
+        except Exception:
+            return value
+
+    mu = {k: _eval(v, {}) for k, v in data["model_units"].items()}
+
+    namespace = {"mu": mu}
+    unit_conversion = {
+        u: {_eval(k, namespace): _eval(v, namespace) for k, v in factors.items()}
+        for u, factors in data["conversion_factors"].items()
+    }
+    unit_factors = pd.DataFrame.from_dict(unit_conversion, orient="index").astype(
+        float
+    )
+
+    return mu
+
+
 def _convert_units(df, unit_out):
     """Converts and renames units.
 
@@ -311,14 +382,18 @@ def _convert_units(df, unit_out):
 
     cols = [c for c in numcols(df) if c != "Vintage"]
     if cols:
-        try:
-            df[cols] = df[cols].multiply(
-                df["Unit"].apply(lambda x: unit_conversion[x][unit_out]), axis=0
-            )
-        except Exception:
+        # Look up the factor for each distinct unit in `unit_factors`
+        factor = df["Unit"].map(
+            unit_factors[unit_out]
+            if unit_out in unit_factors.columns
+            else pd.Series(dtype=float)
+        )
+        if factor.isna().any():
             print(
                 f"No unit conversion factor found to convert {df['Unit'].unique()[0]} to {unit_out}"
             )
+        else:
+            df[cols] = df[cols].multiply(factor, axis=0)
     df.Unit = unit_out
 
     return df.sort_index()
@@ -366,11 +441,128 @@ def write_xlsx(df, path):
 
     """
 
-    out_path = path / f"{model_nm}_{scen_nm}.xlsx"
+    _write_xlsx(df, path / f"{model_nm}_{scen_nm}.xlsx")
+
+
+def _write_xlsx(df, out_path):
     with pd.ExcelWriter(out_path, engine="xlsxwriter") as writer:
         df.to_excel(writer, sheet_name="data", index=False)
 
 
+#: Output formats supported by :class:`IAMCWriter`, and corresponding file suffixes.
+OUT_FORMAT = {
+    "arrow": ".arrows",
+    "csv": ".csv.gz",
+    "parquet": ".parquet",
+    "xlsx": ".xlsx",
+}
+
+
+class IAMCWriter:
+    """Writes IAMC-format results to a file, one dataframe at a time.
+
+    For all formats except "xlsx", the data are converted to "long" layout with the
+    columns :data:`iamc_idx`, "Year" (integer), and "Value" (float), omitting missing
+    values. Each dataframe passed to :meth:`write` is appended to the file immediately.
+    In "parquet" and "arrow" (Arrow IPC stream) files, the :data:`iamc_idx` columns
+    are dictionary-encoded, i.e. read as :class:`pandas.Categorical`.
+
+    For "xlsx", the dataframes are collected in "wide" layout and written by
+    :meth:`close`, as by :func:`write_xlsx`.
+
+    Use as a context manager:
+
+    .. code-block:: python
+
+       with IAMCWriter(out_dir / "model_scenario", "parquet") as writer:
+           for df in ...:
+               writer.write(df)
+
+    Parameters
+    ----------
+    path : pathlib.Path
+        path to the output file, without suffix; the suffix is given by
+        :data:`OUT_FORMAT`.
+    fmt : string (optional, default = "parquet")
+        one of the keys of :data:`OUT_FORMAT`.
+    """
+
+    def __init__(self, path, fmt="parquet"):
+        import pyarrow as pa
+
+        if fmt not in OUT_FORMAT:
+            raise ValueError(f"fmt={fmt!r}; expected one of {list(OUT_FORMAT)}")
+
+        self.fmt = fmt
+        self.path = path.with_name(path.name + OUT_FORMAT[fmt])
+        self.schema = pa.schema(
+            [(c, pa.dictionary(pa.int32(), pa.string())) for c in iamc_idx]
+            + [("Year", pa.int32()), ("Value", pa.float64())]
+        )
+        self._file = None
+        self._dfs = []
+
+    def __enter__(self):
+        import gzip
+
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        if self.fmt == "arrow":
+            self._file = pa.ipc.new_stream(str(self.path), self.schema)
+        elif self.fmt == "csv":
+            self._file = gzip.open(self.path, "wt", newline="")
+            self._file.write(",".join(self.schema.names) + "\n")
+        elif self.fmt == "parquet":
+            self._file = pq.ParquetWriter(self.path, self.schema)
+
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def write(self, df):
+        """Write or, for "xlsx", collect `df`.
+
+        Parameters
+        ----------
+        df : dataframe
+            in "wide" IAMC format, with the columns :data:`iamc_idx` and one column for
+            each year.
+        """
+        import pyarrow as pa
+
+        if self.fmt == "xlsx":
+            self._dfs.append(df)
+            return
+
+        # Convert to long layout with typed columns
+        years = [c for c in df.columns if str(c).isdigit()]
+        data = (
+            df.melt(id_vars=iamc_idx, value_vars=years, var_name="Year")
+            .dropna(subset=["value"])
+            .astype({c: "category" for c in iamc_idx} | {"Year": int, "value": float})
+            .rename(columns={"value": "Value"})
+        )
+
+        if self.fmt == "csv":
+            data.to_csv(self._file, header=False, index=False)
+        else:
+            self._file.write_table(
+                pa.Table.from_pandas(data, preserve_index=False).cast(self.schema)
+            )
+
+    def close(self):
+        """Finish writing the file."""
+        if self.fmt == "xlsx":
+            if self._dfs:
+                _write_xlsx(pd.concat(self._dfs, sort=True), self.path)
+            self._dfs = []
+        elif self._file is not None:
+            self._file.close()
+            self._file = None
+
+
 def make_outputdf(vars, units, param="sum", glb=True, weighted_by=None):
     """Data is reformatted to the iamc-template output
 
@@ -1219,6 +1411,55 @@ def _retr_act_data(ds, ix, param, filter, units, convert=1):
     return df.sort_index()
 
 
+def _fill_vintage(df):
+    """Selects one vintage for each activity year.
+
+    Returns the rows of `df` where "year_act" == "year_vtg". For activity years
+    without such a row, the rows with the latest "year_vtg" are added, with
+    "year_vtg" set to "year_act". This is done for each region and technology, as
+    more than one technology may be in a dataframe and these have differing
+    lifetimes.
+
+    Parameters
+    ----------
+    df : dataframe
+        with columns "node_loc", "technology", "year_act" and "year_vtg"
+
+    Returns
+    -------
+    df : dataframe
+        with a :class:`~pandas.RangeIndex`
+    """
+    key = ["node_loc", "technology", "year_act"]
+    df = df.reset_index(drop=True)
+    diag = df.year_act == df.year_vtg
+
+    # Activity years with a row where year_act == year_vtg
+    found = pd.MultiIndex.from_frame(
+        df.loc[diag, key[:-1] + ["year_vtg"]].set_axis(key, axis=1)
+    )
+    miss = df[~pd.MultiIndex.from_frame(df[key]).isin(found)]
+
+    # Rows with the latest vintage for each missing activity year
+    latest = miss.groupby(key, sort=False).year_vtg.transform("max")
+    fill = miss[miss.year_vtg == latest]
+
+    # Order by region, technology, and activity year, each in order of appearance
+    order = pd.DataFrame(
+        {
+            i: pd.factorize(pd.MultiIndex.from_frame(df[key[: i + 1]]))[0]
+            for i in range(3)
+        }
+    )
+    fill = fill.loc[order.loc[fill.index].sort_values([0, 1, 2], kind="stable").index]
+
+    if fill.empty:
+        return df[diag].reset_index(drop=True)
+    return pd.concat(
+        [df[diag], fill.assign(year_vtg=fill.year_act)], sort=True, ignore_index=True
+    )
+
+
 def _retr_io_data(ds, ix, param, filter, formatting="standard"):
     """Retrieves commodity - input or commodity - output coefficients for a
     single or set of technolgies.
@@ -1271,30 +1512,9 @@ def _retr_io_data(ds, ix, param, filter, formatting="standard"):
             group = ["node_loc", "technology", "unit", "year_act", "year_vtg", "mode"]
 
         else:
-            # Filter out all entries where year_act == year_vtg
-            tmp = df[df.year_act == df.year_vtg]
-            # Fill years where year_act is greater than the latest
-            # year_vtg. This must be done for each region and technology
-            # as more than one technology may be in a datframe and these have
-            # differing lifetimes.
-            for reg in df.node_loc.unique():
-                for t in df[df.node_loc == reg].technology.unique():
-                    tmp_df = df[(df.node_loc == reg) & (df.technology == t)]
-                    yr_miss = [
-                        y
-                        for y in tmp_df.year_act.unique()
-                        if y
-                        not in tmp[
-                            (tmp.node_loc == reg) & (tmp.technology == t)
-                        ].year_vtg.unique()
-                    ]
-                    tmp_df = tmp_df[tmp_df.year_act.isin(yr_miss)]
-                    for y in yr_miss:
-                        tmp_df2 = tmp_df[tmp_df.year_act == y]
-                        tmp_df2 = tmp_df2[tmp_df2.year_vtg == tmp_df2.year_vtg.max()]
-                        tmp_df2.year_vtg = tmp_df2.year_act
-                        tmp = pd.concat([tmp, tmp_df2], sort=True)
-            tmp = tmp.reset_index().drop("index", axis=1)
+            # Filter out all entries where year_act == year_vtg, and fill years
+            # where year_act is greater than the latest year_vtg.
+            tmp = _fill_vintage(df)
 
             df = tmp
             if param == "input":
@@ -7,7 +7,7 @@ The current set functions on time series data stored on the scenario by
 import logging
 import re
 from datetime import datetime
-from typing import TYPE_CHECKING, List, Optional, Sequence
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence, Set, Union
 
 import genno.compat.plotnine
 import pandas as pd
@@ -27,9 +27,12 @@ __all__ = [
     "FinalEnergy0",
     "FinalEnergy1",
     "Plot",
+    "PlotData",
     "PrimaryEnergy0",
     "PrimaryEnergy1",
     "callback",
+    "render",
+    "select_ts",
 ]
 
 log = logging.getLogger(__name__)
@@ -49,6 +52,9 @@ class Plot(genno.compat.plotnine.Plot):
 
     …that is, giving "scenario" or another key that points to a :class:`.Scenario`
     object with stored time series data. See the examples in this file.
+
+    The time series data for all plots added for the same scenario key are retrieved
+    once, by a shared :class:`PlotData` task.
     """
 
     #: 'Static' geoms: list of plotnine objects that are not dynamic.
@@ -71,8 +77,7 @@ class Plot(genno.compat.plotnine.Plot):
     inputs: Sequence[str] = []
 
     #: List of regular expressions corresponding to :attr:`inputs`. These are passed as
-    #: the `expr` argument to :func:`.filter_ts` to filter the entire set of time series
-    #: data.
+    #: the `expr` argument to :func:`select_ts` to select from the time series data.
     inputs_regex: List[re.Pattern] = []
 
     @classmethod
@@ -84,21 +89,27 @@ class Plot(genno.compat.plotnine.Plot):
 
         scenario_key = inputs[0]
 
-        # Retrieve all time series data, for advanced filtering
-        all_data = Key(scenario_key) + "iamc"
-        c.add(all_data, "get_ts", scenario_key)
+        # Retrieve time series data once for all plots
+        all_data = Key(scenario_key) + "plot"
+        if all_data not in c.graph or not isinstance(c.graph[all_data][0], PlotData):
+            c.add(all_data, PlotData(), scenario_key)
+        plot_data: PlotData = c.graph[all_data][0]
 
         if len(cls.inputs_regex):
             # Iterate over matched items from `inputs` and `inputs_regex`
             for k, expr in zip_longest(cls.inputs, cls.inputs_regex):
                 if expr is None:
                     break
-                # Filter the data given by `expr` from all::iamc
-                c.add(k, "filter_ts", all_data, copy(expr))
+                # Select the data given by `expr`
+                plot_data.exprs.append(expr)
+                c.add(k, select_ts, all_data, copy(expr))
         else:
             for k in map(Key, cls.inputs):
-                # Add a computation to get the time series data for a specific variable
-                c.add(k, "get_ts", scenario_key, dict(variable=k.name))
+                if k == Key(scenario_key):
+                    continue
+                # Select the time series data for a specific variable
+                plot_data.names.add(k.name)
+                c.add(k, select_ts, all_data, k.name)
 
         # Add the plot itself
         return super().add_tasks(c, key, *inputs[1:], strict=strict)
@@ -212,6 +223,68 @@ class PrimaryEnergy1(FinalEnergy1):
     inputs_regex = [re.compile(rf"Primary Energy\|((?!{'|'.join(_omit)})[^\|]*)")]
 
 
+class PlotData:
+    """Retrieve time series data for all :class:`Plot` added to a :class:`.Computer`.
+
+    :meth:`Plot.add_tasks` adds the variable names and :attr:`.Plot.inputs_regex` of
+    each plot to a single instance. When called, this retrieves the time series data
+    from a scenario once, keeps only the variables needed by any of the plots, and
+    indexes the result by variable name for :func:`select_ts`.
+
+    If no plot uses :attr:`.Plot.inputs_regex`, only the named variables are retrieved.
+    """
+
+    def __init__(self) -> None:
+        #: Exact variable names.
+        self.names: Set[str] = set()
+        #: Regular expressions matching variable names.
+        self.exprs: List[re.Pattern] = []
+
+    def __call__(self, scenario: "Scenario") -> pd.DataFrame:
+        from .operator import get_ts
+
+        # The ixmp API supports filtering on exact variable names only
+        filters = {} if self.exprs else dict(variable=sorted(self.names))
+        data = get_ts(scenario, filters)
+
+        # Match each distinct variable name once
+        keep = [
+            v
+            for v in data["variable"].unique()
+            if v in self.names or any(e.fullmatch(v) for e in self.exprs)
+        ]
+        log.info(f"{len(keep)} variables for plots")
+
+        return (
+            data[data["variable"].isin(keep)]
+            .set_index("variable", drop=False)
+            .sort_index()
+        )
+
+
+def select_ts(data: pd.DataFrame, expr: Union[re.Pattern, str]) -> pd.DataFrame:
+    """Select time series data from the result of :class:`PlotData`.
+
+    If `expr` is a string, select the data for the variable with exactly this name.
+    Otherwise, same as :func:`.filter_ts`: keep the data for variables for which `expr`
+    is a full match, and retain only the first match group from `expr` as the
+    "variable" entry.
+    """
+    names = data.index.unique()
+
+    if isinstance(expr, str):
+        return data.loc[[expr] if expr in names else []].reset_index(drop=True)
+
+    # Match each distinct variable name once
+    variable = {v: m.group(1) for v in names if (m := expr.fullmatch(v))}
+
+    return (
+        data.loc[list(variable)]
+        .reset_index(drop=True)
+        .assign(variable=lambda df: df["variable"].map(variable))
+    )
+
+
 #: All plot classes.
 PLOTS = (
     EmissionsCO2,
@@ -225,8 +298,78 @@ PLOTS = (
 def callback(c: Computer, context: "Context") -> None:
     """Add all :data:`PLOTS` to `c`.
 
-    Also add a key "plot all" to triggers the generation of all plots.
+    Also add a key "plot all" to triggers the generation of all plots. If
+    :attr:`.report.Config.plot_max_workers` is not 1, this uses :func:`render` to
+    generate the plots in parallel processes.
     """
+    from functools import partial
+
     all_keys = [c.add(f"plot {p.basename}", p, "scenario") for p in PLOTS]
-    c.add("plot all", all_keys)
+
+    max_workers = context.report.plot_max_workers
+    if max_workers == 1:
+        c.add("plot all", all_keys)
+    else:
+        # Render in worker processes, using the same inputs as the individual plots
+        task = partial(render, plots=PLOTS, max_workers=max_workers)
+        c.add("plot all", task, "config", *[list(p.inputs) for p in PLOTS])
+
     log.info(f"Add 'plot all' collecting {len(all_keys)} plots")
+
+
+def _save(cls: type, config: Dict, *args) -> Any:
+    """Generate and save a plot of `cls` in a worker process."""
+    return cls().save(config, *args)
+
+
+def _picklable(value: Any) -> Any:
+    """Replace :class:`message_ix.Scenario` `value` with a :class:`.ScenarioInfo`.
+
+    Plots use only the :attr:`~.ScenarioInfo.url` of the scenario, while the scenario
+    object itself cannot be passed to another process.
+    """
+    from message_ix import Scenario
+
+    from message_ix_models import ScenarioInfo
+
+    return ScenarioInfo(value, empty=True) if isinstance(value, Scenario) else value
+
+
+def render(
+    config: Dict,
+    *args: List[Any],
+    plots: Sequence[type],
+    max_workers: Optional[int] = None,
+) -> List[Any]:
+    """Generate and save `plots` in parallel worker processes.
+
+    Parameters
+    ----------
+    config :
+        Configuration of the :class:`.Computer`, including "output_dir".
+    args :
+        One list for each of `plots`, containing the values of its
+        :attr:`~genno.compat.plotnine.Plot.inputs`.
+    max_workers :
+        Number of worker processes; :any:`None` to use the number of CPUs.
+
+    Returns
+    -------
+    list
+        Return values of :meth:`~genno.compat.plotnine.Plot.save`: paths to the files
+        written, or :any:`None`.
+    """
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    _config = dict(output_dir=config["output_dir"])
+
+    # Use "spawn" to not copy, for instance, a JVM used by ixmp into the workers
+    with ProcessPoolExecutor(
+        max_workers, mp_context=multiprocessing.get_context("spawn")
+    ) as executor:
+        futures = [
+            executor.submit(_save, cls, _config, *map(_picklable, values))
+            for cls, values in zip(plots, args)
+        ]
+        return [f.result() for f in futures]
@@ -12,7 +12,7 @@ import pandas as pd
 from dask.core import quote
 from genno import Key, KeyExistsError, Quantity
 from message_ix import Reporter
-from pandas.api.types import is_scalar
+from pandas.api.types import is_integer_dtype, is_scalar
 
 from message_ix_models import ScenarioInfo
 from message_ix_models.util import minimum_version
@@ -26,6 +26,7 @@ __all__ = [
     "add_simulated_solution",
     "data_from_file",
     "simulate_qty",
+    "to_arrow",
     "to_simulate",
 ]
 
@@ -99,42 +100,108 @@ def simulate_qty(
     return Quantity(df.set_index(dims)["value"] if len(dims) else df, name=name)
 
 
-def data_from_file(path: Path, *, name: str, dims: Sequence[str]) -> Quantity:
-    """Read simulated solution data for item `name` from `path`.
+#: Suffixes of files containing simulated solution data, in order of preference.
+SUFFIXES = (".arrow", ".csv.gz")
 
-    For variables and equations (`name` in upper case), the file **must** have columns
-    corresponding to `dims` followed by "Val", "Marginal", "Upper", and "Scale". The
-    "Val" column is returned.
 
-    For parameters, the file **must** have columns corresponding to `dims` followed by
-    "value" and "unit". The "value" column is returned.
+def _read_csv(path: Path, *, name: str, dims: Sequence[str]) -> pd.DataFrame:
+    """Read data for item `name` from a :file:`.csv.gz` file at `path`.
+
+    Returns a data frame with columns `dims` and "value".
     """
     if name.isupper():
         # Construct a list of the columns
         # NB Must assign the dimensions directly; they cannot be read from the file, as
         #    the column headers are the internal GAMS set names (e.g. "year_all")
         #    instead of the index names from message_ix.
-        cols = list(dims) + ["Val", "Marginal", "Lower", "Upper", "Scale"]
+        cols = list(dims) + ["value", "Marginal", "Lower", "Upper", "Scale"]
 
-        return Quantity(
-            pd.read_csv(path, engine="pyarrow")
-            .set_axis(cols, axis=1)
-            .set_index(cols[:-5])["Val"],
-            name=name,
-        )
+        return pd.read_csv(path, engine="pyarrow").set_axis(cols, axis=1)[cols[:-4]]
     else:
         cols = list(dims) + ["value", "unit"]
-        tmp = (
+        return (
             pd.read_csv(path, engine="pyarrow")
             # Drop a leading index column that appears in some files
             # TODO Adjust .snapshot.unpack() to avoid generating this column; update
             # data; then remove this call
             .drop(columns="", errors="ignore")
-            .set_axis(cols, axis=1)
-            .set_index(cols[:-2])
+            .set_axis(cols, axis=1)[cols[:-1]]
         )
-        # TODO pass units if they are unique
-        return Quantity(tmp["value"], name=name)
+
+
+def _read_arrow(path: Path, *, name: str, dims: Sequence[str]) -> pd.DataFrame:
+    """Read data for item `name` from an Arrow IPC file at `path`.
+
+    The file is memory-mapped, so it is not read into memory in full before conversion.
+    Dictionary-encoded columns are returned as :class:`pandas.Categorical`.
+    """
+    from pyarrow.feather import read_table
+
+    table = read_table(path, memory_map=True)
+    return table.to_pandas(split_blocks=True).set_axis(list(dims) + ["value"], axis=1)
+
+
+def data_from_file(path: Path, *, name: str, dims: Sequence[str]) -> Quantity:
+    """Read simulated solution data for item `name` from `path`.
+
+    If `path` has the suffix :file:`.arrow`, it **must** be an Arrow IPC (Feather V2)
+    file with columns corresponding to `dims` followed by "value", for instance as
+    written by :func:`to_arrow`.
+
+    Otherwise, for variables and equations (`name` in upper case), the file **must**
+    have columns corresponding to `dims` followed by 5 columns for the level, marginal,
+    lower bound, upper bound, and scale, in that order; the column names in the file
+    are not used. The level is returned.
+
+    For parameters, the file **must** have columns corresponding to `dims` followed by
+    "value" and "unit". The "value" column is returned.
+    """
+    func = _read_arrow if path.suffix == ".arrow" else _read_csv
+    # TODO pass units if they are unique
+    return Quantity(
+        func(path, name=name, dims=dims).set_index(list(dims))["value"], name=name
+    )
+
+
+def to_arrow(path: Path, dest: Optional[Path] = None) -> List[Path]:
+    """Convert simulated solution data in `path` to Arrow IPC files.
+
+    For every :file:`.csv.gz` file in `path` that corresponds to an item in
+    :func:`to_simulate`, an uncompressed :file:`.arrow` file is written to `dest`, with
+    dimension columns dictionary-encoded. These files can be memory-mapped by
+    :func:`data_from_file`, which is much faster than parsing the CSV files.
+
+    Parameters
+    ----------
+    dest : Path, optional
+        Directory for the output files. If not given, the same as `path`.
+
+    Returns
+    -------
+    list of Path
+        The files written.
+    """
+    from pyarrow.feather import write_feather
+
+    dest = dest or path
+    dest.mkdir(parents=True, exist_ok=True)
+
+    result = []
+    for name, item_info in to_simulate().items():
+        p = path.joinpath(f"{name}.csv.gz")
+        if not p.exists():
+            continue
+
+        dims = list(dims_of(item_info).values())
+        df = _read_csv(p, name=name, dims=dims)
+        df = df.astype({d: "category" for d in dims if not is_integer_dtype(df[d])})
+
+        result.append(dest.joinpath(f"{name}.arrow"))
+        write_feather(df, result[-1], compression="uncompressed")
+
+    log.info(f"Wrote {len(result)} files to {dest}")
+
+    return result
 
 
 @minimum_version("message_ix 3.6")
@@ -153,9 +220,10 @@ def add_simulated_solution(
         inputs that are passed to :func:`simulate_qty`.
     path : Path, optional
         If given, a path to a directory containing one or more files with names like
-        :file:`ACT.csv.gz`. These files are taken as containing "simulated" model
-        solution data for the MESSAGE variable with the same name. See
-        :func:`data_from_file`.
+        :file:`ACT.arrow` or :file:`ACT.csv.gz`. These files are taken as containing
+        "simulated" model solution data for the MESSAGE variable with the same name. If
+        both exist, the former is used. See :func:`data_from_file` and
+        :func:`to_arrow`.
     """
     from ixmp.backend import ItemType
 
@@ -181,9 +249,8 @@ def add_simulated_solution(
         # Add a task to load data from a file in `path`, if it exists
         try:
             assert path is not None
-            p = path.joinpath(name).with_suffix(".csv.gz")
-            assert p.exists()
-        except AssertionError:
+            p = next(filter(Path.exists, (path.joinpath(name + s) for s in SUFFIXES)))
+        except (AssertionError, StopIteration):
             pass  # No `path` or no such file
         else:
             # Add data from file
@@ -1,15 +1,28 @@
+import json
 import logging
-from typing import Dict, Iterable, Optional, Union
-
+import os
+import pickle
+import re
+from functools import partial
+from operator import attrgetter, itemgetter, methodcaller
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, List, Optional, Union
+
+import ixmp
 import pandas as pd
-from dask.core import quote
-from genno import Key, Quantity
+from dask.core import literal, quote
+from genno import Computer, Key, Quantity
+from genno.caching import Encoder, hash_args, hash_code
 from genno.compat.pyam.util import collapse as genno_collapse
 from genno.core.key import single_key
 from iam_units import registry
-from message_ix import Reporter
+from message_ix import Reporter, Scenario
+from sdmx.model.common import Item, ItemScheme
 from sdmx.model.v21 import Code
 
+if TYPE_CHECKING:
+    from genno.core.key import KeyLike
+
 log = logging.getLogger(__name__)
 
 
@@ -202,3 +215,217 @@ def add_replacements(dim: str, codes: Iterable[Code]) -> None:
             pass
         else:
             REPLACE_DIMS[dim][f"{code.id.title()}$"] = label
+
+
+def persist(
+    c: Computer, keys: Iterable["KeyLike"], path: Path
+) -> List[Union[Key, str]]:
+    """Store the quantities at `keys` in files under `path`, and reuse them.
+
+    For each of `keys`, a hash is computed from the task that computes the key and,
+    recursively, all the tasks it depends on. This includes the URL (and thus the
+    version) of the scenario and the objective function value of its solution, the
+    contents of sets, the configuration, and the code of operators. Then:
+
+    - If a file for the key and hash exists under `path`, the task is replaced with
+      one that loads the quantity from file. The tasks it depended on are then not
+      computed, unless they are needed for other keys.
+    - Otherwise, the task is modified to store the quantity to this file after it is
+      computed.
+
+    Thus, after reporting a scenario once, reporting it again with changed
+    configuration only computes the keys that are affected by the change.
+
+    Keys are not persisted if their tasks, or the tasks they depend on, contain an
+    object that cannot be described by its contents—for instance, an instance of a
+    class with no JSON encoding—because the stored quantity could not be told apart
+    from one computed with a different object. These keys are logged and skipped.
+
+    Parameters
+    ----------
+    keys :
+        Keys or names of quantities, for instance "ACT" or "out". Bare names are
+        expanded to the key with all dimensions using :meth:`.Computer.full_key`.
+    path :
+        Directory for stored quantities.
+
+    Returns
+    -------
+    list of Key
+        Keys that will be loaded from files.
+    """
+    # Compute all hashes before any tasks are modified
+    memo: Dict[Any, Any] = dict()
+    hashes = {}
+    for key in keys:
+        try:
+            full = c.full_key(key) if Key.bare_name(key) else c.graph.unsorted_key(key)
+        except KeyError:
+            full = None
+        if full is None:
+            log.warning(f"No key {key!r} to persist")
+            continue
+        try:
+            hashes[full] = _task_hash(c.graph, full, memo)
+        except _NotPersistable as e:
+            log.warning(f"Cannot persist {full!r}: {e}")
+
+    path.mkdir(parents=True, exist_ok=True)
+
+    result = []
+    for key, h in hashes.items():
+        task = c.graph[key]
+        file = path.joinpath(f"{Key(key).name}-{h}.pickle")
+        if file.exists():
+            c.graph[key] = (partial(_load_quantity, file),)
+            result.append(key)
+        elif isinstance(task, tuple) and callable(task[0]):
+            c.graph[key] = (partial(_store_quantity, file, task[0]),) + task[1:]
+
+    log.info(f"Load {len(result)} of {len(hashes)} persisted quantities from {path}")
+
+    return result
+
+
+def _load_quantity(path: Path) -> Quantity:
+    with open(path, "rb") as f:
+        return pickle.load(f)
+
+
+def _store_quantity(path: Path, func: Callable, *args) -> Quantity:
+    result = func(*args)
+
+    # Write to a temporary file, then rename, so that other processes do not read a
+    # partial file
+    tmp = path.with_name(f"{path.name}.{os.getpid()}")
+    with open(tmp, "wb") as f:
+        pickle.dump(result, f)
+    os.replace(tmp, path)
+
+    return result
+
+
+class _NotPersistable(Exception):
+    """A task contains an object that cannot be described by its contents."""
+
+
+def _task_hash(graph, key, memo: Dict[Any, Any]) -> str:
+    """Return a hash of the task for `key` in `graph` and all its dependencies.
+
+    Raises
+    ------
+    _NotPersistable
+        if the task or any of its dependencies cannot be described. The exception is
+        stored in `memo`, so that it is raised again for other keys that depend on
+        `key`.
+    """
+    if key not in memo:
+        try:
+            memo[key] = hash_args(_describe(graph, graph[key], memo))
+        except _NotPersistable as e:
+            memo[key] = e
+    if isinstance(memo[key], _NotPersistable):
+        raise memo[key]
+    return memo[key]
+
+
+def _describe(graph, obj, memo: Dict[Any, Any]):
+    """Return a JSON-serializable description of `obj`, an element of a task.
+
+    With an empty `graph`, `obj` is described without references to other tasks.
+    """
+    try:
+        is_key = obj in graph
+    except TypeError:  # Unhashable
+        is_key = False
+
+    if is_key:
+        # Reference to another task
+        return ["key", _task_hash(graph, graph.unsorted_key(obj) or obj, memo)]
+    elif isinstance(obj, (list, tuple)):
+        return [_describe(graph, o, memo) for o in obj]
+    elif isinstance(obj, (set, frozenset)):
+        return sorted((_describe(graph, o, memo) for o in obj), key=repr)
+    elif isinstance(obj, dict):
+        return {str(k): _describe(graph, v, memo) for k, v in obj.items()}
+    elif isinstance(obj, partial):
+        return [_describe(graph, o, memo) for o in (obj.func, obj.args, obj.keywords)]
+    elif isinstance(obj, literal):
+        # From dask.core.quote(); `obj.data` is returned as-is, not a task or key
+        return ["literal", _describe({}, obj.data, memo)]
+    else:
+        return _describe_value(obj)
+
+
+def _describe_value(obj):
+    """Return a JSON-serializable description of `obj`, a value in a task.
+
+    Raises
+    ------
+    _NotPersistable
+        if `obj` has no description based on its contents.
+    """
+    if isinstance(obj, ixmp.TimeSeries):
+        # The URL includes the version. A checked-out scenario can be changed and solved
+        # again without a new version, so also use the objective function value
+        objective = None
+        if isinstance(obj, Scenario) and obj.has_solution():
+            objective = float(obj.var("OBJ")["lvl"])
+        return ["scenario", obj.url, objective]
+    elif isinstance(obj, Quantity):
+        return [str(pd.util.hash_pandas_object(obj.to_series()).sum()), str(obj.units)]
+    elif isinstance(obj, (pd.DataFrame, pd.Series)):
+        return str(pd.util.hash_pandas_object(obj).sum())
+    elif isinstance(obj, (Item, ItemScheme)):
+        return _describe_sdmx(obj)
+    elif isinstance(obj, (Key, re.Pattern, attrgetter, itemgetter, methodcaller)):
+        return repr(obj)  # Includes all arguments
+    elif callable(obj):
+        return _describe_callable(obj)
+
+    try:
+        json.dumps(obj, cls=Encoder)
+    except TypeError:
+        # The representation, for instance "<Foo object at 0x…>", may not reflect the
+        # contents of `obj`
+        raise _NotPersistable(
+            f"no description of the contents of {type(obj).__qualname__} object"
+        ) from None
+    else:
+        return obj
+
+
+def _describe_callable(obj: Callable):
+    """Return a description of the code of `obj`; see :func:`_describe_value`."""
+    func = getattr(obj, "func", obj)  # genno.Operator
+    if hasattr(func, "__qualname__"):
+        name = f"{getattr(func, '__module__', '')}.{func.__qualname__}"
+        try:
+            return [name, hash_code(func)]
+        except StopIteration:  # No __code__, e.g. a built-in function
+            return name
+    elif hasattr(obj, "__dict__"):
+        # Instance of a class with __call__: its code and the values of its attributes
+        func = type(obj).__call__
+        name = f"{func.__module__}.{func.__qualname__}"
+        return [name, hash_code(func), _describe({}, vars(obj), dict())]
+    else:
+        raise _NotPersistable(
+            f"no description of the contents of {type(obj).__qualname__} object"
+        )
+
+
+def _describe_sdmx(obj: Union[Item, ItemScheme]) -> list:
+    """Return a description of the contents of `obj`; see :func:`_describe_value`."""
+    if isinstance(obj, ItemScheme):
+        # For instance a Codelist: the contents of all its items, in order of ID
+        return [type(obj).__name__, obj.id, sorted(_describe_sdmx(i) for i in obj)]
+    else:
+        # For instance a Code. The Encoder uses only the ID, so also use the name, the
+        # annotations, and the IDs of any children
+        return [
+            obj.id,
+            str(obj.name),
+            sorted((str(a.id), str(a.text)) for a in obj.annotations),
+            sorted(c.id for c in obj.child),
+        ]
@@ -5,7 +5,6 @@ from base64 import b32hexencode
 from copy import deepcopy
 from pathlib import Path
 from random import randbytes
-from tempfile import TemporaryDirectory
 from typing import Generator
 
 import message_ix
@@ -179,6 +178,11 @@ def bare_res(request, context: Context, solved: bool = False) -> message_ix.Scen
     - be called once for each test function, so that each test receives a fresh copy of
       the RES scenario.
 
+    The first time a given bare RES is needed, it is read from a file in
+    :attr:`.Config.cache_path`, or created with :func:`.bare.create_res` and written to
+    that file. The file persists across test sessions and is shared by pytest-xdist
+    workers. The solution, if any, is not cached, since it cannot be read from file.
+
     Parameters
     ----------
     request : .FixtureRequest or None
@@ -203,9 +207,7 @@ def bare_res(request, context: Context, solved: bool = False) -> message_ix.Scen
     try:
         base = message_ix.Scenario(mp, name, "baseline")
     except ValueError:
-        log.info(f"Create '{name}/baseline' for testing")
-        context.scenario_info.update(model=name, scenario="baseline")
-        base = bare.create_res(context)
+        base = _load_or_create_res(context, name)
 
     if solved and not base.has_solution():
         log.info("Solve")
@@ -221,6 +223,66 @@ def bare_res(request, context: Context, solved: bool = False) -> message_ix.Scen
     return base.clone(scenario=new_name, keep_solution=solved)
 
 
+def _bare_res_path(context: Context) -> Path:
+    """Path to the cached bare RES for `context`; see :func:`_load_or_create_res`.
+
+    The file name is a hash of the bare RES spec, including its parameter data; the
+    data from :func:`.model.data.get_data`; and the package version.
+    """
+    from genno.caching import hash_args
+
+    import message_ix_models
+    from message_ix_models.model import bare
+    from message_ix_models.model.data import get_data
+
+    spec = bare.get_spec(context)
+    data = dict(spec.add.par)
+    # NB get_data() does not use its `scenario` argument
+    data.update(get_data(None, context=context, spec=spec) or {})
+
+    key = hash_args(
+        dict(spec.add.set),
+        {name: df.to_csv(index=False) for name, df in sorted(data.items())},
+        message_ix_models.__version__,
+    )
+    return context.get_cache_path("bare-res", f"{key}.xlsx")
+
+
+def _load_or_create_res(context: Context, name: str) -> message_ix.Scenario:
+    """Create the bare RES with model name `name`, using a cached file if available.
+
+    The first call for a given bare RES creates the Scenario with
+    :func:`.bare.create_res` and writes it to a file in :attr:`.Config.cache_path`.
+    Later calls—including from other pytest-xdist workers or test sessions—read this
+    file instead of applying the spec again. The file name is given by
+    :func:`_bare_res_path`, so the file is not reused if the spec, the data, or the
+    package version change.
+    """
+    from message_ix_models.model import bare
+
+    path = _bare_res_path(context)
+
+    if path.exists():
+        log.info(f"Read '{name}/baseline' for testing from {path}")
+        base = message_ix.Scenario(
+            context.get_platform(), name, "baseline", version="new"
+        )
+        base.read_excel(path, add_units=True, init_items=True)
+        return base
+
+    log.info(f"Create '{name}/baseline' for testing")
+    context.scenario_info.update(model=name, scenario="baseline")
+    base = bare.create_res(context)
+
+    # Write to a temporary file, then rename, so that other processes never read a
+    # partial file
+    tmp = path.with_name(f"{path.stem}-{os.getpid()}.xlsx")
+    base.to_excel(tmp)
+    os.replace(tmp, path)
+
+    return base
+
+
 #: Items with names that match (partially or fully) these names are omitted by
 #: :func:`export_test_data`.
 EXPORT_OMIT = [
@@ -247,16 +309,85 @@ EXPORT_OMIT = [
 ]
 
 
+def _read_items(scen, filters: dict, exclude: list) -> dict:
+    """Read sets and parameters of `scen` for :func:`export_test_data`.
+
+    Items with names matching any of `exclude` are skipped without being read;
+    parameter data are filtered with `filters`, and empty parameters are skipped.
+
+    Returns
+    -------
+    dict
+        Mapping from item name to a 2-tuple of ixmp type ("set" or "par") and data.
+    """
+    from ixmp.backend import ItemType
+
+    data = {}
+    for ix_type, item_type in (("set", ItemType.SET), ("par", ItemType.PAR)):
+        for name in sorted(scen.items(item_type)):
+            if any(i in name for i in exclude):
+                log.info(f"Discard {ix_type} {name!r}")
+                continue
+
+            if ix_type == "set":
+                df = scen.set(name)
+                if isinstance(df, pd.Series):
+                    # Index set: use own name as the header
+                    df = df.to_frame(name=name)
+            else:
+                dims = scen.idx_names(name)
+                df = scen.par(name, {k: v for k, v in filters.items() if k in dims})
+                if isinstance(df, dict):
+                    # Scalar parameter
+                    df = pd.DataFrame([df])
+                elif df.empty:
+                    # Don't write empty parameters
+                    continue
+
+            data[name] = (ix_type, df)
+
+    return data
+
+
+def _write_excel(path: Path, data: dict, ix_type_mapping: pd.DataFrame) -> None:
+    """Write `data` from :func:`_read_items` to `path` like :meth:`.Scenario.to_excel`.
+
+    Items with more rows than fit on one sheet are split across sheets named like
+    "name", "name(2)", and so on.
+    """
+    from ixmp.backend.io import EXCEL_MAX_ROWS
+
+    # Leave one row for the header
+    max_row = EXCEL_MAX_ROWS - 1
+
+    with pd.ExcelWriter(path) as writer:
+        # Write empty sets last, as ixmp does
+        for name, (_, df) in sorted(data.items(), key=lambda i: i[1][1].empty):
+            for i, first in enumerate(range(0, max(len(df), 1), max_row), start=1):
+                df.iloc[first : first + max_row].to_excel(
+                    writer, sheet_name=name + (f"({i})" if i > 1 else ""), index=False
+                )
+        ix_type_mapping.to_excel(writer, sheet_name="ix_type_mapping", index=False)
+
+
 def export_test_data(context: Context):
     """Export a subset of data from a scenario, for use in tests.
 
     The context settings ``export_nodes`` (default: "R11_AFR" and "R11_CPA") and
-    ``export_techs`` (default: "coal_ppl") are used to filter the data exported.
-    In addition, any item (set, parameter, variable, or equation) with a name matching
-    :data:`EXPORT_OMIT` *or* the context setting ``export_exclude`` is discarded.
+    ``export_techs`` (default: "coal_ppl") are used to filter the parameter data
+    exported. In addition, any set or parameter with a name matching
+    :data:`EXPORT_OMIT` *or* the context setting ``export_exclude`` is discarded
+    without being read.
 
-    The output is stored at :file:`data/tests/{model name}_{scenario name}_{techs}.xlsx`
-    in :mod:`message_data`.
+    The context setting ``export_format`` determines the output:
+
+    - "xlsx" (default): a file
+      :file:`data/tests/{model name}_{scenario name}_{techs}.xlsx` in
+      :mod:`message_data`, in the format of :meth:`ixmp.Scenario.to_excel`, that can
+      be read with :meth:`ixmp.Scenario.read_excel`.
+    - "parquet": a directory :file:`data/tests/{model name}_{scenario name}_{techs}/`
+      containing one :file:`{name}.parquet` file for each item, and
+      :file:`ix_type_mapping.parquet`.
 
     See also
     --------
@@ -270,71 +401,57 @@ def export_test_data(context: Context):
     # Retrieve the context settings giving the nodes and technologies to export
     nodes = context.get("export_nodes", ["R11_AFR", "R11_CPA"])
     technology = context.get("export_techs", ["coal_ppl"])
-
-    # Construct the destination file name
-    dest_file = private_data_path(
-        "tests", f"{scen.model}_{scen.scenario}_{'_'.join(technology)}.xlsx"
+    exclude = EXPORT_OMIT + context.get("export_exclude", [])
+    fmt = context.get("export_format", "xlsx")
+
+    if fmt not in ("parquet", "xlsx"):
+        raise ValueError(f"export_format={fmt!r}; expected 'parquet' or 'xlsx'")
+
+    # Filters for parameter data
+    filters = {"technology": technology}
+    filters.update(
+        {
+            dim: nodes
+            for dim in (
+                "node",
+                "node_dest",
+                "node_loc",
+                "node_origin",
+                "node_parent",
+                "node_rel",
+                "node_share",
+            )
+        }
     )
-    # Temporary file name
-    td = TemporaryDirectory()
-    tmp_file = Path(td.name).joinpath("export_test_data.xlsx")
 
-    # Ensure the target directory exists
-    dest_file.parent.mkdir(exist_ok=True)
-
-    # Dump data to temporary Excel file
-    log.info(f"Export test data to {dest_file}")
-    scen.to_excel(
-        tmp_file,
-        filters={
-            "technology": technology,
-            "node": nodes,
-            "node_dest": nodes,
-            "node_loc": nodes,
-            "node_origin": nodes,
-            "node_parent": nodes,
-            "node_rel": nodes,
-            "node_share": nodes,
-        },
-    )
-
-    mark_time()
-
-    log.info("Reduce test data")
-
-    # Read from temporary file and write to final file, omitting unnecessary sheets
-    reader = pd.ExcelFile(tmp_file)
-    writer = pd.ExcelWriter(dest_file)
+    # Construct the destination path
+    stem = f"{scen.model}_{scen.scenario}_{'_'.join(technology)}"
+    dest = private_data_path("tests", stem + (".xlsx" if fmt == "xlsx" else ""))
 
-    # Retrieve the type mapping first, to be modified as sheets are discarded
-    ix_type_mapping = reader.parse("ix_type_mapping").set_index("item")
-
-    for name in reader.sheet_names:
-        # Check if this sheet is to be included
-        if name == "ix_type_mapping":
-            # Already handled
-            continue
-        elif any(i in name for i in (EXPORT_OMIT + context.get("export_exclude", []))):
-            log.info(f"Discard sheet '{name}'")
-
-            # Remove from the mapping
-            ix_type_mapping.drop(name, inplace=True)
+    # Ensure the target directory exists
+    dest.parent.mkdir(exist_ok=True)
 
-            continue
+    log.info(f"Export test data to {dest}")
 
-        # Copy the sheet from temporary to final file
-        reader.parse(name).to_excel(writer, sheet_name=name, index=False)
+    data = _read_items(scen, filters, exclude)
 
-    # Close the temporary file
-    reader.close()
+    mark_time()
 
-    # Write the mapping
-    ix_type_mapping.reset_index().to_excel(
-        writer, sheet_name="ix_type_mapping", index=False
+    # Mapping from item name to ixmp type
+    ix_type_mapping = pd.DataFrame(
+        [(name, ix_type) for name, (ix_type, _) in data.items()],
+        columns=["item", "ix_type"],
     )
 
-    # Close the final file
-    writer.close()
+    if fmt == "xlsx":
+        _write_excel(dest, data, ix_type_mapping)
+    else:
+        dest.mkdir(exist_ok=True)
+        for name, (_, df) in data.items():
+            df.to_parquet(dest.joinpath(f"{name}.parquet"), index=False)
+        ix_type_mapping.to_parquet(
+            dest.joinpath("ix_type_mapping.parquet"), index=False
+        )
 
     mark_time()
 
@@ -0,0 +1,118 @@
+import numpy as np
+import pandas as pd
+import pandas.testing as pdt
+import pytest
+
+from message_ix_models.model.material.material_demand import material_demand_calc
+from message_ix_models.model.material.material_demand.material_demand_calc import (
+    derive_demand,
+    derive_demand_multi,
+    fitting_dict,
+    gompertz,
+    project_demand,
+)
+
+
+@pytest.mark.parametrize("material", ("steel", "cement", "aluminum"))
+def test_fitting_function(material) -> None:
+    """Regression functions can be evaluated on whole arrays."""
+    info = fitting_dict[material]
+    df = pd.DataFrame(
+        {"gdp_pcap": np.linspace(1e3, 8e4, 20), "del_t": np.arange(10, 30)}
+    )
+    params = info["initial_guess"]
+
+    # Function runs on all rows at once
+    result = info["function"](tuple(df[c] for c in info["x_data"]), *params)
+
+    # Result is the same as evaluating row by row
+    exp = df.apply(
+        lambda row: info["function"](tuple(row[c] for c in info["x_data"]), *params),
+        axis=1,
+    )
+    pdt.assert_series_equal(exp, result, check_names=False)
+
+
+def test_project_demand() -> None:
+    regions = ["R12_B", "R12_A"]
+    years = [2020, 2025, 2030, 2050, 2100]
+    df = pd.DataFrame(
+        [(n, y) for n in regions for y in years], columns=["region", "year"]
+    ).assign(
+        **{
+            "demand.tot.base": lambda x: np.where(x.region == "R12_A", 10.0, 20.0),
+            "pop.mil": np.linspace(100.0, 200.0, 10),
+            "demand_pcap0": np.linspace(50.0, 150.0, 10),
+        }
+    )
+
+    result = project_demand(df, phi=9, mu=0.1)
+
+    # Results are ordered by region
+    assert ["region", "year", "demand_tot"] == list(result.columns)
+    assert ["R12_A"] * 5 + ["R12_B"] * 5 == result.region.tolist()
+
+    # In the base year, total demand is approximately the base year demand; later, the
+    # gap to the fitted per-capita demand closes
+    for n, group in df.groupby("region"):
+        first = group.iloc[0]
+        gap = first["demand.tot.base"] * 1e3 / first["pop.mil"] - first["demand_pcap0"]
+        exp = (
+            (group["demand_pcap0"] + gap * gompertz(9, 0.1, y=group["year"]))
+            * group["pop.mil"]
+            * 1e-3
+        )
+        assert np.allclose(exp, result.query("region == @n").demand_tot)
+    assert np.isclose(10.0, result.demand_tot.iloc[0], rtol=1e-3)
+
+
+class _Scenario:
+    """Stand-in for :class:`.Scenario` with population and GDP (PPP) projections."""
+
+    def __init__(self) -> None:
+        nodes = ["R12_AFR", "R12_NAM"]
+        years = [2015, 2020, 2025, 2030, 2050]
+        self.calls = 0
+        self.data = pd.DataFrame(
+            [(n, y) for n in nodes for y in years], columns=["node_loc", "year_act"]
+        ).assign(mode="P", time="year", unit="???")
+        self.data["pop"] = np.linspace(100.0, 300.0, len(self.data))
+        self.data["gdp"] = np.linspace(1e3, 5e4, len(self.data))
+
+    def par(self, name, filters=None):
+        assert "bound_activity_up" == name
+        self.calls += 1
+        t = filters["technology"]
+        column = {"Population": "pop", "GDP_PPP": "gdp"}[t]
+        return self.data.drop(columns=["pop", "gdp"]).assign(
+            technology=t, value=self.data[column]
+        )
+
+
+def test_derive_demand_multi(monkeypatch) -> None:
+    """:func:`.derive_demand_multi` gives the same results as :func:`.derive_demand`."""
+
+    # Historical data are not available; use the initial guesses for the parameters
+    def fit(material, file_hash):
+        return np.array(fitting_dict[material]["initial_guess"], dtype=float)
+
+    monkeypatch.setattr(material_demand_calc, "fit_demand_regression", fit)
+
+    materials = ["steel", "cement", "aluminum"]
+    ssps = ["SSP1", "SSP3", "LED"]
+
+    scen = _Scenario()
+    result = derive_demand_multi(scen, materials, ssps)
+
+    # Population and GDP are read from the scenario once: 1 call for population, 2 for
+    # GDP (PPP)
+    assert 3 == scen.calls
+
+    assert {(m, s) for m in materials for s in ssps} == set(result)
+    for (material, ssp), df in result.items():
+        exp = derive_demand(material, scen, ssp=ssp)
+        assert not df.empty and df["value"].notna().all()
+        pdt.assert_frame_equal(exp, df)
+
+    # Results differ between SSPs
+    assert not result["steel", "SSP1"].equals(result["steel", "SSP3"])
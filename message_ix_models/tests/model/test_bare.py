@@ -1,7 +1,10 @@
+import json
+
 import message_ix
 import pytest
 
 from message_ix_models import testing
+from message_ix_models.model import bare
 from message_ix_models.model.bare import Config
 
 #: Number of items in the respective YAML files.
@@ -67,3 +70,39 @@ class TestConfig:
         c.regions = "R999"
 
         # TODO expand
+
+
+def test_get_spec(test_context):
+    test_context.model = Config(regions="R12")
+
+    s1 = bare.get_spec(test_context)
+    s2 = bare.get_spec(test_context)
+
+    # Equal contents, but distinct objects that can be modified independently
+    assert s1.add.set["node"] == s2.add.set["node"]
+    s1.add.set["node"].append("foo")
+    assert "foo" not in s2.add.set["node"]
+    assert "foo" not in bare.get_spec(test_context).add.set["node"]
+
+    assert 2020 == s1.add.y0
+
+
+def test_get_elements(test_context):
+    test_context.model = Config(regions="R11")
+    a = bare.get_elements(test_context)
+
+    # Result can be serialized
+    assert a == json.loads(json.dumps(a))
+    assert ["firstmodelyear", 2020] in a["cat_year"]
+
+    test_context.model = Config(regions="R12", years="A")
+    b = bare.get_elements(test_context)
+
+    result = bare.diff_elements(a, b)
+
+    assert 12 == len(result["node"]["add"])
+    assert 11 == len(result["node"]["remove"])
+    assert 2015 in result["year"]["remove"]
+    # Sets with identical elements are omitted
+    assert "technology" not in result
+    assert {} == bare.diff_elements(a, a)
@@ -4,7 +4,13 @@ from message_ix import make_df
 from message_ix.models import MACRO
 
 from message_ix_models import testing
-from message_ix_models.model.emissions import add_tax_emission, get_emission_factors
+from message_ix_models.model.emissions import (
+    _emission_factors,
+    _ipcc_1996,
+    add_tax_emission,
+    add_tax_emission_batch,
+    get_emission_factors,
+)
 
 
 def add_test_data(scenario):
@@ -55,6 +61,28 @@ def test_add_tax_emission(request, caplog, test_context):
     )
 
 
+def test_add_tax_emission_batch(request, test_context):
+    test_context.regions = "R12"
+    base = testing.bare_res(request, test_context, solved=False)
+    add_test_data(base)
+
+    prices = [1.1, 2.2, 3.3]
+    scenarios = [base.clone(scenario=f"{base.scenario} {p}") for p in prices]
+
+    # Mismatched lengths raise an exception
+    with pytest.raises(ValueError, match="3 scenarios, but 2 prices"):
+        add_tax_emission_batch(scenarios, prices[:2])
+
+    add_tax_emission_batch(scenarios, prices, drate_parameter="interestrate")
+
+    # Each scenario has the same data as from add_tax_emission() with its own price
+    add_tax_emission(base, prices[-1], drate_parameter="interestrate")
+    exp = base.par("tax_emission").set_index("type_year")["value"]
+    for scen, price in zip(scenarios, prices):
+        obs = scen.par("tax_emission").set_index("type_year")["value"]
+        assert np.allclose(exp * price / prices[-1], obs)
+
+
 @pytest.mark.parametrize(
     "units, exp_coal",
     (
@@ -72,3 +100,18 @@ def test_get_emission_factors(units, exp_coal):
 
     # Expected values are obtained
     assert np.isclose(exp_coal, result.sel(c="coal").item(), rtol=1e-4)
+
+
+def test_get_emission_factors_cached():
+    _emission_factors.cache_clear()
+    _ipcc_1996.cache_clear()
+
+    # Data are loaded from file once, for any `units`
+    a = get_emission_factors()
+    get_emission_factors("t CO2 / TJ")
+    assert a is not get_emission_factors()
+    assert 1 == _ipcc_1996.cache_info().misses
+
+    # Modifying the result does not affect subsequent calls
+    a *= 2.0
+    assert np.isclose(25.8, get_emission_factors().sel(c="coal").item(), rtol=1e-4)
@@ -1,6 +1,9 @@
 import logging
 import sys
+from contextlib import contextmanager
 
+import pandas as pd
+import pandas.testing as pdt
 import pytest
 
 from message_ix_models.model import snapshot
@@ -16,3 +19,94 @@ log = logging.getLogger(__name__)
 @pytest.mark.snapshot
 def test_load(test_context, loaded_snapshot):
     assert loaded_snapshot.model == "MESSAGEix-GLOBIOM_1.1_R11_no-policy"
+
+
+#: Data for one parameter.
+PAR = pd.DataFrame(
+    {
+        "node_loc": ["n0", "n1", "n1"],
+        "technology": ["t0", "t1", "t1"],
+        "year_vtg": [2020, 2020, 2030],
+        "value": [1.0, 2.0, 3.0],
+        "unit": ["USD/kW", "USD/kW", "USD_2005/t "],
+    }
+)
+
+
+def _write(path) -> None:
+    """Write a file in the ixmp Excel format, with :data:`PAR` split across 2 sheets."""
+    tech = pd.DataFrame({"technology": ["t0", "t1"]})
+    with pd.ExcelWriter(path, engine="openpyxl") as ew:
+        tech.to_excel(ew, sheet_name="technology", index=False)
+        PAR.iloc[:2].to_excel(ew, sheet_name="inv_cost", index=False)
+        PAR.iloc[2:].to_excel(ew, sheet_name="inv_cost(2)", index=False)
+        pd.DataFrame(
+            {"item": ["technology", "inv_cost"], "ix_type": ["set", "par"]}
+        ).to_excel(ew, sheet_name="ix_type_mapping", index=False)
+
+
+@pytest.mark.parametrize("max_workers", (1, 2))
+def test_unpack(tmp_path, max_workers) -> None:
+    path = tmp_path.joinpath("snapshot-test.xlsx")
+    _write(path)
+
+    # Function runs
+    base = snapshot.unpack(path, max_workers=max_workers)
+
+    # Sets are written to an Excel file
+    assert ["ix_type_mapping", "technology"] == sorted(
+        pd.ExcelFile(base.joinpath("sets.xlsx")).sheet_names
+    )
+
+    # Parameter data from all sheets are written to a single file
+    result = pd.read_parquet(base.joinpath("inv_cost.parquet"))
+    pdt.assert_frame_equal(PAR, result, check_categorical=False, check_dtype=False)
+    # Dimensions are stored as categoricals
+    assert isinstance(result["node_loc"].dtype, pd.CategoricalDtype)
+
+    # Existing files are not overwritten
+    mtime = base.joinpath("inv_cost.parquet").stat().st_mtime
+    snapshot.unpack(path, max_workers=max_workers)
+    assert mtime == base.joinpath("inv_cost.parquet").stat().st_mtime
+
+
+class _Scenario:
+    """Stand-in for :class:`.Scenario` that records data added."""
+
+    def __init__(self) -> None:
+        self.paths: list = []
+        self.data: dict = {}
+
+    def read_excel(self, path) -> None:
+        self.paths.append(path)
+
+    def par_list(self) -> list:
+        return ["fix_cost", "inv_cost"]
+
+    @contextmanager
+    def transact(self, message):
+        yield
+
+    def add_par(self, name, data) -> None:
+        self.data[name] = data
+
+
+def test_read_excel(tmp_path) -> None:
+    path = tmp_path.joinpath("snapshot-test.xlsx")
+    _write(path)
+    scenario = _Scenario()
+
+    # Function runs
+    snapshot.read_excel(scenario, path)  # type: ignore [arg-type]
+
+    # Sets are read from the unpacked file
+    assert [tmp_path.joinpath("snapshot-test", "sets.xlsx")] == scenario.paths
+
+    # Only parameters with data are added, from the Parquet file
+    assert {"inv_cost"} == set(scenario.data)
+    result = scenario.data["inv_cost"]
+
+    # Categoricals are converted to str; units are corrected
+    assert not any(isinstance(dt, pd.CategoricalDtype) for dt in result.dtypes)
+    assert ["USD/kW", "USD/kW", "USD_2005/t"] == result["unit"].tolist()
+    pdt.assert_frame_equal(PAR.assign(unit=result["unit"]), result, check_dtype=False)
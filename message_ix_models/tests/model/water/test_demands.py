@@ -0,0 +1,62 @@
+import pandas as pd
+import pytest
+
+from message_ix_models.model.water.data.demands import target_rate, target_rate_trt
+
+
+@pytest.fixture
+def basin() -> pd.DataFrame:
+    # "a" has more "DEV" than "IND" entries; "b" fewer; "c" equal numbers
+    return pd.DataFrame(
+        [
+            ["a", "DEV"],
+            ["a", "DEV"],
+            ["a", "IND"],
+            ["b", "DEV"],
+            ["b", "IND"],
+            ["b", "IND"],
+            ["c", "DEV"],
+            ["c", "IND"],
+        ],
+        columns=["BCU_name", "STATUS"],
+    )
+
+
+@pytest.fixture
+def df() -> pd.DataFrame:
+    years = [2025, 2030, 2035, 2040, 2045]
+    return pd.DataFrame(
+        [[n, y, v] for n in "abc" for y, v in zip(years, [0.2, 0.4, 0.9, 0.6, 1.0])],
+        columns=["node", "year", "value"],
+    )
+
+
+def test_target_rate(df, basin) -> None:
+    result = target_rate(df, basin, 0.8).set_index(["node", "year"])["value"]
+
+    # Nodes with at least as many "DEV" as "IND" entries: target set in 2030 only
+    for n in "ac":
+        assert [0.2, 0.8, 0.9, 0.6, 1.0] == result[n].tolist()
+
+    # Other nodes: 2035 target is the mean of the 2030 value and the 2040 target;
+    # values above the target are unchanged
+    assert [0.2, 0.4, 0.9, 0.8, 1.0] == result["b"].tolist()
+
+    df.loc[df.year == 2035, "value"] = 0.1
+    result = target_rate(df, basin, 0.8).set_index(["node", "year"])["value"]
+    assert pytest.approx([0.2, 0.4, 0.6, 0.8, 1.0]) == result["b"].tolist()
+
+
+def test_target_rate_trt(df, basin) -> None:
+    result = target_rate_trt(df, basin)
+
+    # "value" column is moved to the end
+    assert ["node", "year", "value"] == list(result.columns)
+
+    result = result.set_index(["node", "year"])["value"]
+
+    # Untreated share is halved from 2040 where "DEV" entries are at least as many
+    # as "IND", otherwise from 2030
+    for n in "ac":
+        assert pytest.approx([0.2, 0.4, 0.9, 0.8, 1.0]) == result[n].tolist()
+    assert pytest.approx([0.2, 0.7, 0.95, 0.8, 1.0]) == result["b"].tolist()
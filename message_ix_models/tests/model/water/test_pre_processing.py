@@ -0,0 +1,224 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+import xarray as xr
+from click.testing import CliRunner
+
+from message_ix_models.model.water.data.pre_processing import (
+    Task,
+    hydro_agg_raster,
+    replace_output,
+    run,
+)
+from message_ix_models.model.water.data.pre_processing.__main__ import cli
+from message_ix_models.model.water.data.pre_processing.hydro_agg_basin import (
+    QUANTILES,
+    YEARS,
+    _months,
+    bias_correction,
+    environmental_flow,
+    output_names,
+    tasks,
+)
+
+
+def _touch(path, mtime: float):
+    path.write_text("x")
+    os.utime(path, (mtime, mtime))
+    return path
+
+
+@pytest.fixture
+def task(tmp_path) -> Task:
+    """A :class:`.Task` with 1 input file and 2 output files."""
+    return Task(
+        key=("m", "v"),
+        inputs=(_touch(tmp_path.joinpath("in.csv"), 100),),
+        outputs=(tmp_path.joinpath("out0.csv"), tmp_path.joinpath("out1.csv")),
+    )
+
+
+class TestTask:
+    def test_is_current(self, tmp_path, task) -> None:
+        # Outputs do not exist
+        assert not task.is_current()
+
+        # Only some outputs exist
+        _touch(task.outputs[0], 200)
+        assert not task.is_current()
+
+        # All outputs are newer than the inputs
+        _touch(task.outputs[1], 300)
+        assert task.is_current()
+
+        # One output is older than the input
+        _touch(task.outputs[0], 50)
+        assert not task.is_current()
+        _touch(task.outputs[0], 200)
+
+        # A dependency is newer than one of the outputs
+        assert task.is_current([_touch(tmp_path.joinpath("mask.nc"), 150)])
+        assert not task.is_current([_touch(tmp_path.joinpath("mask.nc"), 250)])
+
+    def test_str(self, task) -> None:
+        assert "m/v" == str(task)
+        assert 1 == task.size
+
+
+def test_run(caplog, tmp_path, task) -> None:
+    missing = Task(key=("m", "w"), inputs=(), outputs=(tmp_path.joinpath("o.csv"),))
+    calls = []
+
+    def func(t: Task) -> None:
+        calls.append(t)
+        for i, p in enumerate(t.outputs):
+            _touch(p, 200 + i)
+
+    # Task without input files is skipped, with a warning
+    run(func, [task, missing])
+    assert [task] == calls
+    assert "No input files for m/w" in caplog.messages
+    assert "Process 1 of 2 combinations" in caplog.messages
+
+    # Task with current outputs is skipped
+    run(func, [task, missing])
+    assert 1 == len(calls)
+
+    # …unless `force` is given
+    run(func, [task, missing], force=True)
+    assert 2 == len(calls)
+
+    # …or one of `depends` is newer than the outputs
+    run(func, [task], depends=[_touch(tmp_path.joinpath("mask.nc"), 300)])
+    assert 3 == len(calls)
+
+
+def test_replace_output(tmp_path) -> None:
+    path = tmp_path.joinpath("out.csv")
+
+    # Exception while writing → no output file, and the temporary file is removed
+    with pytest.raises(RuntimeError):
+        with replace_output(path) as tmp:
+            tmp.write_text("partial")
+            raise RuntimeError
+    assert [] == list(tmp_path.iterdir())
+
+    with replace_output(path) as tmp:
+        assert path != tmp
+        tmp.write_text("x")
+    assert [path] == list(tmp_path.iterdir())
+
+
+@pytest.mark.parametrize("monthly", (True, False))
+@pytest.mark.parametrize(
+    "var, factor", (("qtot", 86400 * 2.0 * 3.65e-10), ("dis", 0.031556952))
+)
+def test_process_raster(tmp_path, var, factor, monthly) -> None:
+    # Constant monthly values on a 2 × 3 grid, 2015–2039; area of 2.0 in each cell
+    coords = dict(lat=[0.25, 0.75], lon=[10.25, 10.75, 11.25])
+    area_path = tmp_path.joinpath("area.nc")
+    xr.DataArray(np.full((2, 3), 2.0), coords=coords, dims=("lat", "lon")).to_netcdf(
+        area_path
+    )
+    coords.update(time=pd.date_range("2015-01-31", periods=25 * 12, freq="ME"))
+    input_path = tmp_path.joinpath(f"m_s_{var}_monthly.nc")
+    xr.Dataset(
+        {var: (("time", "lat", "lon"), np.ones((25 * 12, 2, 3)))}, coords=coords
+    ).to_netcdf(input_path)
+
+    outputs = hydro_agg_raster.output_names(var, "m", "s", "future", monthly)
+    task = Task(
+        key=("m", "s", var),
+        inputs=(input_path,),
+        outputs=tuple(tmp_path.joinpath(name) for name in outputs),
+    )
+
+    hydro_agg_raster.process(task, area_path, monthly=monthly, synchronous=True)
+
+    # All outputs are written, with no temporary files left over
+    assert {"area.nc", input_path.name, *outputs} == {
+        p.name for p in tmp_path.iterdir()
+    }
+
+    with xr.open_dataset(task.outputs[-1]) as ds:
+        assert "km3/year" == ds[var].attrs["unit"]
+        # Values are converted
+        assert np.allclose(factor, ds[var].isel(time=-1))
+
+        if monthly:
+            # Monthly values are kept
+            assert 25 * 12 == ds.sizes["time"]
+        else:
+            # 5-year periods ending 2015, 2020, …, shifted by 4 years
+            years = ds.get_index("time").year.tolist()
+            assert [2019, 2024, 2029, 2034, 2039, 2044] == years
+
+
+def test_bias_correction() -> None:
+    # 2 basins with constant monthly values, 2015–2104
+    columns = _months(2015, 90 * 12)
+    df = pd.DataFrame(10.0, index=[0, 1], columns=columns)
+    val_2020 = pd.DataFrame(8.0, index=[0, 1], columns=range(1, 13))
+    delta = val_2020 * 0 + 2.0
+
+    result, df_5y_m, quantiles = bias_correction(df, val_2020, delta)
+
+    # Input is not modified
+    assert (df == 10.0).all(axis=None)
+
+    # 2020 values are replaced; the correction fades out by 0.2 every 5 years
+    for year, exp in (2020, 8.0), (2025, 8.0), (2030, 8.4), (2045, 9.6), (2050, 10.0):
+        assert np.allclose(exp, result[_months(year)])
+    # Other years are unchanged
+    assert (result[_months(2021)] == 10.0).all(axis=None)
+
+    # Monthly values for the 5-year time steps only
+    assert len(YEARS) * 12 == len(df_5y_m.columns)
+    assert set(YEARS) == set(df_5y_m.columns.year)
+
+    # One set of 5-year values per reliability level, with the 2020 annual average
+    assert set(QUANTILES) == set(quantiles)
+    for df_q in quantiles.values():
+        assert np.allclose(8.0, df_q[pd.Timestamp("2020-12-31")])
+
+
+def test_environmental_flow() -> None:
+    # Mean annual flow is 2.0 in 2020, and 4.0 in 2021
+    values = [0.5] * 4 + [1.0] * 4 + [4.5] * 4
+    df = pd.DataFrame([values + [2 * v for v in values]], columns=_months(2020, 24))
+
+    result = environmental_flow(df)
+
+    # Low flow → 60%; intermediate → 45%; high → 20%, relative to each year's mean
+    exp = [0.3] * 4 + [0.45] * 4 + [0.9] * 4
+    assert np.allclose(exp, result[_months(2020)])
+    assert np.allclose([2 * v for v in exp], result[_months(2021)])
+
+
+def test_tasks(tmp_path) -> None:
+    for scenario in "ssp126", "ssp370":
+        tmp_path.joinpath(f"qtot_monthly_m_{scenario}_future.csv").write_text("")
+
+    result = tasks(tmp_path, tmp_path, "R12", models=["m"], variables=["qtot", "dis"])
+
+    # Task with input files, and environmental flows in its outputs
+    assert ("m", "qtot") == result[0].key and 2 == len(result[0].inputs)
+    assert tmp_path.joinpath("e-flow_7p0_R12.csv") in result[0].outputs
+    # Task without input files
+    assert () == result[1].inputs
+
+    # Output file names are unique
+    names = output_names("qtot", "R12", True)
+    assert len(names) == len(set(names))
+
+    with pytest.raises(ValueError, match="2 climate models"):
+        tasks(tmp_path, tmp_path, "R12", models=["m", "n"])
+
+
+@pytest.mark.parametrize("command", ([], ["raster"], ["basin"]))
+def test_cli_help(command) -> None:
+    result = CliRunner().invoke(cli, command + ["--help"])
+    assert 0 == result.exit_code, result.output
+    assert "Usage:" in result.output
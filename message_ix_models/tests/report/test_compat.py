@@ -1,5 +1,7 @@
 import logging
 
+import pandas as pd
+import pytest
 from genno import Computer
 from ixmp.testing import assert_logs
 
@@ -8,6 +10,7 @@ from message_ix_models.model.structure import get_codes
 from message_ix_models.report import prepare_reporter
 from message_ix_models.report.compat import (
     TECH_FILTERS,
+    _filter_table,
     callback,
     get_techs,
     prepare_techs,
@@ -105,3 +108,65 @@ def test_prepare_techs_filter_error(caplog, monkeypatch):
 
     with assert_logs(caplog, "SyntaxError('invalid syntax", at_level=logging.WARNING):
         prepare_techs(Computer(), get_codes("technology"))
+
+
+@pytest.mark.parametrize(
+    "expr, expected",
+    (
+        ("False", []),
+        ("sector == 'transport' and c_in == 'gas'", ["gas_trp"]),
+        ("l_in in 'secondary final' and '_ccs' not in id", ["gas_cc", "gas_trp"]),
+        ("not (c_in == 'gas' or sector in ['industry'])", ["loil_trp", "solar_res1"]),
+        # Not supported by _filter_table(); evaluated row by row
+        ("c_in.startswith('l')", ["loil_trp"]),
+        ("not c_in", ["solar_res1"]),
+        ("sector and c_in == 'coal'", ["coal_i"]),
+        ("c_in == None", ["solar_res1"]),
+        ("l_in == ['final', 'primary']", ["coal_i"]),
+    ),
+)
+def test_filter_table(expr, expected) -> None:
+    df = pd.DataFrame(
+        [
+            ["gas_cc", "electricity", "gas", "secondary"],
+            ["gas_cc_ccs", "electricity", "gas", "secondary"],
+            ["gas_i", "industry", "gas", "tertiary"],
+            ["gas_trp", "transport", "gas", "final"],
+            ["coal_i", "industry", "coal", ["final", "primary"]],
+            ["loil_trp", "transport", "lightoil", None],
+            ["solar_res1", "electricity", None, None],
+        ],
+        columns=["id", "sector", "c_in", "l_in"],
+        dtype=object,
+    )
+    assert expected == df["id"][_filter_table(df, expr)].tolist()
+
+    # Same as evaluating `expr` for each row
+    def _eval(row) -> bool:
+        try:
+            return eval(expr, None, row) is True
+        except Exception:
+            return False
+
+    assert expected == [r["id"] for r in df.to_dict(orient="records") if _eval(r)]
+
+
+def test_filter_table_error(caplog) -> None:
+    """Exceptions in row-by-row evaluation are logged once per filter."""
+    df = pd.DataFrame(
+        [["loil_trp", "lightoil"], ["solar_res1", None], ["wind_res1", None]],
+        columns=["id", "c_in"],
+        dtype=object,
+    )
+    expr = "c_in.startswith('l')"
+
+    with caplog.at_level(logging.WARNING):
+        result = _filter_table(df, expr)
+
+    # Rows that raise an exception are excluded
+    assert ["loil_trp"] == df["id"][result].tolist()
+    # The first exception is logged, once
+    assert [
+        f"AttributeError(\"'NoneType' object has no attribute 'startswith'\") when "
+        f"evaluating {expr!r}"
+    ] == caplog.messages
@@ -35,3 +35,142 @@ def test_legacy_report(test_context, loaded_snapshot):
     )
 
     report(test_context)
+
+
+@pytest.mark.parametrize("fmt", ["arrow", "csv", "parquet", "xlsx"])
+def test_iamc_writer(tmp_path, fmt) -> None:
+    import pandas as pd
+    import pyarrow as pa
+
+    from message_ix_models.report.legacy.pp_utils import IAMCWriter
+
+    def _df(variable, values):
+        return pd.DataFrame(
+            [["m", "s", "World", variable, "EJ/yr"] + values],
+            columns=["Model", "Scenario", "Region", "Variable", "Unit", 2020, 2030],
+        )
+
+    with IAMCWriter(tmp_path.joinpath("m_s"), fmt) as writer:
+        writer.write(_df("Final Energy", [1.0, 2.0]))
+        writer.write(_df("Primary Energy", [3.0, None]))
+
+    path = writer.path
+    assert [path] == list(tmp_path.iterdir())
+
+    if fmt == "xlsx":
+        result = pd.read_excel(path)
+        assert (2, 7) == result.shape
+        return
+    elif fmt == "arrow":
+        result = pa.ipc.open_stream(path).read_pandas()
+    elif fmt == "csv":
+        result = pd.read_csv(path)
+    else:
+        result = pd.read_parquet(path)
+
+    # Data are in long layout; missing values are omitted
+    assert ["Model", "Scenario", "Region", "Variable", "Unit", "Year", "Value"] == list(
+        result.columns
+    )
+    assert [1.0, 2.0, 3.0] == result["Value"].tolist()
+    assert [2020, 2030, 2020] == result["Year"].tolist()
+    if fmt != "csv":
+        assert isinstance(result["Variable"].dtype, pd.CategoricalDtype)
+
+    with pytest.raises(ValueError, match="fmt='foo'"):
+        IAMCWriter(tmp_path.joinpath("m_s"), "foo")
+
+
+def test_compile_units(monkeypatch) -> None:
+    import pandas as pd
+
+    from message_ix_models.report.legacy import pp_utils
+
+    monkeypatch.setattr(pp_utils, "unit_conversion", None)
+    monkeypatch.setattr(pp_utils, "unit_factors", None)
+
+    mu = pp_utils.compile_units(
+        {
+            "model_units": {"conv_c2co2": "44. / 12.", "currency": "US$2010"},
+            "conversion_factors": {
+                "GWa": {"EJ/yr": 0.03154, "GWa": 1.0},
+                "Mt C/yr": {"Mt CO2/yr": "float(f\"{mu['conv_c2co2']}\")"},
+            },
+        }
+    )
+
+    assert dict(conv_c2co2=44.0 / 12, currency="US$2010") == mu
+    unit_conversion, unit_factors = pp_utils.unit_conversion, pp_utils.unit_factors
+    assert unit_conversion is not None and unit_factors is not None
+    assert 44.0 / 12 == unit_conversion["Mt C/yr"]["Mt CO2/yr"]
+    assert (2, 3) == unit_factors.shape
+
+    df = pd.DataFrame(
+        [["GWa", 1.0, 2.0], ["GWa", 3.0, 4.0]], columns=["Unit", 2020, 2030]
+    )
+    result = pp_utils._convert_units(df.copy(), "EJ/yr")
+    assert {"EJ/yr"} == set(result["Unit"])
+    assert [0.03154, 0.09462] == result[2020].round(5).tolist()
+
+    # Missing factor → values are not converted
+    result = pp_utils._convert_units(df.copy(), "Mt CO2/yr")
+    assert [1.0, 3.0] == result[2020].tolist()
+
+
+def test_fil(monkeypatch) -> None:
+    import pandas as pd
+
+    from message_ix_models.report.legacy import pp_utils
+
+    regions = {"R11_AFR": "AFR", "R11_WEU": "WEU", "R11_GLB": "World"}
+    monkeypatch.setattr(pp_utils, "regions", regions)
+    monkeypatch.setattr(pp_utils, "region_id", "R11")
+    monkeypatch.setattr(pp_utils, "all_years", [2020, 2025, 2030])
+    monkeypatch.setattr(pp_utils, "years", [2020, 2025, 2030])
+    monkeypatch.setattr(pp_utils, "fil_data", {})
+    monkeypatch.setattr(pp_utils, "unit_conversion", {"???": {"kt/yr": 2.0}})
+
+    data = pp_utils.load_fil("HFC_fac")
+
+    # Only regions of the scenario are loaded; model years are interpolated
+    assert {"AFR", "WEU"} == set(data.index.get_level_values("Region"))
+    row = data.loc[("AFR", "refAC134")]
+    assert row[2025] == (row[2020] + row[2030]) / 2
+
+    # Files are read once
+    assert data is pp_utils.load_fil("HFC_fac")
+    assert 1 == len(pp_utils.fil_data)
+
+    df = pd.DataFrame(
+        [[1.0, 1.0, 1.0], [2.0, 2.0, 2.0]],
+        index=pd.Index(["AFR", "WEU"], name="Region"),
+        columns=[2020, 2025, 2030],
+    )
+    result = pp_utils.fil(df, "HFC_fac", "refAC134", "kt/yr")
+
+    assert 2.0 * row[2025] == result.loc["AFR", 2025]
+    assert 4.0 * data.loc[("WEU", "refAC134"), 2030] == result.loc["WEU", 2030]
+
+
+def test_fill_vintage() -> None:
+    import pandas as pd
+
+    from message_ix_models.report.legacy.pp_utils import _fill_vintage
+
+    df = pd.DataFrame(
+        [
+            ["R", "t", 2020, 2020, 1.0],
+            ["R", "t", 2020, 2030, 2.0],
+            ["R", "t", 2020, 2040, 3.0],
+            ["R", "t", 2030, 2040, 4.0],
+            ["R", "u", 2030, 2030, 5.0],
+        ],
+        columns=["node_loc", "technology", "year_vtg", "year_act", "value"],
+    )
+
+    result = _fill_vintage(df)
+
+    # Diagonal rows first, then the latest vintage for each missing activity year
+    assert [1.0, 5.0, 2.0, 4.0] == result["value"].tolist()
+    assert (result.year_vtg == result.year_act).all()
+    assert isinstance(result.index, pd.RangeIndex)
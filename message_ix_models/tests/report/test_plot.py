@@ -0,0 +1,100 @@
+import pandas as pd
+import pytest
+from genno import Computer
+
+from message_ix_models.report import plot
+
+#: Variable names and regions for test data.
+VARIABLES = [
+    "Emissions|CO2",
+    "Emissions|CH4",
+    "Final Energy",
+    "Final Energy|Electricity",
+    "Final Energy|Solids",
+    "Final Energy|Solids|Coal",
+    "Primary Energy",
+    "Primary Energy|Coal",
+    "Primary Energy|Fossil",
+]
+REGIONS = ["R12_GLB", "R12_NAM", "R12_WEU"]
+
+
+class FakeScenario:
+    """Minimal stand-in for :class:`ixmp.TimeSeries` with time series data."""
+
+    url = "model/scenario#1"
+
+    def __init__(self) -> None:
+        self.calls: list = []
+
+    def timeseries(self, iamc=False, subannual="auto", **filters) -> pd.DataFrame:
+        self.calls.append(filters)
+        df = pd.DataFrame(
+            [
+                ["m", "s", n, v, "EJ/yr", y, float(i)]
+                for i, (n, v, y) in enumerate(
+                    (n, v, y) for n in REGIONS for v in VARIABLES for y in (2020, 2030)
+                )
+            ],
+            columns="model scenario region variable unit year value".split(),
+        )
+        if "variable" in filters:
+            df = df[df["variable"].isin(filters["variable"])]
+        return df
+
+
+@pytest.fixture
+def c(test_context, tmp_path) -> Computer:
+    c = Computer()
+    c.add("scenario", FakeScenario())
+    c.configure(output_dir=tmp_path)
+    return c
+
+
+def test_plot_data(c: Computer, test_context) -> None:
+    plot.callback(c, test_context)
+    c.add("all data", ["Emissions|CO2::iamc", "fe1-0::iamc", "pe1-0::iamc"])
+
+    co2, fe1, pe1 = c.get("all data")
+
+    # Time series data are retrieved once for all plots
+    assert 1 == len(c.graph["scenario"].calls)
+
+    # Exact variable names and regular expressions select the expected data
+    assert {"Emissions|CO2"} == set(co2["variable"])
+    assert {"Electricity", "Solids"} == set(fe1["variable"])
+    assert {"Coal"} == set(pe1["variable"])
+    assert 2 * 2 * len(REGIONS) == len(fe1)
+    assert list(FakeScenario().timeseries().columns) == list(fe1.columns)
+    assert isinstance(fe1.index, pd.RangeIndex)
+
+
+def test_plot_data_names(c: Computer) -> None:
+    """Only exact names → these are used to filter when retrieving data."""
+    for p in (plot.EmissionsCO2, plot.FinalEnergy0):
+        c.add(f"plot {p.basename}", p, "scenario")
+    c.add("all data", ["Emissions|CO2::iamc", "Final Energy::iamc"])
+
+    co2, fe0 = c.get("all data")
+
+    assert [{"variable": ["Emissions|CO2", "Final Energy"]}] == c.graph[
+        "scenario"
+    ].calls
+    assert {"Final Energy"} == set(fe0["variable"])
+
+    # "scenario" is not replaced by a task that depends on itself
+    assert isinstance(c.graph["scenario"], FakeScenario)
+
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_plot_all(c: Computer, test_context, tmp_path, max_workers) -> None:
+    test_context.report.plot_max_workers = max_workers
+
+    plot.callback(c, test_context)
+
+    c.get("plot all")
+
+    # All plots are generated
+    assert {f"{p.basename}.pdf" for p in plot.PLOTS} == {
+        p.name for p in tmp_path.iterdir()
+    }
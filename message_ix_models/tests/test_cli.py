@@ -16,6 +16,7 @@ COMMANDS = [
     ("techs",),
     ("testing",),
     ("water-ix",),
+    ("wb", "refresh"),
 ]
 
 
@@ -34,7 +35,10 @@ def test_cli_debug(mix_models_cli):
     mix_models_cli.assert_exit_0(["debug"])
 
 
-def test_cli_export_test_data(monkeypatch, tmp_path, test_context, mix_models_cli):
+@pytest.mark.parametrize("fmt, suffix", [(None, ".xlsx"), ("parquet", "")])
+def test_cli_export_test_data(
+    monkeypatch, tmp_path, test_context, mix_models_cli, fmt, suffix
+):
     """The :command:`export-test-data` command can be invoked."""
     # Create an empty scenario in the temporary local file database
     platform = "local"
@@ -52,15 +56,21 @@ def test_cli_export_test_data(monkeypatch, tmp_path, test_context, mix_models_cl
     # File that will be created
     technology = ["coal_ppl"]
     dest_file = util.private_data_path(
-        "tests", f"{scen.model}_{scen.scenario}_{'_'.join(technology)}.xlsx"
+        "tests", f"{scen.model}_{scen.scenario}_{'_'.join(technology)}{suffix}"
     )
 
     # Release the database lock
     mp.close_db()
 
     # Export works
-    result = mix_models_cli.assert_exit_0([f"--url={url}", "export-test-data"])
+    args = [f"--url={url}", "export-test-data"] + ([f"--format={fmt}"] if fmt else [])
+    result = mix_models_cli.assert_exit_0(args)
 
     # The file is created in the expected location
     assert str(dest_file) in result.output
     assert dest_file.exists()
+
+    if fmt == "parquet":
+        # One file per item, plus the mapping of items to ixmp types
+        assert dest_file.joinpath("ix_type_mapping.parquet").exists()
+        assert dest_file.joinpath("node.parquet").exists()
@@ -1,16 +1,34 @@
 """Tests for :mod:`message_ix_models.report`."""
 
+from copy import deepcopy
 from importlib.metadata import version
+from types import SimpleNamespace
 
 import numpy as np
 import pandas as pd
 import pandas.testing as pdt
 import pytest
+from genno import Key
 from ixmp.testing import assert_logs
+from message_ix import Reporter
 
+import message_ix_models.report as report_module
 from message_ix_models import ScenarioInfo, testing
-from message_ix_models.report import prepare_reporter, register, report, util
-from message_ix_models.report.sim import add_simulated_solution, to_simulate
+from message_ix_models.report import (
+    _store_template,
+    _template_key,
+    prepare_reporter,
+    register,
+    report,
+    report_batch,
+    util,
+)
+from message_ix_models.report.sim import (
+    add_simulated_solution,
+    data_from_file,
+    to_arrow,
+    to_simulate,
+)
 from message_ix_models.util import package_data_path
 
 # Minimal reporting configuration for testing
@@ -63,6 +81,65 @@ def test_report_bare_res(request, tmp_path, test_context):
     report(test_context)
 
 
+@prepare_reporter.minimum_version
+def test_prepare_reporter_template(request, tmp_path, test_context):
+    """:func:`.prepare_reporter` reuses a Reporter for scenarios of same structure."""
+    s0 = testing.bare_res(request, test_context, solved=False)
+    s1 = s0.clone(scenario=f"{s0.scenario} 1")
+
+    test_context.report.update(
+        from_file="global.yaml", key="y0", output_dir=tmp_path, use_template=True
+    )
+
+    rep0, key0 = prepare_reporter(test_context, scenario=s0)
+    rep1, key1 = prepare_reporter(test_context, scenario=s1)
+
+    # Same keys and tasks, but each Reporter refers to its own scenario
+    assert key0 == key1
+    assert set(rep0.graph) == set(rep1.graph)
+    assert rep0.graph["scenario"] is s0 and rep1.graph["scenario"] is s1
+    assert rep0.graph["config"]["output_dir"] != rep1.graph["config"]["output_dir"]
+
+    # The Reporters can be modified independently
+    rep1.add("foo", 1.0)
+    assert "foo" not in rep0.graph
+
+    # Results are the same
+    assert rep0.get(key0) == rep1.get(key1)
+
+    # The stored template does not refer to either scenario
+    template, _ = report_module._TEMPLATES[_template_key(test_context, s0)]
+    assert s0.url == template.graph["scenario"]
+
+
+def test_store_template(monkeypatch) -> None:
+    monkeypatch.setattr(report_module, "_TEMPLATES", dict())
+    monkeypatch.setattr(report_module, "_TEMPLATES_MAX", 2)
+
+    class Scenario:
+        url = "m/s#1"
+
+    scenario = Scenario()
+    rep = Reporter()
+    rep.add("scenario", scenario)
+    rep.add("x:a-b", 1.0)
+
+    for template_key in "abc":
+        _store_template(template_key, rep, Key("x:a-b"))
+
+    # Only the most recent templates are kept
+    assert ["b", "c"] == list(report_module._TEMPLATES)
+
+    # The template does not refer to the scenario; the original is unchanged
+    template, key = report_module._TEMPLATES["c"]
+    assert "m/s#1" == template.graph["scenario"]
+    assert rep.graph["scenario"] is scenario
+
+    # Indices of the graph are copied
+    assert Key("x:a-b") == template.graph.full_key("x")
+    assert Key("x:a-b") == template.graph.unsorted_key("x:b-a")
+
+
 @prepare_reporter.minimum_version
 def test_report_deprecated(caplog, request, tmp_path, test_context):
     # Create a target scenario
@@ -199,12 +276,111 @@ def test_apply_units(request, test_context, regions):
     assert ["EUR_2005"] == df["unit"].unique()
 
 
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_report_batch(test_context, max_workers):
+    # Contexts referring to scenarios on a platform that does not exist
+    contexts = []
+    for i in range(3):
+        ctx = deepcopy(test_context)
+        ctx.platform_info = dict(name="_nonexistent")
+        ctx.scenario_info = dict(model="m", scenario=f"s{i}", version=i + 1)
+        contexts.append(ctx)
+
+    result = report_batch(contexts, max_workers=max_workers)
+
+    # One row per scenario, in order
+    assert [f"ixmp://_nonexistent/m/s{i}#{i + 1}" for i in range(3)] == list(
+        result["url"]
+    )
+    # Failure for each scenario is recorded, and does not prevent reporting others
+    assert result["status"].str.startswith("ValueError(").all()
+    assert (result["time"] >= 0).all()
+
+
+def _simulated_prepare_reporter(path):
+    """Return a replacement for :func:`.prepare_reporter` using simulated solutions.
+
+    Data for each scenario are read from the subdirectory of `path` with the name of the
+    scenario, and "out" is written to a file with the same name in the output directory.
+    """
+
+    def prepare_reporter(context):
+        name = context.scenario_info["scenario"]
+
+        rep = Reporter()
+        add_simulated_solution(rep, ScenarioInfo(), path=path.joinpath(name))
+        # Stand-in for the Scenario, as used by report()
+        rep.graph["scenario"] = SimpleNamespace(platform=None)
+        rep.configure(output_dir=context.report.output_dir)
+
+        context.report.mkdir()
+        key = rep.add(
+            "cli-output",
+            "write_report",
+            rep.infer_keys("out"),
+            path=context.report.output_dir.joinpath(f"{name}.csv"),
+        )
+        return rep, key
+
+    return prepare_reporter
+
+
+@to_simulate.minimum_version
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_report_batch_simulated(monkeypatch, tmp_path, test_context, max_workers):
+    for i in range(3):
+        _write_simulated_solution(tmp_path.joinpath(f"s{i}"), act=i + 1.0)
+    monkeypatch.setattr(
+        report_module, "prepare_reporter", _simulated_prepare_reporter(tmp_path)
+    )
+
+    contexts = []
+    for i in range(3):
+        ctx = deepcopy(test_context)
+        ctx.scenario_info = dict(model="m", scenario=f"s{i}")
+        ctx.report.set_output_dir(tmp_path.joinpath("output"))
+        contexts.append(ctx)
+
+    result = report_batch(contexts, max_workers=max_workers)
+
+    # Each scenario is reported successfully, in order
+    assert [f"s{i}" for i in range(3)] == [u.split("/")[-1] for u in result["url"]]
+    assert (result["status"] == "ok").all()
+
+    # Output is written for each scenario using its own data
+    for i in range(3):
+        df = pd.read_csv(tmp_path.joinpath("output", f"s{i}.csv"))
+        assert [2.0 * (i + 1)] == df["value"].tolist()
+
+
 @pytest.mark.xfail(reason="Incomplete")
 def test_cli(mix_models_cli):
     # TODO complete by providing a Scenario that is reportable (with solution)
     mix_models_cli.assert_exit_0(["report"])
 
 
+@to_simulate.minimum_version
+def test_cli_batch(monkeypatch, tmp_path, test_context, mix_models_cli):
+    for i in range(3):
+        _write_simulated_solution(tmp_path.joinpath(f"s{i}"), act=i + 1.0)
+    monkeypatch.setattr(
+        report_module, "prepare_reporter", _simulated_prepare_reporter(tmp_path)
+    )
+    urls = tmp_path.joinpath("urls.txt")
+    urls.write_text("\n".join(f"m/s{i}" for i in range(3)))
+
+    # --jobs reports the scenarios in parallel
+    mix_models_cli.assert_exit_0(["report", f"--urls-from-file={urls}", "-j2"])
+
+    # The summary and the output for each scenario are written
+    output_dir = test_context.get_local_path("report")
+    summary = pd.read_csv(output_dir.joinpath("report-summary.csv"))
+    assert 3 == len(summary) and (summary["status"] == "ok").all()
+    for i in range(3):
+        df = pd.read_csv(output_dir.joinpath(f"s{i}.csv"))
+        assert [2.0 * (i + 1)] == df["value"].tolist()
+
+
 @pytest.mark.parametrize(
     "input, exp",
     (
@@ -249,6 +425,115 @@ def test_collapse(input, exp):
     pdt.assert_frame_equal(util.collapse(df_in), df_exp)
 
 
+def test_persist(caplog, tmp_path):
+    """Test :func:`.report.util.persist`."""
+    from genno import Computer, Key, Quantity
+    from genno.testing import assert_qty_equal
+
+    calls = []
+
+    def double(qty):
+        calls.append(None)
+        return qty * 2.0
+
+    def computer(value: float) -> Computer:
+        c = Computer()
+        c.add("a:x", Quantity(pd.Series([1.0, value], pd.Index(["p", "q"], name="x"))))
+        c.add("b:x", double, "a:x")
+        c.add("c:x", "add", "b:x", "a:x")
+        return c
+
+    # Nothing to load on the first run; "b:x" is computed
+    c = computer(2.0)
+    assert [] == util.persist(c, ["b", "foo"], tmp_path)
+    assert "No key 'foo' to persist" in caplog.messages
+    exp = c.get("c:x")
+    assert 1 == len(calls)
+
+    # Second run: "b:x" is loaded instead of computed, with the same result
+    c = computer(2.0)
+    assert [Key("b:x")] == util.persist(c, ["b"], tmp_path)
+    assert_qty_equal(exp, c.get("c:x"))
+    assert 1 == len(calls)
+
+    # Changed input data → "b:x" is computed again
+    c = computer(3.0)
+    assert [] == util.persist(c, ["b:x"], tmp_path)
+    assert 9.0 == c.get("c:x").sel(x="q").item()
+    assert 2 == len(calls)
+
+
+def test_persist_non_json(caplog, tmp_path) -> None:
+    """:func:`.persist` recomputes quantities if a non-JSON task argument changes."""
+    from dask.core import quote
+    from genno import Computer, Quantity
+    from sdmx.model.v21 import Annotation, Code, Codelist
+
+    calls = []
+
+    def scale(qty, codes, factors):
+        calls.append(None)
+        return qty * len(codes) * sum(factors)
+
+    def computer(annotation: str, factors: list, other: object) -> Computer:
+        cl: Codelist = Codelist(id="foo")
+        cl.append(Code(id="bar", annotations=[Annotation(id="a", text=annotation)]))
+        c = Computer()
+        c.add("a:x", Quantity(pd.Series([1.0], pd.Index(["p"], name="x"))))
+        c.add("b:x", scale, "a:x", cl, quote(factors))
+        c.add("c:x", lambda qty, other: qty, "b:x", other)
+        return c
+
+    # First and second runs: "b:x" is loaded on the second run
+    for expected in ([], [Key("b:x")]):
+        c = computer("baz", [1.0], 1)
+        assert expected == util.persist(c, ["b:x"], tmp_path)
+        c.get("b:x")
+    assert 1 == len(calls)
+
+    # Changed annotation of a Code in the Codelist → "b:x" is computed again
+    c = computer("qux", [1.0], 1)
+    assert [] == util.persist(c, ["b:x"], tmp_path)
+    c.get("b:x")
+    assert 2 == len(calls)
+
+    # Changed contents of a quoted list → "b:x" is computed again
+    c = computer("qux", [2.0], 1)
+    assert [] == util.persist(c, ["b:x"], tmp_path)
+    assert 2.0 == c.get("b:x").item()
+    assert 3 == len(calls)
+
+    # Argument without a description of its contents → not persisted, with a warning
+    c = computer("qux", [2.0], object())
+    assert [Key("b:x")] == util.persist(c, ["b:x", "c:x"], tmp_path)
+    assert (
+        "Cannot persist <c:x>: no description of the contents of object object"
+        in caplog.messages
+    )
+    assert not any(p.name.startswith("c-") for p in tmp_path.iterdir())
+
+
+def test_describe_value(monkeypatch) -> None:
+    """:func:`.persist` hashes distinguish solutions of the same scenario version."""
+    from message_ix import Scenario
+
+    # Scenario without a Platform, with a simulated solution
+    s = object.__new__(Scenario)
+    s.model, s.scenario, s.version = "m", "s", 1
+    objective = dict(lvl=1.0)
+    monkeypatch.setattr(Scenario, "has_solution", lambda self: bool(objective))
+    monkeypatch.setattr(Scenario, "var", lambda self, name: objective)
+
+    result = [util._describe_value(s)]
+    objective.update(lvl=2.0)  # Modified and solved again
+    result.append(util._describe_value(s))
+    objective.clear()  # Solution removed
+    result.append(util._describe_value(s))
+
+    assert ["scenario", "m/s#1", 1.0] == result[0]
+    assert 3 == len(set(map(repr, result)))
+
+
 def simulated_solution_reporter():
     """Reporter with a simulated solution for snapshot 0.
 
@@ -301,6 +586,53 @@ def test_add_simulated_solution(test_context, test_data_path):
     assert np.isclose(79.76478, value.item())
 
 
+def _write_simulated_solution(path, act: float = 1.0) -> None:
+    """Write simulated solution data for "out" to `path`, in the .csv.gz layout.
+
+    This is a variable, "ACT", with GAMS-style column names, and a parameter, "output",
+    with an extra leading index column.
+    """
+    path.mkdir(parents=True)
+    columns = "node tec vintage year_all mode time level marginal lo up scale"
+    df = pd.DataFrame(
+        [["R11_AFR", "t", 2020, 2020, "M1", "year", act, 0, 0, 0, 1]],
+        columns=columns.split(),
+    )
+    df.to_csv(path.joinpath("ACT.csv.gz"), index=False)
+    df = pd.DataFrame(
+        [["R11_AFR", "t", 2020, 2020, "M1", "R11_AFR", "c", "l", "year", "year"]],
+        columns="nl t yv ya m nd c l h hd".split(),
+    ).assign(value=2.0, unit="-")
+    df.to_csv(path.joinpath("output.csv.gz"))
+
+
+@to_simulate.minimum_version
+def test_to_arrow(tmp_path) -> None:
+    # Write simulated solution data in the .csv.gz layout
+    src = tmp_path.joinpath("csv")
+    _write_simulated_solution(src)
+    dims = "nl t yv ya m nd c l h hd".split()
+
+    # Function runs
+    dest = tmp_path.joinpath("arrow")
+    result = to_arrow(src, dest)
+
+    # One file is written for each item
+    assert {"ACT.arrow", "output.arrow"} == set(p.name for p in result)
+
+    # Data read from the Arrow files are identical to data read from CSV
+    for name, d in ("ACT", dims[:5] + ["h"]), ("output", dims):
+        exp = data_from_file(src.joinpath(f"{name}.csv.gz"), name=name, dims=d)
+        obs = data_from_file(dest.joinpath(f"{name}.arrow"), name=name, dims=d)
+        assert np.isclose(exp.item(), obs.item())
+        assert exp.dims == obs.dims
+
+    # Simulated solution can be added from the Arrow files
+    rep = Reporter()
+    add_simulated_solution(rep, ScenarioInfo(), path=dest)
+    assert np.isclose(2.0, rep.get("out:*").item())
+
+
 @to_simulate.minimum_version
 def test_prepare_reporter(test_context):
     rep = simulated_solution_reporter()
@@ -310,4 +642,4 @@ def test_prepare_reporter(test_context):
     prepare_reporter(test_context, reporter=rep)
 
     # A number of keys were added
-    assert 14299 <= len(rep.graph) - N
+    assert 14298 <= len(rep.graph) - N
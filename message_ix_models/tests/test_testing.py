@@ -1,6 +1,17 @@
 import os
 
-from message_ix_models.testing import bare_res, not_ci
+import ixmp.backend.io
+import pandas as pd
+import pandas.testing as pdt
+
+from message_ix_models.model import data
+from message_ix_models.testing import (
+    _bare_res_path,
+    _load_or_create_res,
+    _write_excel,
+    bare_res,
+    not_ci,
+)
 
 
 def test_bare_res_no_request(test_context):
@@ -17,6 +28,70 @@ def test_bare_res_solved(request, test_context):
     bare_res(request, test_context, solved=True)
 
 
+def test_bare_res_cache(monkeypatch, tmp_path, test_context):
+    """The bare RES is written to file once, then read from the file."""
+    monkeypatch.setattr(test_context.core, "cache_path", tmp_path)
+    path = _bare_res_path(test_context)
+    assert not path.exists()
+
+    # Scenario is created and written to file
+    s0 = _load_or_create_res(test_context, "test_bare_res_cache 0")
+    assert path.exists()
+    mtime = path.stat().st_mtime
+
+    # Scenario is read from the file, which is not modified
+    s1 = _load_or_create_res(test_context, "test_bare_res_cache 1")
+    assert mtime == path.stat().st_mtime
+    assert "test_bare_res_cache 1" == s1.model
+    for name in "node", "technology", "year":
+        assert set(s0.set(name)) == set(s1.set(name))
+
+
+def test_bare_res_path(monkeypatch, test_context):
+    """The cache key depends on the data for the bare RES."""
+    path = _bare_res_path(test_context)
+    assert path == _bare_res_path(test_context)
+
+    def get_data(scenario, context, spec, **options):
+        return dict(MERtoPPP=pd.DataFrame([["R14_AFR", 2020, 1.0, "-"]]))
+
+    monkeypatch.setattr(data, "get_data", get_data)
+    assert path != _bare_res_path(test_context)
+
+
+def test_write_excel(monkeypatch, tmp_path):
+    """Items with more rows than :data:`.EXCEL_MAX_ROWS` are split across sheets."""
+    monkeypatch.setattr(ixmp.backend.io, "EXCEL_MAX_ROWS", 3)
+
+    tech = pd.DataFrame({"technology": [f"t{i}" for i in range(5)]})
+    data = {
+        "inv_cost": ("par", pd.DataFrame({"technology": ["t0"], "value": [1.0]})),
+        "mode": ("set", pd.DataFrame(columns=["mode"])),
+        "technology": ("set", tech),
+    }
+    ix_type_mapping = pd.DataFrame(
+        [(k, v[0]) for k, v in data.items()], columns=["item", "ix_type"]
+    )
+    path = tmp_path.joinpath("test.xlsx")
+
+    _write_excel(path, data, ix_type_mapping)
+
+    xf = pd.ExcelFile(path)
+    # 2 rows per sheet, plus the header; empty sets are written last
+    assert [
+        "inv_cost",
+        "technology",
+        "technology(2)",
+        "technology(3)",
+        "mode",
+        "ix_type_mapping",
+    ] == xf.sheet_names
+    result = pd.concat(
+        [xf.parse(f"technology{s}") for s in ("", "(2)", "(3)")], ignore_index=True
+    )
+    pdt.assert_frame_equal(tech, result, check_dtype=False)
+
+
 def test_cli_runner(mix_models_cli):
     result = mix_models_cli.invoke(["foo", "bar"])
     assert "No such command 'foo'" in result.output
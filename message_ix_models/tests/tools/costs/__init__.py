@@ -0,0 +1,32 @@
+import numpy as np
+import pandas as pd
+
+from message_ix_models.model.structure import get_codes
+from message_ix_models.tools.costs import Config
+from message_ix_models.tools.costs.regional_differentiation import (
+    get_raw_technology_mapping,
+)
+
+
+def reg_diff_data(config: Config) -> pd.DataFrame:
+    """Synthetic output of :func:`.apply_regional_differentiation` for `config`.
+
+    This allows to test downstream functions without the WEO and Intratec source data.
+    """
+    nodes = get_codes(f"node/{config.node}")
+    regions = list(map(str, nodes[nodes.index("World")].child))
+    techs = get_raw_technology_mapping(config.module).message_technology.unique()
+
+    return pd.DataFrame(
+        [(t, n) for t in techs for n in regions],
+        columns=["message_technology", "region"],
+    ).assign(
+        reg_diff_source="weo",
+        reg_diff_technology="",
+        base_year_reference_region_cost=1000.0,
+        reg_cost_ratio=lambda df: np.where(
+            df.region == config.ref_region, 1.0, np.linspace(0.5, 1.5, len(df))
+        ),
+        fix_ratio=0.05,
+        reg_cost_base_year=lambda df: 1000.0 * df.reg_cost_ratio,
+    )
@@ -1,7 +1,9 @@
 from typing import Literal
 
+import numpy as np
 import pytest
 
+from message_ix_models.tests.tools.costs import reg_diff_data
 from message_ix_models.tools.costs import Config
 from message_ix_models.tools.costs.decay import (
     get_cost_reduction_data,
@@ -74,3 +76,44 @@ def test_project_ref_region_inv_costs_using_reduction_rates(
 
     # The first technology year is equal to or greater than the default first model year
     assert config.y0 <= result.first_technology_year.min()
+
+
+@pytest.mark.parametrize("node", ("R12", "R20"))
+def test_project_ref_region_inv_costs_values(node) -> None:
+    config = Config(node=node)
+    reg_diff = reg_diff_data(config)
+
+    # The function runs without error
+    result = project_ref_region_inv_costs_using_reduction_rates(reg_diff, config)
+
+    # Data have the expected structure
+    assert [
+        "message_technology",
+        "scenario",
+        "reference_region",
+        "first_technology_year",
+        "year",
+        "inv_cost_ref_region_decay",
+    ] == list(result.columns)
+    assert set(config.seq_years) == set(result.year.unique())
+
+    # Compare to the base-year cost and the reduced cost in the final year
+    exp = (
+        reg_diff.query("region == @config.ref_region")
+        .merge(get_cost_reduction_data(config.module), on="message_technology")
+        .merge(
+            get_technology_reduction_scenarios_data(config.y0, config.module),
+            on=["message_technology", "reduction_rate"],
+        )
+        .assign(c_final=lambda df: df.reg_cost_base_year * (1 - df.cost_reduction))
+    )
+    cols = ["message_technology", "scenario"]
+    df = result.merge(exp[cols + ["reg_cost_base_year", "c_final"]], on=cols)
+
+    # Costs up to the base year are the base-year cost
+    base = df.query("year <= @config.base_year")
+    assert np.allclose(base.inv_cost_ref_region_decay, base.reg_cost_base_year)
+
+    # Costs in the final year are reduced by the full amount
+    final = df.query("year == @config.final_year")
+    assert np.allclose(final.inv_cost_ref_region_decay, final.c_final)
@@ -1,7 +1,10 @@
+import numpy as np
+import pandas as pd
 import pytest
 
 from message_ix_models.model.structure import get_codes
-from message_ix_models.tools.costs import Config
+from message_ix_models.tests.tools.costs import reg_diff_data
+from message_ix_models.tools.costs import Config, gdp
 from message_ix_models.tools.costs.gdp import (
     adjust_cost_ratios_with_gdp,
     process_raw_ssp_data,
@@ -94,3 +97,51 @@ def test_adjust_cost_ratios_with_gdp(test_context, module) -> None:
     assert all(
         result.query("region == @config.ref_region").reg_cost_ratio_adj.values == 1.0
     )
+
+
+@pytest.mark.parametrize("node", ("R12", "R20"))
+def test_adjust_cost_ratios_with_gdp_constrain(monkeypatch, test_context, node) -> None:
+    config = Config(node=node, scenario="all")
+    regions = set(reg_diff_data(config).region)
+
+    # Synthetic GDP data with ratios both above and below the reference region's
+    data = pd.DataFrame(
+        [
+            (s, n, y)
+            for s in ("SSP1", "SSP2", "SSP3", "SSP4", "SSP5", "LED")
+            for n in sorted(regions)
+            for y in config.seq_years
+        ],
+        columns=["scenario", "region", "year"],
+    ).assign(
+        scenario_version="2023",
+        total_gdp=1.0,
+        total_population=1.0,
+        gdp_ppp_per_capita=1.0,
+        gdp_ratio_reg_to_reference=lambda df: np.where(
+            df.region == config.ref_region, 1.0, np.linspace(0.2, 1.8, len(df))
+        ),
+    )
+    monkeypatch.setattr(gdp, "process_raw_ssp_data", lambda *args: data)
+
+    # Function runs
+    result = adjust_cost_ratios_with_gdp(reg_diff_data(config), config)
+
+    # All regions, technologies, and scenarios are present
+    assert regions == set(result.region.unique())
+    assert len(data) * result.message_technology.nunique() == len(result)
+
+    # Cost ratios for the reference region are equal to 1
+    assert (result.query("region == @config.ref_region").reg_cost_ratio_adj == 1).all()
+
+    # Where the base-period GDP ratio is < 1 and the adjusted cost ratio is > 1, the
+    # latter is not exceeded in any future period
+    cols = ["scenario_version", "scenario", "region", "message_technology"]
+    df = result.merge(
+        result.query("year == @config.base_year").rename(
+            columns=lambda c: f"{c}_base" if c not in cols else c
+        ),
+        on=cols,
+    ).query("gdp_ratio_reg_to_reference_base < 1 and reg_cost_ratio_adj_base > 1")
+    assert 0 < len(df)
+    assert (df.reg_cost_ratio_adj <= df.reg_cost_ratio_adj_base).all()
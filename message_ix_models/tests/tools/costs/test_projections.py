@@ -1,9 +1,18 @@
+import numpy as np
+import pandas.testing as pdt
 import pytest
 from message_ix import make_df
 
 from message_ix_models import testing
 from message_ix_models.model.structure import get_codelist
-from message_ix_models.tools.costs import Config, create_cost_projections
+from message_ix_models.tests.tools.costs import reg_diff_data
+from message_ix_models.tools.costs import (
+    Config,
+    create_cost_projections,
+    create_cost_projections_batch,
+    projections,
+)
+from message_ix_models.tools.costs.projections import create_projections_converge
 from message_ix_models.util import add_par_data
 
 
@@ -109,3 +118,62 @@ def test_bare_res(request, test_context, node):
 
     # Scenario solves with the added data
     scenario.solve()
+
+
+def test_create_projections_converge(monkeypatch) -> None:
+    config = Config(node="R20", method="convergence", scenario="SSP2")
+    monkeypatch.setattr(projections, "apply_regional_differentiation", reg_diff_data)
+
+    # Function runs
+    result = create_projections_converge(config)
+
+    # Between the base year and the convergence year, costs in each non-reference
+    # region change linearly from the region's own cost to the cost in the reference
+    # region
+    df = (
+        result.query(
+            "@config.base_year <= year <= @config.convergence_year"
+            " and region != @config.ref_region"
+        )
+        .pivot_table(
+            index=["scenario", "message_technology", "region"],
+            columns="year",
+            values="inv_cost",
+        )
+        .dropna()
+    )
+    assert 0 < len(df)
+    steps = df.diff(axis=1).iloc[:, 1:].to_numpy()
+    assert np.allclose(steps, steps[:, :1])
+
+
+@pytest.mark.parametrize("max_workers", (1, 2))
+def test_create_cost_projections_batch(monkeypatch, max_workers) -> None:
+    # Count calls to apply_regional_differentiation
+    calls = []
+
+    def _reg_diff(config):
+        calls.append(config.node)
+        return reg_diff_data(config)
+
+    monkeypatch.setattr(projections, "apply_regional_differentiation", _reg_diff)
+
+    configs = [
+        Config(node="R12", method="constant", scenario="SSP1", format="message"),
+        Config(node="R12", method="convergence", scenario="SSP2", format="message"),
+        Config(node="R20", method="constant", scenario="LED", format="iamc"),
+        Config(node="R20", method="convergence", scenario="SSP5", format="message"),
+    ]
+
+    # Function runs
+    result = create_cost_projections_batch(configs, max_workers=max_workers)
+
+    # Source data was processed once per distinct node
+    assert ["R12", "R20"] == calls
+
+    # Results are the same as from create_cost_projections()
+    assert len(configs) == len(result)
+    for config, r in zip(configs, result):
+        exp = create_cost_projections(config)
+        for name in "inv_cost", "fix_cost":
+            pdt.assert_frame_equal(exp[name], r[name])
@@ -1,14 +1,19 @@
 import genno
+import numpy as np
 import pandas as pd
 import pytest
+from genno.testing import assert_qty_equal
 
 from message_ix_models.tools.exo_data import prepare_computer
-from message_ix_models.tools.iea.eei import IEA_EEI  # noqa: F401
-from message_ix_models.util import HAS_MESSAGE_DATA
-
-pytestmark = pytest.mark.skipif(
-    condition=not HAS_MESSAGE_DATA, reason="No fuzzed/random test data for this source."
+from message_ix_models.tools.iea import eei
+from message_ix_models.tools.iea.eei import (
+    IEA_EEI,  # noqa: F401
+    aggregate_wavg,
+    iea_eei_data_raw,
+    wavg,
+    wavg_measures,
 )
+from message_ix_models.util import HAS_MESSAGE_DATA
 
 # Infill data for R12 nodes not present in the IEA data
 # NB these are hand-picked as of 2022-07-20 so that the ratio of freight activity / GDP
@@ -30,6 +35,9 @@ R12_MAP = [
 ]
 
 
+@pytest.mark.skipif(
+    condition=not HAS_MESSAGE_DATA, reason="No fuzzed/random test data for this source."
+)
 class TestIEA_EEI:
     @pytest.mark.parametrize(
         "source_kw, dimensionality",
@@ -74,3 +82,92 @@ class TestIEA_EEI:
         assert 400 <= result.size
         assert {"n", "y"} | dimensionality == set(result.dims)
         assert N_n == len(result.coords["n"])
+
+
+def test_aggregate_wavg() -> None:
+    idx = pd.MultiIndex.from_product([["AUT", "FRA", "USA"], [2020, 2030]])
+    q = genno.Quantity(
+        pd.Series([1.0, 2.0, 3.0, np.nan, 5.0, 6.0], index=idx.set_names(["n", "y"])),
+        units="km",
+    )
+    w = genno.Quantity(
+        pd.Series([1.0, 3.0, 4.0], index=pd.Index(idx.levels[0], name="n"))
+    )
+    groups = {"n": {"EU": ["AUT", "FRA"], "World": ["AUT", "FRA", "USA"]}}
+
+    result = aggregate_wavg(q, w, groups)
+
+    # NaN data are omitted; each member belongs to any number of groups
+    expected = pd.Series(
+        [(1 + 9) / 4, 2.0, (1 + 9 + 20) / 8, (2 + 24) / 5],
+        index=pd.MultiIndex.from_product([["EU", "World"], [2020, 2030]]),
+    )
+    assert_qty_equal(
+        genno.Quantity(expected.rename_axis(["n", "y"]), units="km"), result
+    )
+
+    # Weights must not have dimensions other than those of the data
+    with pytest.raises(ValueError, match="not in"):
+        aggregate_wavg(q, genno.Quantity(w.expand_dims(t=["a"])), groups)
+
+
+def test_iea_eei_data_raw(monkeypatch, test_context, tmp_path) -> None:
+    """Data are parsed from the workbook once, then read from the cache."""
+    path = tmp_path.joinpath("eei.xlsx")
+    with pd.ExcelWriter(path) as writer:
+        pd.DataFrame(
+            [
+                ["Austria", "Cars", "Passenger load factor (pkm/vkm)", 1.5, ".."],
+                ["France ", "Cars", "Passenger load factor (pkm/vkm)", 1.6, 1.7],
+            ],
+            columns=["Country", "Mode/vehicle type", "Indicator", 2000, 2001],
+        ).to_excel(writer, sheet_name="Transport - Indicators", startrow=1, index=False)
+
+    result = iea_eei_data_raw(path)
+
+    assert 3 == len(result)
+    assert {"AUT", "FRA"} == set(result["n"])
+    assert {"transport"} == set(result["SECTOR"])
+    assert {"pkm/vkm"} == set(result["UNIT_MEASURE"])
+
+    # Second call reads identical data from the cache, without parsing the workbook
+    monkeypatch.setattr(eei, "_parse_workbook", None)
+    pd.testing.assert_frame_equal(result, iea_eei_data_raw(path))
+
+
+def test_wavg() -> None:
+    def _df(values, **kwargs):
+        return pd.DataFrame(
+            dict(region="R12_WEU", year=[2020, 2020, 2030], value=values) | kwargs
+        )
+
+    df = pd.concat(
+        [
+            _df([1.0, 2.0, 3.0], variable="Vehicle use", units="km"),
+            _df([4.0, np.nan, 6.0], variable="Per capita energy intensity", units="GJ"),
+        ]
+    ).assign(**{"Mode/vehicle type": ["Cars", "Buses", "Cars"] * 2})
+    weight_data = {
+        "population": _df([2.0, 2.0, 1.0]).drop(columns="region"),
+        "vehicle stock": _df([1.0, 3.0, np.nan]).assign(
+            **{"Mode/vehicle type": ["Cars", "Buses", "Cars"]}
+        ),
+    }
+
+    result = wavg_measures(df, weight_data)
+
+    assert 6 == len(result)
+    result = result.set_index(["Mode/vehicle type", "year", "variable"])
+    # Weights are selected by WAVG_MAP
+    assert 2.0 == result.loc[("Buses", 2020, "Vehicle use"), "value"]
+    # Weighted average is NaN where all weights are NaN
+    assert np.isnan(result.loc[("Cars", 2030, "Vehicle use"), "value"])
+    # Fallback to population weights
+    assert 4.0 == result.loc[("Cars", 2020, "Per capita energy intensity"), "value"]
+    assert "GJ" == result.loc[("Cars", 2030, "Per capita energy intensity"), "units"]
+
+    # Same results for a single measure
+    pd.testing.assert_frame_equal(
+        wavg("Vehicle use", df.query("variable == 'Vehicle use'"), weight_data),
+        wavg_measures(df.query("variable == 'Vehicle use'"), weight_data),
+    )
@@ -1,9 +1,11 @@
 import pytest
 from genno import Computer
 
+from message_ix_models.tools import exo_data
 from message_ix_models.tools.exo_data import (
     DemoSource,
     ExoDataSource,
+    iamc_like_data_for_query,
     prepare_computer,
     register_source,
 )
@@ -19,6 +21,33 @@ class TestExoDataSource:
             register_source(DemoSource)
 
 
+def test_iamc_like_data_for_query(tmp_path) -> None:
+    """Data for several queries are read from one file at once."""
+    path = tmp_path.joinpath("data.csv")
+    path.write_text(
+        """Model,Scenario,Region,Variable,Unit,2020,2030
+m,s1,Austria,Population,million,8.9,9.2
+m,s2,Austria,Population,million,8.9,9.5
+m,s1,World,Population,million,7800,8500
+"""
+    )
+
+    exo_data._read_iamc_like.cache_clear()
+    result = [
+        iamc_like_data_for_query(path, f"Scenario == 's{i}'", replace={"s2": "s1"})
+        for i in (1, 2)
+    ]
+
+    # The file was read once
+    assert 1 == exo_data._read_iamc_like.cache_info().misses
+    assert 1 == exo_data._read_iamc_like.cache_info().hits
+
+    # Data for each query; the non-ISO 3166 region "World" is discarded
+    assert [9.2, 9.5] == [r.sel(n="AUT", y=2030).item() for r in result]
+    assert {"million"} == {str(r.units) for r in result}
+    assert all(("n", "y") == r.dims for r in result)
+
+
 @pytest.mark.parametrize("regions, N_n", [("R12", 12), ("R14", 14)])
 def test_prepare_computer(test_context, regions, N_n):
     """:func:`.exo_data.prepare_computer` works as intended."""
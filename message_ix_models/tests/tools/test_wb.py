@@ -3,9 +3,12 @@ from typing import TYPE_CHECKING, Optional
 import pytest
 
 from message_ix_models.model.structure import get_codelist
+from message_ix_models.tools import wb
 from message_ix_models.tools.wb import (
     assign_income_groups,
+    fetch_codelist,
     get_income_group_codelist,
+    get_response,
     make_map,
 )
 
@@ -140,3 +143,96 @@ def test_make_map() -> None:
         "urn:sdmx:org.sdmx.infomodel.codelist.Code=WB:CL_REF_AREA_WDI(1.0).UMC": "LMIC",
         "urn:sdmx:org.sdmx.infomodel.codelist.Code=WB:CL_REF_AREA_WDI(1.0).LIC": "LMIC",
     } == result
+
+
+@pytest.fixture
+def stand_in(monkeypatch, tmp_path):
+    """Local stand-in responses for :mod:`.tools.wb`, without network access."""
+    import sdmx
+    import sdmx.model.v21 as m
+
+    monkeypatch.setattr(wb, "MODE", "offline")
+    monkeypatch.setattr(wb, "STORE", tmp_path)
+
+    # Population data
+    dsd = m.DataStructureDefinition(id="WDI")
+    for id in ("REF_AREA", "SERIES", "FREQ"):
+        dsd.dimensions.getdefault(id)
+    dsd.dimensions.getdefault("TIME_PERIOD", cls=m.TimeDimension)
+    dsd.measures.getdefault("OBS_VALUE")
+    ds = m.DataSet(structured_by=dsd)
+    for area, value in (("AUT", 9.0e6), ("CHE", 8.7e6), ("FRA", 67.4e6)):
+        key = dsd.make_key(
+            m.Key,
+            dict(REF_AREA=area, SERIES="SP_POP_TOTL", FREQ="A", TIME_PERIOD="2020"),
+        )
+        ds.add_obs([m.Observation(dimension=key, value=value)])
+    msg = sdmx.message.DataMessage(data=[ds])
+    msg.dataflow.structure = dsd
+    tmp_path.joinpath("WB_WDI-WDI-A.SP_POP_TOTL.-2020.xml").write_bytes(
+        sdmx.to_xml(msg)
+    )
+
+    # Structure message with code lists
+    sm = sdmx.message.StructureMessage()
+    cl: "sdmx.model.common.Codelist" = m.Codelist(id="CL_REF_AREA_WDI")
+    for id in ("AUT", "CHE", "FRA", "HIC", "UMC"):
+        cl.append(m.Code(id=id))
+    sm.add(cl)
+    tmp_path.joinpath("codelist-WB.xml").write_bytes(sdmx.to_xml(sm))
+
+    yield tmp_path
+
+
+def test_assign_income_groups_stand_in(stand_in) -> None:
+    import sdmx.model.v21 as m
+
+    # Income groups from the stand-in code list
+    cl_ig = fetch_codelist("CL_REF_AREA_WDI")
+    for id, ig in (("AUT", "HIC"), ("CHE", "HIC"), ("FRA", "UMC")):
+        cl_ig[id].annotations.append(m.Annotation(id="wb-income-group", text=ig))
+
+    cl_node: "sdmx.model.common.Codelist" = m.Codelist(id="node")
+    cl_node.extend(m.Code(id=id) for id in ("AUT", "CHE", "FRA", "R1"))
+    for id in ("AUT", "CHE", "FRA"):
+        cl_node["R1"].append_child(cl_node[id])
+
+    # Function runs using only stored responses
+    assign_income_groups(cl_node, cl_ig, "population")
+    assert "UMC" == str(cl_node["R1"].get_annotation(id="wb-income-group").text)
+
+    assign_income_groups(cl_node, cl_ig, "count")
+    assert "HIC" == str(cl_node["R1"].get_annotation(id="wb-income-group").text)
+
+
+def test_get_response(monkeypatch, tmp_path) -> None:
+    monkeypatch.setattr(wb, "STORE", tmp_path)
+    calls = []
+
+    def retrieve(path):
+        calls.append(path)
+        path.write_text(str(len(calls)))
+
+    # Missing response is not retrieved in offline mode
+    monkeypatch.setattr(wb, "MODE", "offline")
+    with pytest.raises(FileNotFoundError):
+        get_response("foo.txt", retrieve)
+
+    # Missing response is retrieved and stored; then replayed
+    monkeypatch.setattr(wb, "MODE", "cache")
+    for _ in range(2):
+        assert "1" == get_response("foo.txt", retrieve).read_text()
+    assert 1 == len(calls)
+
+    # Stored response is replaced
+    monkeypatch.setattr(wb, "MODE", "refresh")
+    assert "2" == get_response("foo.txt", retrieve).read_text()
+    assert ["foo.txt"] == [p.name for p in tmp_path.iterdir()]
+
+    # Stored response is replayed
+    monkeypatch.setattr(wb, "MODE", "offline")
+    assert "2" == get_response("foo.txt", retrieve).read_text()
+
+    monkeypatch.setattr(wb, "MODE", "foo")
+    with pytest.raises(ValueError, match="MODE='foo'"):
+        get_response("foo.txt", retrieve)
@@ -0,0 +1,151 @@
+from collections import Counter
+from contextlib import contextmanager
+from itertools import product
+from typing import Any
+
+import message_ix
+import numpy as np
+import pandas as pd
+
+#: Dimensions of the parameters of :class:`MockScenario`.
+IDX_NAMES = {
+    "duration_period": ["year"],
+    "technical_lifetime": ["node_loc", "technology", "year_vtg"],
+    "inv_cost": ["node_loc", "technology", "year_vtg"],
+    "fix_cost": ["node_loc", "technology", "year_vtg", "year_act"],
+    "input": [
+        "node_loc",
+        "technology",
+        "year_vtg",
+        "year_act",
+        "mode",
+        "node_origin",
+        "commodity",
+        "level",
+        "time",
+        "time_origin",
+    ],
+}
+
+
+class MockScenario:
+    """Stand-in for :class:`message_ix.Scenario` with parameter data in memory.
+
+    Only the methods used by :mod:`message_ix_models.util.compat.message_data` are
+    provided. :meth:`vintage_and_active_years` and :meth:`years_active` are those of
+    :class:`message_ix.Scenario`.
+    """
+
+    vintage_and_active_years: Any = message_ix.Scenario.vintage_and_active_years
+    years_active: Any = message_ix.Scenario.years_active
+
+    def __init__(self, nodes, years, firstmodelyear, data) -> None:
+        self._set = {"node": list(nodes), "year": list(years)}
+        self.firstmodelyear = firstmodelyear
+        self.data = {
+            name: data.get(name, pd.DataFrame(columns=dims + ["value", "unit"]))
+            for name, dims in IDX_NAMES.items()
+        }
+        #: Number of calls to :meth:`par`, by parameter name.
+        self.calls: Counter = Counter()
+
+    def set(self, name):
+        return pd.Series(self._set[name])
+
+    def par_list(self):
+        return list(IDX_NAMES)
+
+    def idx_names(self, name):
+        return list(IDX_NAMES[name])
+
+    def par(self, name, filters=None):
+        self.calls[name] += 1
+        df = self.data[name]
+        for dim, values in (filters or {}).items():
+            if dim not in IDX_NAMES[name]:
+                raise ValueError(f"{dim!r} is not a dimension of {name!r}")
+            values = [values] if np.ndim(values) == 0 else list(values)
+            df = df[df[dim].isin(values)]
+        return df.reset_index(drop=True)
+
+    def remove_par(self, name, data):
+        dims = IDX_NAMES[name]
+        df = self.data[name].merge(
+            data[dims].drop_duplicates(), how="left", on=dims, indicator=True
+        )
+        self.data[name] = df.query("_merge == 'left_only'").drop(columns="_merge")
+
+    def add_par(self, name, data):
+        dims = IDX_NAMES[name]
+        # Same dtypes as returned by ixmp and message_ix
+        dtypes = {d: int if d.startswith("year") else str for d in dims}
+        self.data[name] = (
+            pd.concat([self.data[name], data[dims + ["value", "unit"]]])
+            .drop_duplicates(subset=dims, keep="last")
+            .astype(dict(value=float, unit=str, **dtypes))
+            .reset_index(drop=True)
+        )
+
+    def check_out(self):
+        pass
+
+    def commit(self, message):
+        pass
+
+    @contextmanager
+    def transact(self, message):
+        yield
+
+
+def make_scenario(
+    nodes=("R1", "R2"),
+    technologies=("t1", "t2"),
+    years=(2010, 2015, 2020, 2030, 2040, 2050, 2060),
+    firstmodelyear=2020,
+    lifetime=20,
+) -> MockScenario:
+    """Return a :class:`MockScenario` with complete data for `technologies`.
+
+    "inv_cost" has one value for each vintage; "fix_cost" one value for each valid
+    pair of vintage and active years, i.e. within the technical `lifetime`.
+    """
+    years = list(years)
+    duration = np.diff(years, prepend=years[0] - 5)
+
+    def _df(columns, rows, value, unit):
+        df = pd.DataFrame(rows, columns=columns)
+        return df.assign(value=value(df), unit=unit)
+
+    keys = list(product(nodes, technologies, years))
+    data = dict(
+        duration_period=_df(["year"], years, lambda df: duration.astype(float), "y"),
+        technical_lifetime=_df(
+            IDX_NAMES["technical_lifetime"], keys, lambda df: float(lifetime), "y"
+        ),
+        inv_cost=_df(
+            IDX_NAMES["inv_cost"],
+            keys,
+            lambda df: (
+                1000.0 - (df.year_vtg - 2000) * (1 + df.technology.str[1:].astype(int))
+            ),
+            "USD/kW",
+        ),
+    )
+
+    # Valid (year_vtg, year_act): the age at the end of the prior period is less than
+    # the lifetime
+    start = dict(zip(years, np.cumsum(duration) - duration))
+    rows = [
+        (n, t, yv, ya)
+        for n, t, yv in keys
+        for ya in years
+        if yv <= ya and start[ya] - start[yv] < lifetime
+    ]
+    data["fix_cost"] = _df(
+        IDX_NAMES["fix_cost"],
+        rows,
+        lambda df: 30.0 + 0.1 * (df.year_act - df.year_vtg),
+        "USD/kW",
+    )
+
+    return MockScenario(nodes, years, firstmodelyear, data)
@@ -0,0 +1,151 @@
+import numpy as np
+import pandas as pd
+import pandas.testing as pdt
+import pytest
+
+from message_ix_models.util.compat.message_data.change_technology_lifetime import (
+    _BufferedScenario,
+    buffered_batch,
+    last_active_years,
+    main,
+)
+
+from . import make_scenario
+
+#: Changes to apply with :func:`.buffered_batch`, or :func:`.main` for each row.
+CHANGES = pd.DataFrame(
+    [
+        ["t1", "R1", 30, None],
+        ["t2", "R2", 10, None],
+        ["t1", "R2", 40, 2030],
+    ],
+    columns=["technology", "node", "lifetime", "year_vtg_start"],
+)
+
+
+def _last_active_years(horizon, duration, vtg_years, lifetime):
+    """Previous, loop-based implementation of :func:`.last_active_years`."""
+    # Generating duration_period_sum matrix for masking
+    df_dur = pd.DataFrame(index=horizon[:-1], columns=horizon)
+    for i in df_dur.index:
+        for j in [x for x in df_dur.columns if x >= i]:
+            df_dur.loc[i, j] = int(duration.loc[i:j].sum())
+
+    result = []
+    for y, lt in zip(vtg_years, lifetime):
+        tmp = df_dur.loc[y].to_frame(name="max")
+        tmp["min"] = tmp["max"] - duration + 1
+        tmp.loc[max(horizon), "max"] = 100
+        result.append(tmp.loc[(lt >= tmp["min"]) & (lt <= tmp["max"])].index[0])
+    return result
+
+
+@pytest.mark.parametrize(
+    "horizon",
+    (
+        [2010, 2020, 2030, 2040, 2050, 2060],
+        [2010, 2015, 2020, 2025, 2030, 2040, 2050, 2060, 2070, 2080, 2090, 2100],
+    ),
+)
+@pytest.mark.parametrize("lifetime", (5, 10, 15, 20, 25, 30, 40, 60))
+def test_last_active_years(horizon, lifetime) -> None:
+    duration = pd.Series(np.diff(horizon, prepend=horizon[0] - 5), index=horizon)
+    vtg_years = horizon[:-1]
+    # Lifetime differs between vintages
+    lt = [lifetime + 5 * (i % 2) for i, _ in enumerate(vtg_years)]
+
+    exp = _last_active_years(horizon, duration, vtg_years, lt)
+    assert exp == last_active_years(horizon, duration, vtg_years, lt)
+
+
+def test_last_active_years_error() -> None:
+    horizon = [2010, 2020, 2030]
+    duration = pd.Series([10, 10, 10], index=horizon)
+
+    # Lifetime shorter than the duration of the vintage period
+    with pytest.raises(ValueError, match=r"vintage year\(s\) \[2020\]"):
+        last_active_years(horizon, duration, [2010, 2020], [10, 0])
+
+
+def test_buffered_scenario() -> None:
+    scenario = make_scenario()
+    buffer = _BufferedScenario(scenario, ["t1"])
+
+    # Data are retrieved once for all technologies, then filtered in memory
+    for node in ("R1", "R2"):
+        df = buffer.par("inv_cost", {"node_loc": node, "technology": "t1"})
+        pdt.assert_frame_equal(
+            scenario.par("inv_cost", {"node_loc": node, "technology": "t1"}), df
+        )
+    assert 1 + 2 == scenario.calls["inv_cost"]
+
+    # Parameter without a "technology" dimension
+    exp = scenario.par("duration_period", {"year": [2020, 2030]})
+    pdt.assert_frame_equal(exp, buffer.par("duration_period", {"year": [2020, 2030]}))
+    assert buffer.par("duration_period", {"technology": "t1"}).empty
+
+    # Changes are recorded, not applied
+    df = buffer.par("inv_cost", {"node_loc": "R1"})
+    buffer.remove_par("inv_cost", df.iloc[:2])
+    buffer.add_par("inv_cost", df.iloc[1:2].assign(value=0.0))
+    buffer.add_par("inv_cost", df.iloc[2:3].assign(year_vtg=2070))
+    pdt.assert_frame_equal(make_scenario().data["inv_cost"], scenario.data["inv_cost"])
+
+    exp = pd.DataFrame(
+        [["inv_cost", "t1", "R1", 1, 1, 1]],
+        columns=["parameter", "technology", "node", "added", "removed", "changed"],
+    )
+    pdt.assert_frame_equal(exp, buffer.diff(), check_dtype=False)
+
+
+def test_buffered_batch() -> None:
+    # Apply each change with main()
+    exp = make_scenario()
+    for row in CHANGES.itertuples():
+        main(
+            exp,
+            row.technology,
+            lifetime=row.lifetime,
+            year_vtg_start=None if pd.isna(row.year_vtg_start) else row.year_vtg_start,
+            nodes=row.node,
+            par_exclude=[],
+        )
+
+    # Dry run
+    scenario = make_scenario()
+    result = buffered_batch(scenario, CHANGES, dry_run=True)
+
+    # Each parameter is retrieved from the scenario once
+    assert 1 == scenario.calls["fix_cost"]
+
+    # The scenario is not modified
+    for name, df in make_scenario().data.items():
+        pdt.assert_frame_equal(df, scenario.data[name])
+
+    # The summary contains the same (parameter, technology, node) as the changes made
+    # by main()
+    before = make_scenario().data
+    changed = set()
+    for name, df in exp.data.items():
+        if "technology" not in df.columns:
+            continue
+        merged = before[name].merge(df, how="outer", indicator=True)
+        for t, n in merged.query("_merge != 'both'")[["technology", "node_loc"]].values:
+            changed.add((name, t, n))
+    assert {("technical_lifetime", t, n) for t, n, *_ in CHANGES.values} <= changed
+    summary = result.set_index(["parameter", "technology", "node"])
+    assert changed == set(summary.index[summary.sum(axis=1) > 0])
+
+    # Applying the changes gives the same data as main()
+    buffered_batch(scenario, CHANGES)
+    for name, df in exp.data.items():
+        dims = list(df.columns[:-2])
+        pdt.assert_frame_equal(
+            df.sort_values(dims).reset_index(drop=True),
+            scenario.data[name].sort_values(dims).reset_index(drop=True),
+            check_dtype=False,
+        )
+
+    # More than one change for the same technology and node
+    with pytest.raises(ValueError, match="More than one change"):
+        buffered_batch(make_scenario(), pd.concat([CHANGES, CHANGES.iloc[:1]]))
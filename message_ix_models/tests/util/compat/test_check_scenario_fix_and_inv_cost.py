@@ -0,0 +1,99 @@
+import pandas as pd
+import pandas.testing as pdt
+import pytest
+
+from message_ix_models.util.compat.message_data.check_scenario_fix_and_inv_cost import (
+    _vintage_and_active_years,
+    batch,
+)
+
+from . import make_scenario
+
+
+@pytest.mark.parametrize(
+    "years",
+    (
+        (2010, 2015, 2020, 2030, 2040, 2050, 2060),
+        (2015, 2020, 2025, 2030, 2035, 2040, 2050, 2060, 2070, 2080, 2090, 2100),
+    ),
+)
+def test_vintage_and_active_years(years) -> None:
+    scenario = make_scenario(years=years)
+
+    # Lifetime differs between technologies and vintages; t2 has fewer vintages
+    tl = scenario.data["technical_lifetime"]
+    tl = tl.assign(value=tl.value + 5.0 * (tl.technology == "t2") * (tl.year_vtg % 3))
+    scenario.data["technical_lifetime"] = tl[
+        (tl.technology == "t1") | tl.year_vtg.between(2020, 2050)
+    ]
+
+    result = _vintage_and_active_years(
+        scenario.par("technical_lifetime"),
+        scenario.par("duration_period"),
+        y_min=scenario.firstmodelyear,
+    )
+
+    # Same as Scenario.vintage_and_active_years() for each (node, technology)
+    for (n, t), df in result.groupby(["node_loc", "technology"]):
+        exp = scenario.vintage_and_active_years((n, t))
+        pdt.assert_frame_equal(
+            exp,
+            df[["year_vtg", "year_act"]].reset_index(drop=True),
+            check_dtype=False,
+        )
+    assert 4 == len(result.groupby(["node_loc", "technology"]))
+
+
+def test_batch() -> None:
+    # Complete data give an empty report
+    scenario = make_scenario()
+    assert batch(scenario, check_only=True).empty
+
+    # Introduce gaps and excess values
+    inv = scenario.data["inv_cost"]
+    scenario.data["inv_cost"] = inv.query(
+        "not (node_loc == 'R1' and technology == 't1' and year_vtg == 2040)"
+    )
+    fix = scenario.data["fix_cost"]
+    gaps = ((fix.node_loc == "R1") & (fix.year_act == 2030)) & (
+        ((fix.technology == "t1") & (fix.year_vtg == 2030))
+        | ((fix.technology == "t2") & (fix.year_vtg == 2020))
+    )
+    zero = (
+        (fix.node_loc == "R2")
+        & (fix.technology == "t2")
+        & (fix.year_vtg == 2040)
+        & (fix.year_act == 2040)
+    )
+    excess = pd.DataFrame(
+        [["R2", "t1", 2020, 2060, 99.0, "USD/kW"]], columns=fix.columns
+    )
+    scenario.data["fix_cost"] = pd.concat(
+        [fix[~gaps].assign(value=fix.value.where(~zero, 0.0)), excess]
+    )
+    before = {name: df.copy() for name, df in scenario.data.items()}
+
+    result = batch(scenario, check_only=True)
+
+    # The scenario is not modified
+    for name, df in before.items():
+        pdt.assert_frame_equal(df, scenario.data[name])
+
+    # The report contains the expected changes
+    exp = pd.DataFrame(
+        [
+            ["inv_cost", "add", "R1", "t1", 2040, None, 920.0, "USD/kW"],
+            ["fix_cost", "remove", "R2", "t2", 2040, 2040, 0.0, "USD/kW"],
+            ["fix_cost", "remove", "R2", "t1", 2020, 2060, 99.0, "USD/kW"],
+            ["fix_cost", "add", "R1", "t1", 2030, 2030, 30.0, "USD/kW"],
+            ["fix_cost", "add", "R1", "t2", 2020, 2030, 30.0, "USD/kW"],
+            ["fix_cost", "add", "R2", "t2", 2040, 2040, 30.0, "USD/kW"],
+        ],
+        columns=result.columns,
+    )
+    pdt.assert_frame_equal(exp, result, check_dtype=False)
+
+    # Changes are applied; afterwards, no further changes are needed
+    batch(scenario)
+    assert not (scenario.data["fix_cost"].value == 0).any()
+    assert batch(scenario, check_only=True).empty
@@ -1,7 +1,8 @@
 from .config import Config
-from .projections import create_cost_projections
+from .projections import create_cost_projections, create_cost_projections_batch
 
 __all__ = [
     "Config",
     "create_cost_projections",
+    "create_cost_projections_batch",
 ]
@@ -331,44 +331,30 @@ def project_ref_region_inv_costs_using_reduction_rates(
         )
     )
 
-    for y in config.seq_years:
-        df_ref = df_ref.assign(
-            ycur=lambda x: np.where(
-                y <= config.base_year,
-                x.reg_cost_base_year,
-                (x.reg_cost_base_year - x.b) * np.exp(x.r * (y - config.base_year))
-                + x.b,
-            )
-        ).rename(columns={"ycur": y})
-
+    # Compute costs for all periods at once: one row per entry in `df_ref`, one column
+    # per period in `years`
+    years = np.array(config.seq_years)
+    dy = years - config.base_year
+    cost = df_ref.reg_cost_base_year.to_numpy()[:, np.newaxis]
+    b = df_ref.b.to_numpy()[:, np.newaxis]
+    r = df_ref.r.to_numpy()[:, np.newaxis]
+    values = np.where(dy <= 0, cost, (cost - b) * np.exp(r * dy) + b)
+
+    # Assemble in "long" format, with the same row order as DataFrame.melt()
+    id_vars = [
+        "message_technology",
+        "scenario",
+        "reference_region",
+        "first_technology_year",
+    ]
     df_inv_ref = (
-        df_ref.drop(
-            columns=[
-                "b",
-                "r",
-                "reg_diff_source",
-                "reg_diff_technology",
-                "region",
-                "base_year_reference_region_cost",
-                "reg_cost_ratio",
-                "reg_cost_base_year",
-                "fix_ratio",
-                "reduction_rate",
-                "cost_reduction",
-                "cost_region_2100",
-            ]
-        )
-        .melt(
-            id_vars=[
-                "message_technology",
-                "scenario",
-                "reference_region",
-                "first_technology_year",
-            ],
-            var_name="year",
-            value_name="inv_cost_ref_region_decay",
+        df_ref[id_vars]
+        .iloc[np.tile(np.arange(len(df_ref)), len(years))]
+        .reset_index(drop=True)
+        .assign(
+            year=np.repeat(years, len(df_ref)).astype(int),
+            inv_cost_ref_region_decay=values.ravel(order="F"),
         )
-        .assign(year=lambda x: x.year.astype(int))
     ).drop_duplicates()
 
     return df_inv_ref
@@ -189,23 +189,6 @@ def adjust_cost_ratios_with_gdp(region_diff_df, config: Config):
         log.warning(f"Use year={new_base_year} GDP data as proxy for {base_year}")
         base_year = new_base_year
 
-    def _constrain_cost_ratio(df: pd.DataFrame, base_year):
-        """Constrain "reg_cost_ratio_adj".
-
-        In cases where gdp_ratio_reg_to_reference is < 1 and reg_cost_ratio_adj > 1 in
-        the base period, ensure reg_cost_ratio_adj(y) <= reg_cost_ratio_adj(base_year)
-        for all future periods y.
-        """
-        ref = df.query("year == @base_year").iloc[0]
-        if ref.gdp_ratio_reg_to_reference < 1 and ref.reg_cost_ratio_adj > 1:
-            return df.assign(
-                reg_cost_ratio_adj=df.reg_cost_ratio_adj.clip(
-                    upper=ref.reg_cost_ratio_adj
-                )
-            )
-        else:
-            return df
-
     #  1. Select base-year GDP data for "gdp_ratio_reg_to_reference".
     #  2. Drop "year".
     #  3. Merge `df_region_diff` for "reg_cost_ratio".
@@ -217,10 +200,9 @@ def adjust_cost_ratios_with_gdp(region_diff_df, config: Config):
     #     distinct values for each period.
     #  8. Compute ref_cost_ratio_adj
     #  9. Fill 1.0 where NaNs occur in (8), i.e. for the reference region.
-    # 10. Group by (sv, s, r, t) and apply _constrain_cost_ratio(), above, to each
-    #     group.
-    # 11. Select the desired columns.
-    return (
+    # 10. Constrain "reg_cost_ratio_adj" within groups of (sv, s, r, t); see below.
+    cols = ["scenario_version", "scenario", "region", "message_technology"]
+    df = (
         df_gdp.query("year == @base_year")
         .drop("year", axis=1)
         .merge(region_diff_df, on=["region"])
@@ -230,19 +212,34 @@ def adjust_cost_ratios_with_gdp(region_diff_df, config: Config):
         .merge(df_gdp, on=["scenario_version", "scenario", "region"], how="right")
         .eval("reg_cost_ratio_adj = slope * gdp_ratio_reg_to_reference + intercept")
         .fillna({"reg_cost_ratio_adj": 1.0})
-        .groupby(
-            ["scenario_version", "scenario", "region", "message_technology"],
-            group_keys=False,
+        .dropna(subset=cols)
+        .sort_values(cols, kind="stable")
+    )
+
+    # Broadcast the base-period values of each group to all rows of the group
+    base = df[["gdp_ratio_reg_to_reference", "reg_cost_ratio_adj"]].where(
+        df.year == base_year
+    )
+    ref = base.groupby([df[c] for c in cols]).transform("first")
+
+    # In groups where gdp_ratio_reg_to_reference is < 1 and reg_cost_ratio_adj > 1 in
+    # the base period, ensure reg_cost_ratio_adj(y) <= reg_cost_ratio_adj(base_year) for
+    # all future periods y.
+    constrain = (ref.gdp_ratio_reg_to_reference < 1) & (ref.reg_cost_ratio_adj > 1)
+
+    # Select the desired columns
+    return df.assign(
+        reg_cost_ratio_adj=df.reg_cost_ratio_adj.mask(
+            constrain, np.minimum(df.reg_cost_ratio_adj, ref.reg_cost_ratio_adj)
         )
-        .apply(_constrain_cost_ratio, base_year)[
-            [
-                "scenario_version",
-                "scenario",
-                "message_technology",
-                "region",
-                "year",
-                "gdp_ratio_reg_to_reference",
-                "reg_cost_ratio_adj",
-            ]
+    )[
+        [
+            "scenario_version",
+            "scenario",
+            "message_technology",
+            "region",
+            "year",
+            "gdp_ratio_reg_to_reference",
+            "reg_cost_ratio_adj",
         ]
-    )
+    ]
@@ -1,10 +1,20 @@
 import logging
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import replace
 from itertools import product
-from typing import Mapping, Tuple
+from typing import (
+    Dict,
+    Hashable,
+    List,
+    Mapping,
+    MutableMapping,
+    Optional,
+    Sequence,
+    Tuple,
+)
 
 import numpy as np
 import pandas as pd
-from numpy.polynomial import Polynomial
 
 from .config import Config
 from .decay import project_ref_region_inv_costs_using_reduction_rates
@@ -48,7 +58,92 @@ def _maybe_query_scenario_version(df: pd.DataFrame, config: "Config") -> pd.Data
     return df.query("scenario_version in @scen_vers")
 
 
-def create_projections_constant(config: "Config"):
+#: Fields of :class:`.Config` that determine the result of each step computed by
+#: :func:`prepare_data`. Configurations with the same values for these fields share the
+#: result of the step.
+DEPENDS = {
+    "region_diff": ("module", "node", "ref_region"),
+    "ref_reg_decay": (
+        "module",
+        "node",
+        "ref_region",
+        "base_year",
+        "final_year",
+        "pre_last_year_rate",
+    ),
+    "adj_cost_ratios": ("module", "node", "ref_region", "base_year"),
+}
+
+
+def prepare_data(
+    config: "Config", cache: Optional[MutableMapping[Hashable, pd.DataFrame]] = None
+) -> Dict[str, pd.DataFrame]:
+    """Compute intermediate data for :func:`create_cost_projections`.
+
+    Parameters
+    ----------
+    config : .Config
+        The function responds to, or passes on to other functions, the fields listed in
+        :data:`DEPENDS`, and :attr:`~.Config.method`.
+    cache : dict, optional
+        If given, results of each step are stored in `cache`, and reused for any later
+        call with a `config` that has the same values for the fields in
+        :data:`DEPENDS`.
+
+    Returns
+    -------
+    dict
+        with the keys:
+
+        - "region_diff": output of :func:`.apply_regional_differentiation`.
+        - "ref_reg_decay": output of
+          :func:`.project_ref_region_inv_costs_using_reduction_rates`, *not* filtered
+          on :attr:`.Config.scenario`.
+        - "adj_cost_ratios" (only for :py:`method="gdp"`): output of
+          :func:`.adjust_cost_ratios_with_gdp`, *not* filtered on
+          :attr:`.Config.scenario` or :attr:`.Config.scenario_version`.
+    """
+    cache = dict() if cache is None else cache
+
+    def _get(name, func, *args):
+        key = (name,) + tuple(getattr(config, f) for f in DEPENDS[name])
+        if key not in cache:
+            cache[key] = func(*args)
+        return cache[key]
+
+    log.info("Calculate regional differentiation in base year+region")
+    result = dict(
+        region_diff=_get("region_diff", apply_regional_differentiation, config)
+    )
+
+    log.info("Apply cost reduction rates to reference region")
+    result.update(
+        ref_reg_decay=_get(
+            "ref_reg_decay",
+            project_ref_region_inv_costs_using_reduction_rates,
+            result["region_diff"],
+            config,
+        )
+    )
+
+    if config.method == "gdp":
+        log.info("Adjust ratios using GDP data")
+        # Compute for all scenarios; the create_projections_*() functions filter
+        result.update(
+            adj_cost_ratios=_get(
+                "adj_cost_ratios",
+                adjust_cost_ratios_with_gdp,
+                result["region_diff"],
+                replace(config, scenario="all", scenario_version="all"),
+            )
+        )
+
+    return result
+
+
+def create_projections_constant(
+    config: "Config", data: Optional[Mapping[str, pd.DataFrame]] = None
+):
     """Create cost projections using assuming constant regional cost ratios.
 
     Parameters
@@ -60,6 +155,8 @@ def create_projections_constant(config: "Config"):
         :attr:`~.Config.node`,
         :attr:`~.Config.ref_region`, and
         :attr:`~.Config.scenario`.
+    data : dict, optional
+        Output of :func:`prepare_data`. If not given, this is computed.
 
     Returns
     -------
@@ -80,13 +177,9 @@ def create_projections_constant(config: "Config"):
         "specified. No scenario version (previous vs. updated) is needed."
     )
 
-    log.info("Calculate regional differentiation in base year+region")
-    df_region_diff = apply_regional_differentiation(config)
-
-    log.info("Apply cost reduction rates rates to reference region")
-    df_ref_reg_decay = project_ref_region_inv_costs_using_reduction_rates(
-        df_region_diff, config
-    ).pipe(_maybe_query_scenario, config)
+    data = data or prepare_data(config)
+    df_region_diff = data["region_diff"]
+    df_ref_reg_decay = data["ref_reg_decay"].pipe(_maybe_query_scenario, config)
 
     df_costs = (
         df_region_diff.merge(df_ref_reg_decay, on="message_technology")
@@ -118,7 +211,9 @@ def create_projections_constant(config: "Config"):
     return df_costs
 
 
-def create_projections_gdp(config: "Config"):
+def create_projections_gdp(
+    config: "Config", data: Optional[Mapping[str, pd.DataFrame]] = None
+):
     """Create cost projections using the GDP method.
 
     Parameters
@@ -131,6 +226,8 @@ def create_projections_gdp(config: "Config"):
         :attr:`~.Config.ref_region`,
         :attr:`~.Config.scenario`, and
         :attr:`~.Config.scenario_version`.
+    data : dict, optional
+        Output of :func:`prepare_data`. If not given, this is computed.
 
     Returns
     -------
@@ -149,20 +246,14 @@ def create_projections_gdp(config: "Config"):
     log.info(f"Selected scenario: {config.scenario}")
     log.info(f"Selected scenario version: {config.scenario_version}")
 
-    log.info("Calculate regional differentiation in base year+region")
-    df_region_diff = apply_regional_differentiation(config)
+    data = data or prepare_data(config)
+    df_region_diff = data["region_diff"]
+    df_ref_reg_reduction = data["ref_reg_decay"].pipe(_maybe_query_scenario, config)
 
-    log.info("Apply cost reduction rates to reference region")
-    df_ref_reg_reduction = project_ref_region_inv_costs_using_reduction_rates(
-        df_region_diff, config
-    ).pipe(_maybe_query_scenario, config)
-
-    log.info("Adjust ratios using GDP data")
-    # - Compute adjustment
-    # - Filter by Config.scenario, if given.
+    # - Filter adjusted cost ratios by Config.scenario, if given.
     # - Filter by Config.scenario_version, if given.
     df_adj_cost_ratios = (
-        adjust_cost_ratios_with_gdp(df_region_diff, config)
+        data["adj_cost_ratios"]
         .pipe(_maybe_query_scenario, config)
         .pipe(_maybe_query_scenario_version, config)
     )
@@ -199,7 +290,9 @@ def create_projections_gdp(config: "Config"):
     return df_costs
 
 
-def create_projections_converge(config: "Config"):
+def create_projections_converge(
+    config: "Config", data: Optional[Mapping[str, pd.DataFrame]] = None
+):
     """Create cost projections using the convergence method.
 
     Parameters
@@ -212,6 +305,8 @@ def create_projections_converge(config: "Config"):
         :attr:`~.Config.node`,
         :attr:`~.Config.ref_region`, and
         :attr:`~.Config.scenario`.
+    data : dict, optional
+        Output of :func:`prepare_data`. If not given, this is computed.
 
     Returns
     -------
@@ -233,13 +328,11 @@ def create_projections_converge(config: "Config"):
         "specified. No scenario version (previous vs. updated) is needed."
     )
 
-    log.info("Calculate regional differentiation in base year+region")
-    df_region_diff = apply_regional_differentiation(config)
-
-    log.info("Apply cost reduction rates to reference region")
-    df_ref_reg_cost_reduction = project_ref_region_inv_costs_using_reduction_rates(
-        df_region_diff, config
-    ).pipe(_maybe_query_scenario, config)
+    data = data or prepare_data(config)
+    df_region_diff = data["region_diff"]
+    df_ref_reg_cost_reduction = data["ref_reg_decay"].pipe(
+        _maybe_query_scenario, config
+    )
 
     df_tmp_costs = (
         df_region_diff.merge(df_ref_reg_cost_reduction, on="message_technology")
@@ -257,29 +350,35 @@ def create_projections_converge(config: "Config"):
         .drop_duplicates()
     )
 
-    y_predict = np.array(config.seq_years)
-    y_index = pd.Index(config.seq_years, name="year")
-
-    def _predict(df: pd.DataFrame) -> pd.Series:
-        """Fit a degree-3 polynomial to `df` and predict for :attr:`.seq_years`."""
-        # Fit
-        p = Polynomial.fit(df.year, df.inv_cost_tmp, deg=1)
-
-        # - Predict using config.seq_years.
-        # - Assemble a single-column data frame with "year" as the index name.
-        return pd.DataFrame({"inv_pre_converge_decay": p(y_predict)}, index=y_index)
-
     # Columns for grouping and merging
     cols = ["scenario", "message_technology", "region"]
 
-    # Apply polynomial regression to costs at base year and convergence year
-    # (interpolating)
-    df_pre_converge_costs = (
+    # Interpolate linearly between costs at the base year and convergence year. This is
+    # identical to fitting a degree-1 polynomial through the two points for each group,
+    # but computed for all groups at once.
+    # - Average any duplicate values for the same (group, year).
+    # - Unstack to one column for each of the two years.
+    df_two = (
         df_tmp_costs.query(
             "year == @config.base_year or year == @config.convergence_year"
         )
-        .groupby(cols[:3], group_keys=True)
-        .apply(_predict)
+        .groupby(cols + ["year"])["inv_cost_tmp"]
+        .mean()
+        .unstack("year")
+    )
+    c0 = df_two[config.base_year].to_numpy()[:, np.newaxis]
+    c1 = df_two[config.convergence_year].to_numpy()[:, np.newaxis]
+    y_predict = np.array(config.seq_years)
+    slope = (c1 - c0) / (config.convergence_year - config.base_year)
+
+    df_pre_converge_costs = (
+        pd.DataFrame(
+            c0 + slope * (y_predict - config.base_year),
+            index=df_two.index,
+            columns=pd.Index(config.seq_years, name="year"),
+        )
+        .stack()
+        .rename("inv_pre_converge_decay")
         .reset_index()
     )
 
@@ -651,6 +750,13 @@ def create_cost_projections(config: "Config") -> Mapping[str, pd.DataFrame]:
     # Display configuration using the default __repr__ provided by @dataclass
     log.info(f"Configuration: {config!r}")
 
+    return _create_outputs(config, prepare_data(config))
+
+
+def _create_outputs(
+    config: "Config", data: Mapping[str, pd.DataFrame]
+) -> Mapping[str, pd.DataFrame]:
+    """Create projections for `config` from `data`, and convert to the output format."""
     # Select function according to `config.method`
     func = {
         "convergence": create_projections_converge,
@@ -659,7 +765,7 @@ def create_cost_projections(config: "Config") -> Mapping[str, pd.DataFrame]:
     }[config.method]
 
     # Create projections
-    df_costs = func(config)
+    df_costs = func(config, data)
 
     # Convert to MESSAGEix format
     df_inv, df_fom = create_message_outputs(df_costs, config)
@@ -668,3 +774,47 @@ def create_cost_projections(config: "Config") -> Mapping[str, pd.DataFrame]:
         df_inv, df_fom = create_iamc_outputs(df_inv, df_fom)
 
     return {"inv_cost": df_inv, "fix_cost": df_fom}
+
+
+def create_cost_projections_batch(
+    configs: Sequence["Config"], max_workers: Optional[int] = None
+) -> List[Mapping[str, pd.DataFrame]]:
+    """Get investment and fixed cost projections for multiple `configs`.
+
+    The result is the same as :py:`[create_cost_projections(c) for c in configs]`, but:
+
+    1. Intermediate results (regional differentiation, reference region cost decay,
+       and GDP-adjusted cost ratios) are computed only once for all `configs` that
+       share the settings given in :data:`DEPENDS`. For instance, the source data are
+       read and processed once for each distinct (:attr:`~.Config.module`,
+       :attr:`~.Config.node`) combination, regardless of :attr:`~.Config.method` or
+       :attr:`~.Config.scenario`.
+    2. The remaining work for each config is done in parallel, in separate processes.
+
+    Parameters
+    ----------
+    configs :
+        Sequence of :class:`.Config`.
+    max_workers : int, optional
+        Maximum number of worker processes. If 1, all work is done in the current
+        process. If not given, the default of :class:`.ProcessPoolExecutor`.
+
+    Returns
+    -------
+    list of dict
+        One entry for each of `configs`, in the same order. Each is the same as the
+        return value of :func:`create_cost_projections`.
+    """
+    for config in configs:
+        config.check()
+
+    # Compute intermediate data; reuse results across configs
+    cache: Dict[Hashable, pd.DataFrame] = dict()
+    data = [prepare_data(config, cache) for config in configs]
+    log.info(f"Computed {len(cache)} intermediate results for {len(configs)} configs")
+
+    if max_workers == 1:
+        return list(map(_create_outputs, configs, data))
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(_create_outputs, configs, data))
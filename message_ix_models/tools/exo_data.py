@@ -3,9 +3,20 @@
 import logging
 from abc import ABC, abstractmethod
 from copy import deepcopy
+from functools import lru_cache
 from operator import itemgetter
 from pathlib import Path
-from typing import Any, Dict, List, Literal, Mapping, Optional, Tuple, Type
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    List,
+    Literal,
+    Mapping,
+    Optional,
+    Tuple,
+    Type,
+)
 
 from genno import Computer, Key, Quantity, quote
 
@@ -13,6 +24,9 @@ from message_ix_models import ScenarioInfo
 from message_ix_models.model.structure import get_codes
 from message_ix_models.util import cached
 
+if TYPE_CHECKING:
+    import pandas
+
 __all__ = [
     "MEASURES",
     "SOURCES",
@@ -325,7 +339,9 @@ def iamc_like_data_for_query(
 
     The steps involved are:
 
-    1. Read the data file; use pyarrow for better performance.
+    1. Read the data file; use pyarrow for better performance. The parsed contents are
+       kept in memory, so that other queries against the same file—for instance, from
+       other instances of the same :class:`ExoDataSource`—do not read it again.
     2. Immediately apply `query` to reduce the data to be handled in subsequent steps.
     3. Assert that Model, Scenario, Variable, and Unit are unique; store the unique
        values. This means that `query` **must** result in data with unique values for
@@ -348,6 +364,54 @@ def iamc_like_data_for_query(
         If "discard" (default), "region" labels that are not ISO 3166-1 country names
         are discarded, along with associated data. If "keep", such labels are kept.
     """
+    data = _read_iamc_like(path, archive_member, _frozen(kwargs))
+    return _quantity_for_query(data, query, drop, non_iso_3166, replace, unique)
+
+
+def _frozen(kwargs: Mapping) -> Tuple[Tuple[str, Any], ...]:
+    """Convert `kwargs` to a hashable form for :func:`_read_iamc_like`."""
+    return tuple(
+        sorted((k, tuple(v) if isinstance(v, list) else v) for k, v in kwargs.items())
+    )
+
+
+@lru_cache(maxsize=4)
+def _read_iamc_like(
+    path: Path, archive_member: Optional[str], kwargs: Tuple[Tuple[str, Any], ...]
+) -> "pandas.DataFrame":
+    """Read an IAMC-like data file; keep the result in memory.
+
+    The returned data frame is shared by all callers, and **must not** be modified.
+    """
+    import pandas as pd
+
+    # Identify the source object/buffer to read from
+    if archive_member:
+        # A single member in a ZIP archive that has >1 members
+        import zipfile
+
+        zf = zipfile.ZipFile(path)
+        source: Any = zf.open(archive_member)
+    else:
+        # A direct path, possibly compressed
+        source = path
+
+    _kwargs = dict(kwargs)
+    _kwargs.setdefault("engine", "pyarrow")
+
+    log.info(f"Read {path}" + (f" member {archive_member}" if archive_member else ""))
+    return pd.read_csv(source, **_kwargs)
+
+
+def _quantity_for_query(
+    data: "pandas.DataFrame",
+    query: str,
+    drop: Optional[List[str]],
+    non_iso_3166: Literal["keep", "discard"],
+    replace: Optional[dict],
+    unique: str,
+) -> Quantity:
+    """Steps 2–7 of :func:`iamc_like_data_for_query`."""
     import pandas as pd
 
     from message_ix_models.util.pycountry import iso_3166_alpha_3
@@ -372,25 +436,12 @@ def iamc_like_data_for_query(
         else:
             return df.assign(n=df["REGION"].apply(lambda v: iso_3166_alpha_3(v) or v))
 
-    # Identify the source object/buffer to read from
-    if archive_member:
-        # A single member in a ZIP archive that has >1 members
-        import zipfile
-
-        zf = zipfile.ZipFile(path)
-        source: Any = zf.open(archive_member)
-    else:
-        # A direct path, possibly compressed
-        source = path
-
-    kwargs.setdefault("engine", "pyarrow")
     set_index = ["n"] + sorted(
         set(["MODEL", "SCENARIO", "VARIABLE", "UNIT"]) - set(unique.split())
     )
 
     tmp = (
-        pd.read_csv(source, **kwargs)
-        .drop(columns=drop or [])
+        data.drop(columns=drop or [])
         .query(query)
         .replace(replace or {})
         .dropna(how="all", axis=1)
@@ -4,25 +4,27 @@
 
 import logging
 import re
-from typing import TYPE_CHECKING, Literal
+from hashlib import blake2b
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, List, Literal, Mapping
 
 import genno
-import numpy as np
 import pandas as pd
 import plotnine as p9
 
 from message_ix_models import Context
 from message_ix_models.tools.exo_data import ExoDataSource, register_source
-from message_ix_models.util import cached, path_fallback
+from message_ix_models.util import path_fallback
 
 if TYPE_CHECKING:
     from genno import Computer
+    from genno.types import AnyQuantity
 
 log = logging.getLogger(__name__)
 
 #: Mapping of weights to variables used as weights for weighted averaging.
 #:
-#: .. todo:: Replace with tests showing usage of :func:`wavg`.
+#: See :func:`wavg`.
 WAVG_MAP = {
     "Fuel intensity": "vehicle-kilometres",
     "Passenger load factor": "vehicle-kilometres",
@@ -55,6 +57,9 @@ class IEA_EEI(ExoDataSource):
         :func:`genno.operator.broadcast_map`.
       - `plot` (optional, default :any:`False`): add a task with the key
         "plot IEA_EEI debug" to generate diagnostic plot using :class:`.Plot`.
+      - `weights` (optional): name of a :class:`.Key` containing weights. If given
+        and `aggregate` is :any:`True`, the data are aggregated on the |n| dimension
+        using :func:`aggregate_wavg`, instead of summed.
       - `aggregate`, `interpolate`: see :meth:`.ExoDataSource.transform`.
     """
 
@@ -66,6 +71,10 @@ class IEA_EEI(ExoDataSource):
     #: By default, do not interpolate.
     interpolate = False
 
+    #: :any:`True` if :meth:`.transform` should aggregate data on the |n| dimension
+    #: using a weighted average.
+    aggregate_wavg = False
+
     def __init__(self, source, source_kw):
         if source != self.id:
             raise ValueError(source)
@@ -73,9 +82,14 @@ class IEA_EEI(ExoDataSource):
         measure = source_kw.pop("measure", None)
         self.broadcast_map = source_kw.pop("broadcast_map", None)
         self.plot = source_kw.pop("plot", False)
+        self.weights = source_kw.pop("weights", None)
 
         self.raise_on_extra_kw(source_kw)
 
+        if self.weights:
+            # Aggregate using weighted averages instead of ExoDataSource.transform()
+            self.aggregate_wavg, self.aggregate = self.aggregate, False
+
         self.path = path_fallback(
             "transport",
             "Energyefficiencyindicators_2020-extended.xlsx",
@@ -87,12 +101,6 @@ class IEA_EEI(ExoDataSource):
         self.measure = "INDICATOR"
         self.name = measure.lower()
 
-        # Determine whether to perform a weighted average operation
-        self.weights = None
-        if False:  # pragma: no cover
-            # TODO This code never executes; update and reactivate
-            pass
-
     def __call__(self):
         from genno.operator import unique_units_from_dim
 
@@ -116,7 +124,13 @@ class IEA_EEI(ExoDataSource):
         )
 
     def transform(self, c: "Computer", base_key: genno.Key) -> genno.Key:
-        ks = genno.KeySeq(super().transform(c, base_key))
+        k = base_key
+        if self.aggregate_wavg:
+            k = genno.Key(
+                c.add(k + "wavg", aggregate_wavg, k, self.weights, "n::groups")
+            )
+
+        ks = genno.KeySeq(super().transform(c, k))
         k = ks.base
 
         if self.broadcast_map:
@@ -126,10 +140,6 @@ class IEA_EEI(ExoDataSource):
                 ks[0], "broadcast_map", ks.base, self.broadcast_map, rename=rename
             )
 
-        if self.weights:
-            # TODO Add operations for computing a weighted mean
-            pass
-
         if self.plot:
             # Path for debug output
             context: "Context" = c.graph["context"]
@@ -197,8 +207,45 @@ def melt(df: pd.DataFrame) -> pd.DataFrame:
     return df.melt(id_vars=sorted(index_cols), var_name="TIME_PERIOD")
 
 
-@cached
-def iea_eei_data_raw(path, non_iso_3166: Literal["keep", "discard"] = "discard"):
+def iea_eei_data_raw(
+    path, non_iso_3166: Literal["keep", "discard"] = "discard"
+) -> pd.DataFrame:
+    """Return all data from the IEA EEI workbook at `path`, in long format.
+
+    Parsing the workbook is slow. The first call stores the result in a Parquet file
+    under :meth:`.Context.get_cache_path`; subsequent calls read this file, unless the
+    workbook is modified or :data:`.SKIP_CACHE` is set.
+    """
+    from message_ix_models.util import cache
+
+    path = Path(path)
+
+    # Identify the cache file using the workbook path, size, and modification time
+    stat = path.stat()
+    h = blake2b(
+        repr(
+            (str(path.resolve()), stat.st_size, stat.st_mtime_ns, non_iso_3166)
+        ).encode(),
+        digest_size=8,
+    )
+    cache_path = Context.get_instance(-1).get_cache_path(
+        f"iea_eei_data_raw-{h.hexdigest()}.parquet"
+    )
+
+    if cache_path.exists() and not cache.SKIP_CACHE:
+        return pd.read_parquet(cache_path)
+
+    result = _parse_workbook(path)
+    result.to_parquet(cache_path, index=False)
+    log.info(f"Cache IEA EEI data in {cache_path}")
+
+    return result
+
+
+def _parse_workbook(path: Path) -> pd.DataFrame:
+    """Parse all sheets in the IEA EEI workbook at `path`."""
+    from pandas.api.types import is_string_dtype
+
     from message_ix_models.util.pycountry import iso_3166_alpha_3
 
     xf = pd.ExcelFile(path)
@@ -228,7 +275,7 @@ def iea_eei_data_raw(path, non_iso_3166: Literal["keep", "discard"] = "discard")
         df = (
             xf.parse(sheet_name, header=1, na_values="..")
             .dropna(how="all")
-            .apply(lambda col: col.str.rstrip() if col.dtype == object else col)
+            .apply(lambda col: col.str.rstrip() if is_string_dtype(col.dtype) else col)
             .assign(**assign)
             .pipe(extract_measure_and_units)
             .pipe(melt)
@@ -237,19 +284,34 @@ def iea_eei_data_raw(path, non_iso_3166: Literal["keep", "discard"] = "discard")
         assert not df.isna().any(axis=None)
         dfs.append(df)
 
-    return (
-        pd.concat(dfs)
-        .fillna("__NA")
-        .assign(n=lambda df: df["Country"].apply(iso_3166_alpha_3))
-        .drop("Country", axis=1)
+    # Use the same dtypes as data read from the cache, e.g. int64 for TIME_PERIOD
+    data = pd.concat(dfs, ignore_index=True).fillna("__NA").infer_objects()
+
+    # Look up each distinct country name once
+    n = {name: iso_3166_alpha_3(name) for name in data["Country"].unique()}
+
+    return data.assign(n=data["Country"].map(n)).drop("Country", axis=1)
+
+
+def _masked_wavg(data: pd.DataFrame, by: List[str], x: str, w: str) -> pd.Series:
+    """Weighted average of column `x` with weights in `w`, for groups `by`.
+
+    Computed as :math:`\\sum{(w x)} / \\sum{w}`, omitting rows where either `x` or `w`
+    is NaN. The result is NaN for groups with no such rows.
+    """
+    valid = data[x].notna() & data[w].notna()
+    _w = data[w].where(valid, 0.0)
+    sums = (
+        pd.DataFrame({"wx": _w * data[x].where(valid, 0.0), "w": _w})
+        .groupby([data[c] for c in by], sort=True)
+        .sum()
     )
+    return sums["wx"] / sums["w"]
 
 
 def wavg(measure: str, df: pd.DataFrame, weight_data: pd.DataFrame) -> pd.DataFrame:
     """Perform masked & weighted average for `measure` in `df`, using `weight_data`.
 
-    .. todo:: Replace this with usage of genno; add tests.
-
     :data:`.WAVG_MAP` is used to select a data from `weight_data` appropriate for
     weighting `measure`: either "population", "vehicle stock" or "vehicle-kilometres*.
     If the measure to be used for weights is all NaNs, then "population" is used as a
@@ -271,38 +333,113 @@ def wavg(measure: str, df: pd.DataFrame, weight_data: pd.DataFrame) -> pd.DataFr
     Returns
     -------
     pandas.DataFrame
+
+    See also
+    --------
+    wavg_measures
+    """
+    return wavg_measures(df.assign(variable=measure), weight_data)
+
+
+def wavg_measures(
+    df: pd.DataFrame, weight_data: Mapping[str, pd.DataFrame]
+) -> pd.DataFrame:
+    """Perform masked & weighted averages for all measures in `df` at once.
+
+    Like :func:`wavg`, except `df` contains data for any number of measures,
+    distinguished by its "variable" column. Data for all measures are aligned with
+    their respective weights, then averaged in a single grouped operation.
+
+    Returns
+    -------
+    pandas.DataFrame
+        with columns "region", "year", "Mode/vehicle type", "variable", "value", and
+        "units".
     """
-    # Choose the measure for weights using `WAVG_MAP`.
-    weights = WAVG_MAP.get(measure, "population")
-    if weight_data[weights]["value"].isna().all():
-        # If variable to be used for weights is all NaNs, then use population as weights
-        # since pop data is available in all cases
-        weights = "population"
-
-    # Align the data and the weights into a single data frame
     id_cols = ["region", "year", "Mode/vehicle type"]
-    data = df.merge(
-        weight_data[weights],
-        on=list(filter(lambda c: c in weight_data[weights].columns, id_cols)),
-    )
 
-    units = data["units_x"].unique()
-    assert 1 == len(units), units
+    # Choose the measure for weights for each measure using `WAVG_MAP`
+    weights: Dict[str, List[str]] = {}
+    for measure in df["variable"].unique():
+        name = WAVG_MAP.get(measure, "population")
+        if weight_data[name]["value"].isna().all():
+            # If variable to be used for weights is all NaNs, then use population as
+            # weights since pop data is available in all cases
+            name = "population"
+        weights.setdefault(name, []).append(measure)
+
+    # Align the data and the weights for each group of measures
+    dfs = []
+    for name, measures in weights.items():
+        w = weight_data[name]
+        on = [c for c in id_cols if c in w.columns]
+        dfs.append(
+            df[df["variable"].isin(measures)].merge(
+                w[on + ["value"]].rename(columns={"value": "weight"}), on=on
+            )
+        )
+    data = pd.concat(dfs, ignore_index=True)
 
-    def _wavg(group):
-        # Create masked arrays, masking NaNs from the weighted average computation:
-        d = np.ma.masked_invalid(group["value_x"].values)
-        w = np.ma.masked_invalid(group["value_y"].values)
-        # Compute weighted average
-        return np.ma.average(d, weights=w)
+    units = data.groupby("variable")["units"].unique()
+    assert (1 == units.str.len()).all(), units
 
-    # - Apply _wavg() to groups by `id_cols`.
-    # - Return to a data frame.
-    # - Re-insert "units" and "variable" columns.
     return (
-        data.groupby(id_cols)
-        .apply(_wavg)
+        _masked_wavg(data, id_cols + ["variable"], "value", "weight")
         .rename("value")
         .reset_index()
-        .assign(units=units[0], variable=measure)
+        .assign(units=lambda df: df["variable"].map(units.str[0]))
     )
+
+
+def aggregate_wavg(
+    quantity: "AnyQuantity",
+    weights: "AnyQuantity",
+    groups: Mapping[str, Mapping[str, List[str]]],
+) -> "AnyQuantity":
+    """Aggregate `quantity` using weighted averages.
+
+    Like :func:`genno.operator.aggregate` with :py:`keep=False`, except that the value
+    for each group is the average of the values for its members, weighted by
+    `weights`. Members for which either the data or the weight is missing or NaN are
+    omitted.
+
+    Parameters
+    ----------
+    weights :
+        Dimensions must be a subset of those of `quantity`; the weights are broadcast
+        over any others.
+    groups :
+        Mapping from dimension IDs to mappings from group IDs to lists of members, for
+        instance the contents of "n::groups".
+    """
+    dims = list(map(str, quantity.dims))
+    if extra := set(weights.dims) - set(dims):
+        raise ValueError(f"weights have dimension(s) {extra} not in {dims}")
+
+    data = quantity.to_series().rename("value").reset_index()
+    if len(weights.dims):
+        data = data.merge(
+            weights.to_series().rename("weight").reset_index(),
+            how="left",
+            on=list(weights.dims),
+        )
+    else:
+        data = data.assign(weight=weights.item())
+
+    # Replace members with the IDs of the group(s) to which they belong
+    for dim, dim_groups in filter(lambda i: i[0] in dims, groups.items()):
+        members = pd.DataFrame(
+            [(str(g), str(m)) for g, m_ in dim_groups.items() for m in m_],
+            columns=["_group", dim],
+        )
+        data = (
+            data.astype({dim: str})
+            .merge(members, on=dim)
+            .drop(columns=dim)
+            .rename(columns={"_group": dim})
+        )
+
+    result = _masked_wavg(data, dims, "value", "weight").dropna()
+    result.index.names = dims
+
+    return genno.Quantity(result, units=quantity.units)
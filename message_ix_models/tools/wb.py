@@ -1,17 +1,118 @@
 """Tools for World Bank data."""
 
 import logging
+import os
 from collections import defaultdict
 from functools import lru_cache
-from typing import TYPE_CHECKING, Dict, MutableMapping, Optional
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Dict, MutableMapping, Optional
 
+import click
 import pandas as pd
 
+from message_ix_models.util.context import Context
+
 if TYPE_CHECKING:
     import sdmx.model.common
 
 log = logging.getLogger(__name__)
 
+#: How :func:`get_response` handles responses from World Bank web services:
+#:
+#: - :py:`"cache"` (default): replay stored responses; retrieve and store any that are
+#:   missing.
+#: - :py:`"refresh"`: retrieve all responses and replace any stored ones. See also
+#:   :program:`mix-models wb refresh`.
+#: - :py:`"offline"`: only replay stored responses, with no network access. If a
+#:   response is missing, :class:`FileNotFoundError` is raised.
+#:
+#: The default can be set with the environment variable ``MESSAGE_WB_MODE``.
+MODE = os.environ.get("MESSAGE_WB_MODE", "cache")
+
+#: Directory containing stored responses. If :any:`None` (the default), a "wb"
+#: subdirectory of :meth:`.Context.get_cache_path`. Set this, for instance with
+#: :func:`pytest.MonkeyPatch.setattr`, to use a directory of local stand-in responses
+#: instead.
+STORE: Optional[Path] = None
+
+
+def get_response(name: str, retrieve: Callable[[Path], None]) -> Path:
+    """Return the path to a stored response with file `name`.
+
+    If the response is not stored—or in all cases, if :data:`MODE` is
+    :py:`"refresh"`—`retrieve` is called with a temporary path to which it must write
+    the response. The response is then stored under :data:`STORE`.
+
+    Raises
+    ------
+    FileNotFoundError
+        if :data:`MODE` is :py:`"offline"` and there is no stored response `name`.
+    ValueError
+        for an unrecognized value of :data:`MODE`.
+    """
+    if MODE not in ("cache", "offline", "refresh"):
+        raise ValueError(f"MODE={MODE!r}")
+
+    base = Path(STORE) if STORE else Context.get_instance(-1).get_cache_path("wb")
+    path = base.joinpath(name)
+
+    if path.exists() and MODE != "refresh":
+        return path
+    elif MODE == "offline":
+        raise FileNotFoundError(f"No stored response {path} with MODE='offline'")
+
+    # Retrieve to a temporary path and then move, so that an interrupted retrieval
+    # does not leave an incomplete response
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{name}.tmp")
+    tmp.unlink(missing_ok=True)
+    retrieve(tmp)
+    os.replace(tmp, path)
+    log.info(f"Stored response in {path}")
+
+    return path
+
+
+def _pooch_retrieve(url: str, known_hash: Optional[str] = None) -> Callable:
+    """Return a function for :func:`get_response` that uses :func:`pooch.retrieve`."""
+
+    def retrieve(path: Path) -> None:
+        import pooch
+
+        pooch.retrieve(url, known_hash, fname=path.name, path=path.parent)
+
+    return retrieve
+
+
+def get_population(year: int = 2020) -> pd.Series:
+    """Return WB World Development Indicators (WDI) total population data for `year`.
+
+    The data are retrieved from the ``WB_WDI`` SDMX web service using
+    :func:`get_response`.
+
+    Returns
+    -------
+    pandas.Series
+        with a multi-index with levels: REF_AREA, SERIES, FREQ, TIME_PERIOD. There is
+        only 1 value for each unique REF_AREA.
+    """
+    import sdmx
+    import sdmx.message
+
+    def retrieve(path: Path) -> None:
+        # Retrieve WB_WDI data for SERIES=SP_POP_TOTAL (Population, total)
+        sdmx.Client("WB_WDI").data(
+            "WDI",
+            key="A.SP_POP_TOTL.",
+            params=dict(startPeriod=year, endPeriod=year),
+            tofile=path,
+        )
+
+    dm = sdmx.read_sdmx(get_response(f"WB_WDI-WDI-A.SP_POP_TOTL.-{year}.xml", retrieve))
+    assert isinstance(dm, sdmx.message.DataMessage)
+
+    return sdmx.to_pandas(dm.data[0])
+
 
 # FIXME Reduce complexity from 12 → ≤11
 def assign_income_groups(  # noqa: C901
@@ -34,6 +135,7 @@ def assign_income_groups(  # noqa: C901
         - :py:`"population"` (default): the WB World Development Indicators (WDI) 2020
           population for each country is used as a weight, so that the node's income
           group is the income group of the plurality of the population of its children.
+          See :func:`get_population`.
         - :py:`"count"`: each country is weighted equally, so that the node's income
           group is the mode (most frequently occurring value) of its childrens'.
     replace : dict
@@ -55,7 +157,6 @@ def assign_income_groups(  # noqa: C901
     HMIC
     """
 
-    import sdmx
     import sdmx.model.v21 as m
 
     replace = replace or dict()
@@ -67,15 +168,7 @@ def assign_income_groups(  # noqa: C901
             return 1.0
 
     elif method == "population":
-        # Retrieve WB_WDI data for SERIES=SP_POP_TOTAL (Population, total)
-        dm = sdmx.Client("WB_WDI").data(
-            "WDI", key="A.SP_POP_TOTL.", params=dict(startPeriod=2020, endPeriod=2020)
-        )
-
-        # Convert to pd.Series with multi-index with levels: REF_AREA, SERIES, FREQ,
-        # TIME_PERIOD. Because of the query, there is only 1 value for each unique
-        # REF_AREA.
-        df = sdmx.to_pandas(dm.data[0])
+        df = get_population(2020)
 
         def get_weight(code: "sdmx.model.common.Code") -> float:
             """Return a weight for the country `code`: its total population."""
@@ -147,14 +240,14 @@ def fetch_codelist(id: str) -> "sdmx.model.common.Codelist":
     https://datahelpdesk.worldbank.org/knowledgebase/articles/1886701-sdmx-api-queries.
 
     :func:`fetch_codelist` retrieves http://api.worldbank.org/v2/sdmx/rest/codelist/WB/,
-    the structure message containing *all* code lists; and extracts and returns the one
-    with the given `id`.
+    the structure message containing *all* code lists, using :func:`get_response`; and
+    extracts and returns the one with the given `id`.
     """
-    import pooch
     import sdmx
 
-    file = pooch.retrieve(
-        url="http://api.worldbank.org/v2/sdmx/rest/codelist/WB/", known_hash=None
+    file = get_response(
+        "codelist-WB.xml",
+        _pooch_retrieve("http://api.worldbank.org/v2/sdmx/rest/codelist/WB/"),
     )
     # Read the retrieved SDMX StructureMessage and extract the code list
     sm = sdmx.read_sdmx(file)
@@ -190,7 +283,6 @@ def get_income_group_codelist() -> "sdmx.model.common.Codelist":
       <sdmx.model.common.AnnotableArtefact.annotations>`, :attr:`Code.get_annotation
       <sdmx.model.common.AnnotableArtefact.get_annotation>`, and other methods.
     """
-    import pooch
     import sdmx.model.v21 as m
 
     cl = fetch_codelist("CL_REF_AREA_WDI")
@@ -204,11 +296,13 @@ def get_income_group_codelist() -> "sdmx.model.common.Codelist":
         raise ValueError(name)  # pragma: no cover
 
     # Fetch the file containing the classification
-    file = pooch.retrieve(
-        url="https://datacatalogfiles.worldbank.org/ddh-published/0037712/DR0090755/"
+    file = get_response(
         "CLASS.xlsx",
-        known_hash="sha256:"
-        "1418a4fd6badb7c26ae2bc3a9bfef4903f3d9c54c1679f856e1dece3c729e935",
+        _pooch_retrieve(
+            "https://datacatalogfiles.worldbank.org/ddh-published/0037712/DR0090755/"
+            "CLASS.xlsx",
+            "sha256:1418a4fd6badb7c26ae2bc3a9bfef4903f3d9c54c1679f856e1dece3c729e935",
+        ),
     )
 
     # Open the retrieved file
@@ -304,3 +398,26 @@ def make_map(
         result[key] = value
 
     return result
+
+
+@click.group("wb")
+def cli():
+    """World Bank data."""
+
+
+@cli.command("refresh")
+def refresh():
+    """Retrieve and store all World Bank responses.
+
+    The stored responses are used by :mod:`.tools.wb` instead of the network; see
+    :data:`.wb.MODE`.
+    """
+    global MODE
+
+    mode, MODE = MODE, "refresh"
+    try:
+        get_income_group_codelist.cache_clear()
+        get_income_group_codelist()
+        get_population(2020)
+    finally:
+        MODE = mode
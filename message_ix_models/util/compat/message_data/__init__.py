@@ -4,7 +4,9 @@
 from .calibrate_UE_gr_to_demand import main as calibrate_UE_gr_to_demand
 from .calibrate_UE_share_constraints import main as calibrate_UE_share_constraints
 from .calibrate_vre import main as calibrate_vre
+from .change_technology_lifetime import buffered_batch as change_technology_lifetime_buffered_batch
 from .change_technology_lifetime import main as change_technology_lifetime
+from .check_scenario_fix_and_inv_cost import batch as check_scenario_fix_and_inv_cost_batch
 from .check_scenario_fix_and_inv_cost import main as check_scenario_fix_and_inv_cost
 from .get_optimization_years import main as get_optimization_years
 from .update_h2_blending import main as update_h2_blending
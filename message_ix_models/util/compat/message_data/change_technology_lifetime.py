@@ -14,6 +14,163 @@ def _log(parname, tec, node):
     log.debug(f"Update {repr(parname)} for new lifetime of {repr(tec)} in {repr(node)}")
 
 
+def last_active_years(horizon, duration, vtg_years, lifetime):
+    """Return the last active year of each of `vtg_years`, given its `lifetime`.
+
+    This is the first period in `horizon` for which the sum of "duration_period", from
+    the vintage year up to and including that period, reaches the lifetime. All vintage
+    years are handled at once.
+
+    Parameters
+    ----------
+    horizon: list of int
+        Model years, sorted.
+    duration: pandas.Series
+        Parameter "duration_period", indexed by year.
+    vtg_years: list of int
+        Vintage years, all members of `horizon` except the last.
+    lifetime: list or pandas.Series
+        Technical lifetime for each of `vtg_years`.
+
+    Returns
+    -------
+    list of int
+    """
+    h = np.array(horizon)
+    dur = duration.reindex(h).to_numpy(dtype=float)
+    cum = np.cumsum(dur)
+    i = np.searchsorted(h, vtg_years)
+    lt = np.asarray(lifetime, dtype=float)[:, np.newaxis]
+
+    # Sum of duration_period from each vintage year (rows) to each period (columns)
+    upper = cum[np.newaxis, :] - cum[i, np.newaxis] + dur[i, np.newaxis]
+    lower = upper - dur + 1
+
+    # Set the 'upper' value for the last period artifically high
+    upper[:, -1] = 100
+
+    match = (h >= h[i, np.newaxis]) & (lower <= lt) & (lt <= upper)
+    if not match.any(axis=1).all():
+        missing = np.array(vtg_years)[~match.any(axis=1)].tolist()
+        raise ValueError(f"No last active year for vintage year(s) {missing}")
+
+    return h[match.argmax(axis=1)].tolist()
+
+
+class _BufferedScenario:
+    """Proxy for a :class:`message_ix.Scenario` used by :func:`buffered_batch`.
+
+    Each parameter is retrieved from the underlying scenario only once, for all
+    `technologies`; :meth:`par` then filters these data in memory. Calls to
+    :meth:`remove_par` and :meth:`add_par` are recorded instead of being applied.
+    """
+
+    def __init__(self, scenario, technologies):
+        self.scenario = scenario
+        self.technologies = sorted(technologies)
+        self.firstmodelyear = scenario.firstmodelyear
+        self._data = {}
+        self._idx_names = {}
+        self._par_list = list(scenario.par_list())
+        self._set = {}
+        self.removed = {}
+        self.added = {}
+
+    def par_list(self):
+        return self._par_list
+
+    def idx_names(self, name):
+        if name not in self._idx_names:
+            self._idx_names[name] = list(self.scenario.idx_names(name))
+        return self._idx_names[name]
+
+    def set(self, name):
+        if name not in self._set:
+            self._set[name] = self.scenario.set(name)
+        return self._set[name]
+
+    def par(self, name, filters=None):
+        if name not in self._data:
+            f = (
+                {"technology": self.technologies}
+                if "technology" in self.idx_names(name)
+                else None
+            )
+            self._data[name] = self.scenario.par(name, filters=f)
+
+        df = self._data[name]
+        if set(filters or {}) - set(df.columns):
+            # No data for dimension(s) that `name` does not have, e.g. "technology"
+            return df.iloc[:0]
+
+        mask = np.full(len(df), True)
+        for dim, values in (filters or {}).items():
+            values = [values] if np.ndim(values) == 0 else list(values)
+            mask &= df[dim].isin(values).to_numpy()
+        return df[mask].reset_index(drop=True)
+
+    def remove_par(self, name, data):
+        self.removed.setdefault(name, []).append(data)
+
+    def add_par(self, name, data):
+        self.added.setdefault(name, []).append(data)
+
+    def diff(self):
+        """Summarize the recorded changes.
+
+        Returns
+        -------
+        pandas.DataFrame
+            with columns "parameter", "technology", "node", and the number of data
+            points "added", "removed", or with "changed" values.
+        """
+        result = []
+        for name in sorted(set(self.removed) | set(self.added)):
+            old = pd.concat(self.removed.get(name, []) + [self._data[name].iloc[:0]])
+            new = pd.concat(self.added.get(name, []) + [self._data[name].iloc[:0]])
+            dims = [c for c in self.idx_names(name) if c in old.columns]
+            node_col = [c for c in dims if "node" in c][0]
+            df = (
+                old.drop_duplicates(subset=dims)
+                .merge(
+                    new.drop_duplicates(subset=dims),
+                    how="outer",
+                    on=dims,
+                    suffixes=("_old", "_new"),
+                    indicator=True,
+                )
+                .assign(
+                    parameter=name,
+                    node=lambda df: df[node_col],
+                    added=lambda df: df._merge == "right_only",
+                    removed=lambda df: df._merge == "left_only",
+                    changed=lambda df: (
+                        (df._merge == "both")
+                        & ~np.isclose(df.value_old, df.value_new, equal_nan=True)
+                    ),
+                )
+            )
+            result.append(
+                df.groupby(["parameter", "technology", "node"])[
+                    ["added", "removed", "changed"]
+                ]
+                .sum()
+                .reset_index()
+            )
+
+        columns = ["parameter", "technology", "node", "added", "removed", "changed"]
+        return pd.concat([pd.DataFrame(columns=columns)] + result, ignore_index=True)
+
+    def apply(self, message):
+        """Apply the recorded changes to the underlying scenario, and commit."""
+        self.scenario.check_out()
+        for name, data in self.removed.items():
+            self.scenario.remove_par(name, pd.concat(data).drop_duplicates())
+        for name, data in self.added.items():
+            self.scenario.add_par(name, pd.concat(data).drop_duplicates())
+        self.scenario.commit(message)
+
+
 def main(
     scenario,
     tec,
@@ -152,45 +309,26 @@ def main(
             .set_index("year")
         )
 
-        # Generating duration_period_sum matrix for masking
-        df_dur = pd.DataFrame(index=horizon[:-1], columns=horizon)
-        for i in df_dur.index:
-            for j in [x for x in df_dur.columns if x >= i]:
-                df_dur.loc[i, j] = int(
-                    dur.loc[(dur.index >= i) & (dur.index <= j)].sum()
-                )
-
         # Create a list of new vintage years
         vtg_years = sorted([x for x in horizon if x >= year_vtg_st and x <= year_vtg_e])
 
         # Adding new vintage years to parameter technical_lifetime
         for y in [y for y in vtg_years if y not in set(df_new["year_vtg"])]:
-            tmp = df_new.iloc[0, :].copy()
+            tmp = df_new.iloc[[0], :].copy()
             tmp["year_vtg"] = y
             if lifetime and y >= year_vtg_st and y <= year_vtg_e:
                 tmp["value"] = lifetime
             else:
                 cl = closest(df_new["year_vtg"].tolist(), y)
-                tmp["value"] = float(df_new.loc[df_new["year_vtg"] == cl, "value"])
-            df_new = df_new.append(tmp, ignore_index=True)
+                tmp["value"] = df_new.loc[df_new["year_vtg"] == cl, "value"].iloc[0]
+            df_new = pd.concat([df_new, tmp], ignore_index=True)
         df_new = df_new.set_index("year_vtg")
 
         # Finding the last active year for each vintage year
-        act_years = []
-        for y in [x for x in vtg_years if x < max(horizon)]:
-            tmp = df_dur.loc[y].to_frame(name="max")
-
-            # Create a range to identify the correct timestep
-            tmp["min"] = tmp["max"] - dur["value"] + 1
-
-            # Set the 'max' value fot the last period artifically high
-            tmp.loc[max(horizon), "max"] = 100
-            act_years.append(
-                tmp.loc[
-                    (df_new.loc[y, "value"] >= tmp["min"])
-                    & (df_new.loc[y, "value"] <= tmp["max"])
-                ].index[0]
-            )
+        vtg = [x for x in vtg_years if x < max(horizon)]
+        act_years = last_active_years(
+            horizon, dur["value"], vtg, df_new.loc[vtg, "value"]
+        )
 
         # Adding last model year if needed (not in duration_period_sum)
         if max(horizon) in vtg_years:
@@ -214,14 +352,14 @@ def main(
 
         # Adding vintage years to technical_lifetime for missing active years
         for y in [y for y in years_all if y not in set(df_new["year_vtg"])]:
-            tmp = df_new.iloc[0, :].copy()
+            tmp = df_new.iloc[[0], :].copy()
             tmp["year_vtg"] = y
             if lifetime and y >= year_vtg_st and y <= year_vtg_e:
                 tmp["value"] = lifetime
             else:
                 cl = closest(df_new["year_vtg"].tolist(), y)
-                tmp["value"] = float(df_new.loc[df_new["year_vtg"] == cl, "value"])
-            df_new = df_new.append(tmp, ignore_index=True)
+                tmp["value"] = df_new.loc[df_new["year_vtg"] == cl, "value"].iloc[0]
+            df_new = pd.concat([df_new, tmp], ignore_index=True)
         df_new = df_new.sort_values("year_vtg").reset_index(drop=True)
 
         if remove_rest and not test_run:
@@ -242,13 +380,11 @@ def main(
                 for n in df_new.node_loc.unique():
                     df_tmp = df_new[df_new["node_loc"] == n]
                     for t in df_tmp.technology.unique():
-                        val = float(
-                            df_tmp.loc[
-                                (df_tmp["technology"] == t)
-                                & (df_tmp["year_vtg"] == max(vtg_years)),
-                                "value",
-                            ]
-                        )
+                        val = df_tmp.loc[
+                            (df_tmp["technology"] == t)
+                            & (df_tmp["year_vtg"] == max(vtg_years)),
+                            "value",
+                        ].iloc[0]
                         df_new.loc[
                             (df_new["node_loc"] == n)
                             & (df_new["technology"] == t)
@@ -270,7 +406,9 @@ def main(
         else:
             if len(vtg_years) == 1:
                 div = int(
-                    scenario.par("duration_period", filters={"year": vtg_years}).value
+                    scenario.par(
+                        "duration_period", filters={"year": vtg_years}
+                    ).value.iloc[0]
                 )
             else:
                 div = min(np.diff(vtg_years))
@@ -350,8 +488,8 @@ def main(
 
                 # Extrapolate data
                 df2.loc[:, y] = intpol(
-                    float(df2[year_next]),
-                    float(df2[year_nn]),
+                    df2[year_next],
+                    df2[year_nn],
                     year_next,
                     year_nn,
                     y,
@@ -461,20 +599,20 @@ def main(
                 df_count = (
                     df2.reset_index()
                     .loc[df2.reset_index()[year_ref].isin(vtg_years), col_nontec]
-                    .apply(pd.value_counts)
+                    .apply(lambda s: s.value_counts())
                     .fillna(0)
                 )
 
                 if not df_count.empty:
                     df_count = df_count.loc[
-                        df_count[col_nontec[0]] < int(df_count.mean())
+                        df_count[col_nontec[0]] < int(df_count[col_nontec[0]].mean())
                     ]
 
                 if not df_count.empty:
                     # NOTICE: this is not resolved here and user should decide
                     log.warning(
                         f"In parameter {repr(parname)} the vintage years of "
-                        f"{col_nontec[0]: df_count.index.tolist()}, {repr(tec)} in "
+                        f"{col_nontec[0]} {df_count.index.tolist()}, {repr(tec)} in "
                         f"{repr(node)} are different from other input entries. Please "
                         "check the results!"
                     )
@@ -488,6 +626,7 @@ def main(
             # not be extended for the "year_rel".
             # -------------------------------------------------------
             if parname != "relation_activity":
+                df2 = df2.reindex(sorted(df2.columns), axis=1)
                 count = 0
                 while count <= n:
                     # The counter of loop (no explicit use of k)
@@ -507,9 +646,8 @@ def main(
                             else:
                                 year_nn = y
 
-                            df_yr = df2[
-                                df2.index.get_level_values(year_ref).isin([y])
-                            ].reindex(sorted(df2.columns), axis=1)
+                            mask = df2.index.get_level_values(year_ref).isin([y])
+                            df_yr = df2[mask]
 
                             # Creates a list of years for which values need to be
                             # extrapolated.
@@ -590,8 +728,7 @@ def main(
 
                             # end year
                             df_yr.loc[:, df_yr.columns > yr_end] = np.nan
-                            df2.loc[df_yr.index, :] = df_yr
-                            df2 = df2.reindex(sorted(df2.columns), axis=1)
+                            df2.loc[mask, :] = df_yr.to_numpy()
 
             # -----------------------------------------------------
             # Adding missing values for extended vintage and active
@@ -657,17 +794,17 @@ def main(
                                 y,
                                 dataframe=True,
                             )
-                            df2[yr_end].loc[
-                                pd.isna(df2[yr_end]) & ~pd.isna(df2[yr_next])
+                            df2.loc[
+                                pd.isna(df2[yr_end]) & ~pd.isna(df2[yr_next]), yr_end
                             ] = df2.loc[:, yr_next].copy()
                             # Removing extra values from previous vintage year
                             if len(df2[yr_end]) > 1:
-                                df2[yr_end].loc[pd.isna(df2[yr_end].shift(+1))] = np.nan
+                                df2.loc[pd.isna(df2[yr_end].shift(+1)), yr_end] = np.nan
 
                             if extrapol_neg:
                                 dd = df2.loc[:, yr_next].copy()
-                                df2[yr_end].loc[
-                                    (df2[yr_end] < 0) & (df2[yr_next] >= 0)
+                                df2.loc[
+                                    (df2[yr_end] < 0) & (df2[yr_next] >= 0), yr_end
                                 ] = dd * extrapol_neg
 
                     # Extrapolate data
@@ -704,7 +841,7 @@ def main(
                         # Excluding parameters with two time index, but not
                         # across all active years
                         if parname not in ["relation_activity"]:
-                            df_yr[year_next].loc[pd.isna(df_yr[year_next])] = (
+                            df_yr.loc[pd.isna(df_yr[year_next]), year_next] = (
                                 f_slice(df2, idx, year_ref, [year_next], y)
                                 .loc[:, year_next]
                                 .copy()
@@ -714,7 +851,7 @@ def main(
                                 or df_yr[year_nn].loc[~pd.isna(df_yr[year_nn])].empty
                             ):
                                 year_nn = year_next
-                            df_yr[y].loc[pd.isna(df_yr[y])] = intpol(
+                            df_yr.loc[pd.isna(df_yr[y]), y] = intpol(
                                 df_yr[year_next],
                                 df_yr[year_nn],
                                 year_next,
@@ -749,7 +886,7 @@ def main(
                     if y in set(df_old[year_ref]):
                         df2.loc[df2.index.isin(df_yr.index), :] = df_yr
                     else:
-                        df2 = df2.append(df_yr)
+                        df2 = pd.concat([df2, df_yr])
                     df2 = df2.reindex(sorted(df2.columns), axis=1)
                     df2 = df2.reset_index().sort_values(idx).set_index(idx)
 
@@ -807,3 +944,85 @@ def main(
     if not test_run and commit is True:
         scenario.commit("Scenario updated for new lifetime.")
     return results
+
+
+def buffered_batch(
+    scenario,
+    changes,
+    par_exclude=[],
+    remove_rest=False,
+    use_firstmodelyear=False,
+    extrapol_neg=0.5,
+    dry_run=False,
+    quiet=True,
+):
+    """Change the lifetime of multiple technologies in multiple nodes.
+
+    This calls :func:`main` once for each row of `changes`, with the same effect, but
+    through a :class:`_BufferedScenario`: each parameter is retrieved from `scenario`
+    only once, and all changes are applied in a single commit. The extrapolation of
+    each parameter in :func:`main` is still done separately for each row, so the time
+    taken for this part grows with the number of rows.
+
+    Parameters
+    ----------
+    scenario: object
+        ixmp scenario
+    changes: pandas.DataFrame
+        One row per change, with columns "technology" and "node", plus any of
+        "lifetime", "year_vtg_start" and "year_vtg_end"; see :func:`main`. Missing or
+        NaN values have the same effect as :obj:`None` for the arguments of
+        :func:`main`. Each combination of technology and node may appear only once.
+    par_exclude, remove_rest, use_firstmodelyear, extrapol_neg, quiet:
+        Passed to :func:`main`.
+    dry_run: boolean, default False
+        If True, compute the changes but do not apply them to the scenario.
+
+    Returns
+    -------
+    pandas.DataFrame
+        Summary of the changes, with one row per parameter, technology, and node; see
+        :meth:`_BufferedScenario.diff`.
+    """
+    if isinstance(par_exclude, str):
+        par_exclude = [par_exclude]
+
+    changes = changes.reindex(
+        columns=["technology", "node", "lifetime", "year_vtg_start", "year_vtg_end"]
+    )
+    duplicated = changes.duplicated(subset=["technology", "node"])
+    if duplicated.any():
+        raise ValueError(
+            "More than one change for (technology, node): "
+            f"{changes.loc[duplicated, ['technology', 'node']].values.tolist()}"
+        )
+
+    buffer = _BufferedScenario(scenario, changes["technology"].unique())
+
+    def _arg(value):
+        return None if pd.isna(value) else int(value)
+
+    for row in changes.itertuples():
+        main(
+            buffer,
+            row.technology,
+            lifetime=_arg(row.lifetime),
+            year_vtg_start=_arg(row.year_vtg_start),
+            year_vtg_end=_arg(row.year_vtg_end),
+            nodes=row.node,
+            # main() appends to this list
+            par_exclude=list(par_exclude),
+            remove_rest=remove_rest,
+            use_firstmodelyear=use_firstmodelyear,
+            extrapol_neg=extrapol_neg,
+            commit=False,
+            quiet=quiet,
+        )
+
+    result = buffer.diff()
+    log.info(f"Changes to {len(result)} (parameter, technology, node) combinations")
+
+    if not dry_run:
+        buffer.apply("Scenario updated for new lifetimes.")
+
+    return result
@@ -1,7 +1,12 @@
+import logging
+
 import numpy as np
 import pandas as pd
+
 from message_ix_models import ScenarioInfo
 
+log = logging.getLogger(__name__)
+
 
 def main(scen, vintaging=False, check_only=False, remove_zero=True, verbose=False):
     """Check and fix inv_cost and fix_cost.
@@ -241,3 +246,190 @@ def main(scen, vintaging=False, check_only=False, remove_zero=True, verbose=Fals
                                         )
                                     add_data.loc[yv, "value"].update(update)
                                 scen.add_par(par, add_data.reset_index())
+
+
+def _vintage_and_active_years(technical_lifetime, duration_period, y_min):
+    """Valid (year_vtg, year_act) for every (node_loc, technology) at once.
+
+    This gives the same pairs as :meth:`message_ix.Scenario.vintage_and_active_years`
+    with `tl_only` = :obj:`True`, for all the data in `technical_lifetime`, and keeps
+    only `year_act` >= `y_min`.
+    """
+    dims = ["node_loc", "technology"]
+
+    # Duration of each period, and total duration of all prior periods
+    dur = duration_period.sort_values("year")
+    prior = pd.Series(
+        (dur["value"].cumsum() - dur["value"]).to_numpy(), index=dur["year"]
+    )
+
+    tl = technical_lifetime[dims + ["year_vtg", "value"]].assign(
+        ya_max=lambda df: df.groupby(dims)["year_vtg"].transform("max")
+    )
+    # Cartesian product with all periods
+    i = np.repeat(np.arange(len(tl)), len(prior))
+    ya = np.tile(prior.index.to_numpy(), len(tl))
+    df = tl.iloc[i].reset_index(drop=True).assign(year_act=ya)
+
+    # Age of the technology at the end of the period before `year_act`
+    age = prior.reindex(ya).to_numpy() - prior.reindex(df["year_vtg"]).to_numpy()
+
+    valid = (
+        (df["year_vtg"] <= df["year_act"])
+        & (age < df["value"])
+        & (df["year_act"] <= df["ya_max"])
+        & (df["year_act"] >= y_min)
+    )
+    return df.loc[valid, dims + ["year_vtg", "year_act"]].reset_index(drop=True)
+
+
+def _interpolate(df, by, x):
+    """Fill NaN in the "value" column of `df` along `x`, for all groups `by` at once.
+
+    Values are interpolated linearly between the nearest observations in the same
+    group, and held constant beyond the first or last observation. This is the same as
+    :meth:`pandas.DataFrame.interpolate` with :py:`method="index",
+    limit_direction="both"`, applied to each group.
+    """
+    df = df.sort_values(by + [x])
+    grouped = df.assign(_x=df[x].where(df["value"].notna())).groupby(by, sort=False)
+
+    # Nearest observation before and after each row
+    x0, v0 = grouped["_x"].ffill(), grouped["value"].ffill()
+    x1, v1 = grouped["_x"].bfill(), grouped["value"].bfill()
+
+    value = v0 + (v1 - v0) * (df[x] - x0) / (x1 - x0)
+    return df.assign(value=df["value"].fillna(value).fillna(v0).fillna(v1))
+
+
+def _filled(df, dims, columns):
+    """Rows of `df` absent from the observed data, with values filled."""
+    df = df.assign(unit=df.groupby(dims)["unit"].transform("first"))
+    return df.loc[(df["_merge"] == "left_only") & df["value"].notna(), columns]
+
+
+def batch(scen, vintaging=False, check_only=False, remove_zero=True):
+    """Check and fix inv_cost and fix_cost for all technologies and nodes at once.
+
+    This performs the same checks as :func:`main`, but instead of iterating over nodes
+    and technologies, each parameter is compared to the expected (node_loc, technology,
+    year_vtg[, year_act]) for all technologies at once. The expected values are derived
+    from "technical_lifetime" and "duration_period" in the same way as
+    :meth:`message_ix.Scenario.vintage_and_active_years`. Technologies without
+    "technical_lifetime" data are not checked.
+
+    - For `inv_cost`, missing values for vintages in the model horizon are interpolated
+      across vintages.
+    - For `fix_cost`, values for activity years in the model horizon are checked. Excess
+      values are removed. Missing values for the first activity year of each vintage are
+      interpolated across vintages; the remaining missing values are filled according
+      to `vintaging`.
+
+    Parameters
+    ----------
+    scen : :class:`message_ix.Scenario`
+        Scenario for which the check should be carried out.
+    vintaging : boolean (default=False)
+        If True, missing `fix_cost` values are the same as the value for the preceding
+        activity year of the same vintage. Otherwise, they are the same as the value
+        for the same activity year of the latest other vintage.
+    check_only : boolean (default=False)
+        If True, only return the report, without modifying the scenario.
+    remove_zero : boolean (default=True)
+        Option whether `zero` values can be removed for `fix_cost`.
+
+    Returns
+    -------
+    pandas.DataFrame
+        Report with one row per data point that is (or, with `check_only`, would be)
+        added or removed, with columns "parameter", "action" ("add" or "remove"),
+        "node_loc", "technology", "year_vtg", "year_act" (empty for `inv_cost`),
+        "value", and "unit".
+    """
+    dims = ["node_loc", "technology"]
+    columns = ["parameter", "action"] + dims + ["year_vtg", "year_act", "value", "unit"]
+    y0 = scen.firstmodelyear
+
+    # Expected vintage and activity years for all technologies
+    exp = _vintage_and_active_years(
+        scen.par("technical_lifetime"), scen.par("duration_period"), y_min=y0
+    )
+    report = [pd.DataFrame(columns=columns)]
+
+    # --------------------------------------------------------------
+    # `inv_cost`: one value for each vintage year in the model horizon
+    # --------------------------------------------------------------
+    par = "inv_cost"
+    df = scen.par(par)
+    idx = dims + ["year_vtg"]
+
+    tmp = (
+        exp.loc[exp.year_vtg >= y0, idx]
+        .drop_duplicates()
+        .merge(df[dims].drop_duplicates(), on=dims)
+        .merge(df, how="left", on=idx, indicator=True)
+    )
+    tmp = _interpolate(tmp, dims, "year_vtg")
+    report.append(_filled(tmp, dims, df.columns).assign(parameter=par, action="add"))
+
+    # ------------------------------------------------------------------------------
+    # `fix_cost`: one value for each vintage and activity year, with the activity year
+    # in the model horizon
+    # ------------------------------------------------------------------------------
+    par = "fix_cost"
+    df = scen.par(par)
+    idx = dims + ["year_vtg", "year_act"]
+
+    # All zero values are dropped
+    if remove_zero:
+        report.append(df.loc[df.value == 0].assign(parameter=par, action="remove"))
+    df = df.loc[df.value != 0]
+
+    # Merge observed and expected data, only for technologies with both
+    tmp = (
+        exp.merge(df[dims].drop_duplicates(), on=dims)
+        .merge(
+            df.loc[df.year_act >= y0].merge(exp[dims].drop_duplicates(), on=dims),
+            how="outer",
+            on=idx,
+            indicator=True,
+        )
+        .sort_values(idx)
+    )
+
+    # Excess values, not corresponding to valid vintage and activity years
+    excess = tmp["_merge"] == "right_only"
+    report.append(tmp.loc[excess, df.columns].assign(parameter=par, action="remove"))
+    tmp = tmp.loc[~excess]
+
+    # Interpolate values for the first activity year of each vintage across vintages
+    first = tmp.year_act == tmp.groupby(idx[:-1])["year_act"].transform("min")
+    tmp = pd.concat(
+        [_interpolate(tmp.loc[first], dims, "year_vtg"), tmp.loc[~first]]
+    ).sort_values(idx)
+
+    # Fill the remaining values
+    if not vintaging:
+        latest = tmp.groupby(dims + ["year_act"])["value"].transform("last")
+        tmp = tmp.assign(value=tmp["value"].fillna(latest))
+    tmp = tmp.assign(value=tmp.groupby(idx[:-1])["value"].ffill())
+    report.append(_filled(tmp, dims, df.columns).assign(parameter=par, action="add"))
+
+    report = pd.concat(report, ignore_index=True).reindex(columns=columns)
+    log.info(
+        "Gaps filled and excess values removed: "
+        f"{report.groupby(['parameter', 'action']).size().to_dict()}"
+    )
+
+    if not check_only:
+        with scen.transact("Correct parameters ['inv_cost', 'fix_cost']."):
+            # Remove before adding, since some removed zero values are filled
+            for action in ("remove", "add"):
+                for par, df in report.query(f"action == {action!r}").groupby(
+                    "parameter"
+                ):
+                    getattr(scen, f"{action}_par")(
+                        par, df[scen.idx_names(par) + ["value", "unit"]]
+                    )
+
+    return report